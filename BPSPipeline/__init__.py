@@ -1 +1,18 @@
 from .bpsmodule import *
+from .catalog import *
+from .cache import *
+from .manifest import *
+from .export import *
+from .compact import *
+from .join import *
+from .synthetic import *
+from .profiling import *
+from .excel import *
+from .typed import *
+from .prefetch import *
+from .spill import *
+from .tensor import *
+from .watch import *
+from .query import *
+from .aggregate import *
+from .labels import *
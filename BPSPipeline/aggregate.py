@@ -0,0 +1,171 @@
+import numpy as np
+from os import path, remove
+from glob import glob
+from pandas import DataFrame, MultiIndex, concat
+from .manifest import Manifest, fileSignature, groupFileName
+from .export import FORMAT_EXTENSION, fileFormat, readFrame, writeFrame
+
+TOTAL_LABEL = "Total"
+LIST_MEASURE = ["value", "growth", "share"]
+
+
+def _sumRows(values, codes, numberKey):
+    """
+    Sum the rows of each key, a key whose values are all missing stays missing like sum with min_count=1.
+    """
+    total = np.zeros((numberKey, values.shape[1]))
+    count = np.zeros((numberKey, values.shape[1]))
+    isValue = ~np.isnan(values)
+    np.add.at(total, codes, np.where(isValue, values, 0))
+    np.add.at(count, codes, isValue)
+    total[count == 0] = np.nan
+    return total
+
+
+def _levelLabels(level, codes):
+    # A missing label has the code -1.
+    labels = np.asarray(level, dtype=object)[codes]
+    labels[codes == -1] = np.nan
+    return labels
+
+
+def aggregateCube(df):
+    """
+    Compute the rollups of a combined result in one vectorized pass over its [region, group, unit, type] x year matrix.
+
+    The rows of the cube are every region's row, the province total of each type with region 'Total', and the province total of each group & unit with region & type 'Total'.
+    Each row has three measures:
+    - 'value' is the row's value.
+    - 'growth' is the year-over-year growth from the previous year, missing when the previous year isn't recorded or is 0.
+    - 'share' is the row's share of its parent: a region of its type's total, a type of its group's total & a group of itself.
+
+    :param df: Combined DataFrame indexed by [region, group, unit, type] with each year as its columns.
+    :return: Cube DataFrame indexed by [region, group, unit, type, measure] with each year as its columns.
+    """
+    df = df.astype("float64")
+    values = df.to_numpy(na_value=np.nan)
+    listYear = df.columns.tolist()
+    index = df.index.remove_unused_levels()
+
+    # Types are keyed by their group, unit & type codes, and groups by their group & unit codes.
+    labelCodes = np.column_stack([index.codes[1], index.codes[2], index.codes[3]])
+    typeKey, typeCode = np.unique(labelCodes, axis=0, return_inverse=True)
+    groupKey, groupCode = np.unique(typeKey[:, :2], axis=0, return_inverse=True)
+    typeCode, groupCode = typeCode.ravel(), groupCode.ravel()
+
+    typeTotal = _sumRows(values, typeCode, len(typeKey))
+    groupTotal = _sumRows(typeTotal, groupCode, len(groupKey))
+    value = np.vstack([values, typeTotal, groupTotal])
+    parent = np.vstack([typeTotal[typeCode], groupTotal[groupCode], groupTotal])
+
+    # Growth is only computed between consecutive years.
+    growth = np.full(value.shape, np.nan)
+    isConsecutive = np.diff(np.array(listYear, dtype=int)) == 1
+    with np.errstate(divide="ignore", invalid="ignore"):
+        share = np.where(parent != 0, value / parent, np.nan)
+        previous, current = value[:, :-1], value[:, 1:]
+        growth[:, 1:] = np.where(
+            isConsecutive & (previous != 0), current / previous - 1, np.nan
+        )
+
+    numberRow, numberType, numberGroup = len(values), len(typeKey), len(groupKey)
+    total = np.full(numberType + numberGroup, TOTAL_LABEL, dtype=object)
+    labels = [
+        np.concatenate([index.get_level_values(0).to_numpy(dtype=object), total]),
+        np.concatenate(
+            [
+                _levelLabels(index.levels[1], labelCodes[:, 0]),
+                _levelLabels(index.levels[1], typeKey[:, 0]),
+                _levelLabels(index.levels[1], groupKey[:, 0]),
+            ]
+        ),
+        np.concatenate(
+            [
+                _levelLabels(index.levels[2], labelCodes[:, 1]),
+                _levelLabels(index.levels[2], typeKey[:, 1]),
+                _levelLabels(index.levels[2], groupKey[:, 1]),
+            ]
+        ),
+        np.concatenate(
+            [
+                _levelLabels(index.levels[3], labelCodes[:, 2]),
+                _levelLabels(index.levels[3], typeKey[:, 2]),
+                np.full(numberGroup, TOTAL_LABEL, dtype=object),
+            ]
+        ),
+    ]
+
+    listCube = []
+    for measure, matrix in zip(LIST_MEASURE, [value, growth, share]):
+        cubeIndex = MultiIndex.from_arrays(
+            labels + [np.full(numberRow + numberType + numberGroup, measure)],
+            names=list(df.index.names) + ["measure"],
+        )
+        listCube.append(DataFrame(matrix, index=cubeIndex, columns=listYear))
+    return concat(listCube)
+
+
+def readCube(fileName, format=None):
+    """
+    Read a cube written by refreshCubes with its [region, group, unit, type, measure] index.
+
+    :param fileName: File location.
+    :param format: Input format. If None, it's inferred from the file's extension.
+    :return: Cube DataFrame.
+    """
+    df = readFrame(fileName, format)
+    if "measure" in df.columns:
+        df = df.set_index("measure", append=True)
+    return df
+
+
+def refreshCubes(pathOutput="./", prefix="Combine_Result", format="csv"):
+    """
+    Materialize the cube of each combined output next to it, recomputing only the outputs that changed since the last refresh.
+
+    The signature of each output is recorded in 'cube.json' at pathOutput, and the cube of an output that no longer exists is removed.
+
+    :param pathOutput: Directory location of the combined outputs.
+    :param prefix: Prefix of the combined outputs' file names.
+    :param format: Format of a new cube, either 'csv', 'parquet', 'feather' or 'arrow'.
+    :return: Dictionary of each refreshed commodity group & its cube.
+    """
+    manifest = Manifest(path.join(pathOutput, "cube.json"))
+    listOutput = sorted(glob(path.join(pathOutput, f"{prefix}_*")))
+    listOutput = [
+        fileName
+        for fileName in listOutput
+        if not fileName.endswith(".tmp") and path.isfile(fileName)
+    ]
+
+    # Remove the cubes of the outputs that no longer exist.
+    setOutput = set(listOutput)
+    for fileName in [
+        fileName for fileName in manifest.files if fileName not in setOutput
+    ]:
+        group = manifest.files.pop(fileName)["group"]
+        cubeName = manifest.groups.pop(group, None)
+        if cubeName is not None and path.exists(path.join(pathOutput, cubeName)):
+            remove(path.join(pathOutput, cubeName))
+
+    groupedCube = {}
+    for fileName in listOutput:
+        if not manifest.isChanged(fileName):
+            continue
+        signature = fileSignature(fileName)
+        cube = aggregateCube(readFrame(fileName))
+        group = cube.index.get_level_values(1)[0]
+        cubeName = manifest.groups.get(
+            group,
+            groupFileName(group, "Aggregate_Cube", FORMAT_EXTENSION[format][1:]),
+        )
+        writeFrame(cube, path.join(pathOutput, cubeName), fileFormat(cubeName))
+        manifest.files[fileName] = {
+            **signature,
+            "group": group,
+            "year": cube.columns.tolist(),
+        }
+        manifest.groups[group] = cubeName
+        groupedCube[group] = cube
+    manifest.save()
+    return groupedCube
@@ -1,7 +1,36 @@
+import json
+import numpy as np
+from io import BytesIO
 from pandas import read_csv, read_excel, concat, DataFrame
-from glob import glob
+from os import path, remove
+from collections import deque
 from typing import ClassVar
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from tempfile import TemporaryDirectory
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from .catalog import Catalog, globFiles, parseTitle, scanHeader
+from .cache import ResultCache
+from .manifest import Manifest, fileSignature, groupFileName
+from .compact import LabelDictionary, compactFrame, frameBytes, shareCategories
+from .join import bucketByGroup, joinGroup
+from .profiling import NULL_PROFILER, Profiler
+from .excel import excelToCsv, readExcel
+from .typed import readTypedCsv
+from .prefetch import prefetchFiles
+from .spill import mergeRuns, spillRun
+from .tensor import BPSTensor
+from .query import QueryStore
+from .aggregate import refreshCubes
+from .labels import LabelNormalizer
+from .export import (
+    FORMAT_EXTENSION,
+    fileFormat,
+    frameFileName,
+    readFrame,
+    writeFrame,
+    writeHive,
+    writePartitions,
+)
 
 
 @dataclass
@@ -14,7 +43,22 @@ class BPSData:
     :param delimiter: Character which separates data for csv file such as ',' (comma), ';' (semi-colon) or '\\t' (tab).
     :param fullResult: Option for the pipeline result, if True the result return as dictionary contain dataframe itself and its group type for compilation purposes.
     :param delimiter: Character which separates data for csv file.
+    :param engine: Reshape engine used by the pipeline, 'vectorized' reshapes every commodity in one batched step while 'loop' slices them one by one.
+    :param headerOnly: Option for reading only the header & footer to get the data's metadata, the data rows are counted without being parsed. The pipeline isn't available in this mode.
+    :param cache: ResultCache for storing the pipeline result. If the file is already cached, it isn't read and readData is None.
+    :param compact: Option for returning the pipeline result with categorical labels & the narrowest lossless value dtypes.
+    :param profiler: Profiler recording the time, rows & bytes of each stage. If None, profiling is disabled.
+    :param excelMode: Reader of xlsx file, 'pandas' uses read_excel while 'fast' streams the cells of the first sheet without loading the workbook's styles.
+    :param excelCache: Directory location for converting xlsx file to csv once with the fast reader, so the next runs read the csv instead. If None, xlsx file isn't converted.
+    :param csvMode: Parse of csv file, 'pandas' reads every cell as is then cleans the frame while 'typed' reads the value columns as float with BPS placeholders as missing values & skips the footer while reading. A row with an empty value cell is dropped by 'pandas' but kept with NaN by 'typed'.
+    :param csvEngine: Parser engine of the 'typed' parse, either 'c' or 'pyarrow'.
+    :param buffer: Raw bytes of the file that have already been read, such as by prefetchFiles. If given, the file isn't read again & the buffer is released once parsed.
+    :param normalizer: LabelNormalizer shared with other files, so each distinct region & type label is normalized once. If None, the file has its own.
     :cvar LIST_EXTENSION: List contain allowable file's type.
+    :cvar LIST_ENGINE: List contain allowable reshape engine.
+    :cvar LIST_EXCEL_MODE: List contain allowable xlsx reader.
+    :cvar LIST_CSV_MODE: List contain allowable csv parse.
+    :cvar MEMO_ATTRIBUTE: List of attributes used by the reshape, assigning any of them invalidates the memoized results.
     :ivar extention: File's extention.
     :ivar readData: Read dataframe.
     :ivar region: Data's region.
@@ -31,9 +75,54 @@ class BPSData:
     separator: str = " "
     delimiter: str = ","
     fullResult: bool = False
+    engine: str = "vectorized"
+    headerOnly: bool = False
+    cache: ResultCache = None
+    compact: bool = False
+    profiler: Profiler = None
+    excelMode: str = "pandas"
+    excelCache: str = None
+    csvMode: str = "pandas"
+    csvEngine: str = "c"
+    buffer: bytes = field(default=None, repr=False)
+    normalizer: LabelNormalizer = field(default=None, repr=False)
     LIST_EXTENSION: ClassVar[list] = ["csv", "xlsx", "txt"]
+    LIST_ENGINE: ClassVar[list] = ["vectorized", "loop"]
+    LIST_EXCEL_MODE: ClassVar[list] = ["pandas", "fast"]
+    LIST_CSV_MODE: ClassVar[list] = ["pandas", "typed"]
+    MEMO_ATTRIBUTE: ClassVar[list] = [
+        "readData",
+        "listRegion",
+        "oldColumns",
+        "region",
+        "group",
+        "unit",
+        "year",
+        "comodity",
+    ]
+
+    def __setattr__(self, name, value):
+        # Reassigning the data or its labels makes the memoized results outdated.
+        if name in self.MEMO_ATTRIBUTE and "_memo" in self.__dict__:
+            self.invalidate()
+        super().__setattr__(name, value)
 
     def __post_init__(self):
+        # Check if the reshape engine is in the allowable list.
+        assert (
+            self.engine in self.LIST_ENGINE
+        ), f"Something wrong: engine {self.engine} not in the allowable list {self.LIST_ENGINE}"
+
+        # Check if the xlsx reader is in the allowable list.
+        assert (
+            self.excelMode in self.LIST_EXCEL_MODE
+        ), f"Something wrong: excel mode {self.excelMode} not in the allowable list {self.LIST_EXCEL_MODE}"
+
+        # Check if the csv parse is in the allowable list.
+        assert (
+            self.csvMode in self.LIST_CSV_MODE
+        ), f"Something wrong: csv mode {self.csvMode} not in the allowable list {self.LIST_CSV_MODE}"
+
         self.extension = self.fileName.split(".")[-1]
 
         # Check if the file's extension is in the allowable list.
@@ -41,69 +130,234 @@ class BPSData:
             self.extension in self.LIST_EXTENSION
         ), f"Something wrong: file extension {self.extension} not in the allowable list {self.LIST_EXTENSION}"
 
-        # Checking the file's extension and creating a read atrribute corresponding to it.
-        if (self.extension == "csv") | (self.extension == "txt"):
-            self.readData = read_csv(self.fileName, sep=self.delimiter)
-        elif self.extension == "xlsx":
-            self.readData = read_excel(self.fileName)
+        self._profiler = NULL_PROFILER if self.profiler is None else self.profiler
+        self._normalizer = (
+            LabelNormalizer() if self.normalizer is None else self.normalizer
+        )
+        self._cachedResult = None
+        self._cacheKey = None
+        self._isModified = False
+        self._read()
 
-        # Set data attributes such as its title, region, group & unit
-        self.region = self.readData.columns[0]
+        # Only the assignments after reading the file make the memoized results outdated.
+        self._memo = {}
 
+    def _read(self):
         """
-        Check if unit is in the title section instead of its group.
-        - Title usually placed at index 1 in columns name. There is 2 condition, either or not the unit include in this section.
-        - Group usually placed at title that give information of ...
-        - Unit placed either at title or comodity types.
+        Read the file, or restore its result from the cache, and set the data attributes.
         """
-        if "(" in self.readData.columns[1]:
-            self.title = self.separator.join(
-                self.readData.columns[1].split("(")[0].split(self.separator)[:-1]
-            )
-            self.group = self.separator.join(self.title.split(self.separator)[1:])
-            self.unit = self.readData.columns[1].split("(")[-1][:-1]
+        stage = self._profiler.stage
+
+        # Only scan the header & footer without loading the data.
+        if self.headerOnly == True:
+            with stage("header", self.fileName) as record:
+                metadata = scanHeader(self.fileName, self.separator, self.delimiter)
+                record["rows"] = metadata["rows"]
+            self.readData = None
+            self.region = metadata["region"]
+            self.title = metadata["title"]
+            self.group = metadata["group"]
+            self.unit = metadata["unit"]
+            self.year = metadata["year"]
+            self.comodity = metadata["comodity"]
+            self.rows = metadata["rows"]
+            return
+
+        # Restore the result & its metadata from the cache without reading the file.
+        if self.cache is not None:
+            with stage("cache", self.fileName):
+                # The key is kept for storing the result, so the file is hashed once.
+                self._cacheKey = self.cache.key(
+                    self.fileName,
+                    self.separator,
+                    self.delimiter,
+                    self.csvMode,
+                    self.excelMode,
+                    self.buffer,
+                )
+                entry = self.cache.get(self.fileName, key=self._cacheKey)
+            if entry is not None:
+                self.readData = None
+                self.region = entry["region"]
+                self.title = entry["title"]
+                self.group = entry["group"]
+                self.unit = entry["unit"]
+                self.year = entry["year"]
+                self.comodity = entry["comodity"]
+                self._cachedResult = entry["result"]
+                return
+
+        # Checking the file's extension and creating a read atrribute corresponding to it.
+        header = None
+        if self.buffer is None:
+            source, sourceBytes = self.fileName, path.getsize(self.fileName)
         else:
-            self.title = self.readData.columns[1]
-            self.group = self.separator.join(self.title.split(self.separator)[1:])
-
-        # Check if the Group more than 2 letters.
-        groupMaxLetterLength = 2
-        if len(self.group.split(self.separator)) > groupMaxLetterLength:
-            self.group = self.separator.join(
-                self.group.split(self.separator)[:groupMaxLetterLength]
+            source, sourceBytes = BytesIO(self.buffer), len(self.buffer)
+        with stage("read", self.fileName, bytes=sourceBytes) as record:
+            if (self.extension != "xlsx") & (self.csvMode == "typed"):
+                header, self.readData = readTypedCsv(
+                    source, self.separator, self.delimiter, self.csvEngine
+                )
+            elif (self.extension == "csv") | (self.extension == "txt"):
+                self.readData = read_csv(source, sep=self.delimiter)
+            elif self.extension == "xlsx":
+                if self.excelCache is not None:
+                    csvName = excelToCsv(self.fileName, self.excelCache)
+                    self.readData = read_csv(csvName)
+                elif self.excelMode == "fast":
+                    self.readData = readExcel(source)
+                else:
+                    self.readData = read_excel(source)
+            record["rows"] = len(self.readData)
+        self.buffer = None
+
+        # The typed parse already read the header, removed the footer & typed the value columns.
+        if header is not None:
+            with stage("header", self.fileName, rows=len(self.readData)):
+                self.region = header["region"]
+                self.title = header["title"]
+                self.group = header["group"]
+                self.unit = header["unit"]
+                self.year = header["year"]
+                self.comodity = header["comodity"]
+                self.listRegion = self.readData[self.region].values
+                self.oldColumns = self.readData.columns[1:]
+                self.readData = self.readData[self.oldColumns]
+            return
+
+        with stage("header", self.fileName) as record:
+            # Set data attributes such as its title, region, group & unit
+            self.region = self.readData.columns[0]
+
+            # Check if unit is in the title section instead of its group.
+            self.title, self.group, self.unit = parseTitle(
+                self.readData.columns[1], self.separator
             )
 
-        # Check if the Title more than 3 letters.
-        titleMaxLetterLength = 3
-        if len(self.title.split(self.separator)) > titleMaxLetterLength:
-            self.title = self.separator.join(
-                self.title.split(self.separator)[:titleMaxLetterLength]
+            # Remove the data footer & make list of region.
+            self.readData = self.readData.iloc[:-5]
+            self.listRegion = self.readData[self.region].dropna().values
+
+            # Get the row that contain nan values & extract each year value
+            nanRows = self.readData.loc[self.readData.isnull().any(axis=1) == True]
+            self.year = nanRows.iloc[-1].dropna().astype("int").unique().tolist()
+
+            # Extract each commodities.
+            if nanRows.shape[0] == 1:
+                self.comodity = [self.group]
+            else:
+                self.comodity = nanRows.dropna(axis=1).iloc[0].to_list()
+
+            # Drop the region columns, drop rows that contain nan value & replace '-' with '0' value.
+            self.oldColumns = self.readData.columns[1:]
+            self.readData = self.readData.dropna(axis=0)[self.oldColumns].replace(
+                "-", None
             )
+            record["rows"] = len(self.readData)
 
-        # Remove the data footer & make list of region.
-        self.readData = self.readData.iloc[:-5]
-        self.listRegion = self.readData[self.region].dropna().values
+    def invalidate(self):
+        """
+        Method for clearing the memoized pipeline results, so the next pipeline reshapes the data again.
+
+        It's called when readData or its labels are reassigned. Call it after modifying readData in place.
+        The result restored from or stored in the cache is dropped too, and the modified data's result isn't written to the cache since it no longer matches the file.
+        """
+        self._memo.clear()
+        self._cachedResult = None
+        self._isModified = True
 
-        # Get the row that contain nan values & extract each year value
-        nanRows = self.readData.loc[self.readData.isnull().any(axis=1) == True]
-        self.year = nanRows.iloc[-1].dropna().astype("int").unique().tolist()
+    def _longResult(self):
+        """
+        Compute the long-table result once, every output shape of the pipeline is derived from it.
 
-        # Extract each commodities.
-        if nanRows.shape[0] == 1:
-            self.comodity = [self.group]
+        :return: Long-table DataFrame with cleaned labels, it's memoized so it mustn't be modified.
+        """
+        if "long" in self._memo:
+            return self._memo["long"]
+
+        stage = self._profiler.stage
+        if self._cachedResult is not None:
+            result = self._cachedResult
         else:
-            self.comodity = nanRows.dropna(axis=1).iloc[0].to_list()
+            # Check if the data is available, a result restored from the cache has no read data.
+            assert (
+                self.readData is not None
+            ), f"Something wrong: {self.fileName} was restored from the cache without its data, it can't be reshaped again"
+
+            with stage("reshape", self.fileName) as record:
+                if self.engine == "loop":
+                    result = self._reshapeLoop()
+                else:
+                    result = self._reshapeVectorized()
+                record["rows"] = len(result)
+
+            with stage("labels", self.fileName, rows=len(result)):
+                # Check the value of unit if placed at commodites type
+                if self.unit == "":
+                    result["type"], result["unit"] = self._normalizer.splitUnit(
+                        result["type"]
+                    )
+
+                # Change the title's case to Title Case
+                result[self.region] = self._normalizer.title(result[self.region])
+
+            if (self.cache is not None) & (self._isModified == False):
+                self._cachedResult = result
+                with stage("cache", self.fileName, rows=len(result)):
+                    self.cache.put(
+                        self.fileName,
+                        {
+                            "region": self.region,
+                            "title": self.title,
+                            "group": self.group,
+                            "unit": self.unit,
+                            "year": self.year,
+                            "comodity": self.comodity,
+                            "result": self._cachedResult,
+                        },
+                        key=self._cacheKey,
+                    )
 
-        # Drop the region columns, drop rows that contain nan value & replace '-' with '0' value.
-        self.oldColumns = self.readData.columns[1:]
-        self.readData = self.readData.dropna(axis=0)[self.oldColumns].replace("-", None)
+        self._memo["long"] = result
+        return result
 
-    def pipeline(self):
+    def pipeline(self, fullResult=None):
         """
         Methode for cleaning, parsing and transforming data from wide-table format to long-table format.
 
+        The result of each output shape is memoized, and both shapes are derived from one reshape. Each call returns a copy of the memoized result.
+
+        :param fullResult: Output shape overriding the instance's fullResult, so both shapes can be taken from one instance. If None, the instance's fullResult is used.
         :return: DataFrame or Dictionary regarding the value of fullResult
         """
+        fullResult = self.fullResult if fullResult is None else fullResult
+        key = (fullResult == True, self.compact == True)
+        if key not in self._memo:
+            result = self._longResult()
+            if fullResult == True:
+                result = result.set_index([self.region, "group", "unit", "type"])
+            if self.compact == True:
+                with self._profiler.stage("compact", self.fileName, rows=len(result)):
+                    result = compactFrame(result)
+            self._memo[key] = result
+
+        result = self._memo[key].copy()
+        if fullResult == True:
+            return {
+                "group": self.group,
+                "data": result,
+                "title": self.title,
+                "year": self.year,
+                "fileName": self.fileName,
+            }
+        return result
+
+    def _reshapeLoop(self):
+        """
+        Reshape engine that slices and concatenates each commodity's block one by one.
+
+        :return: Long-table DataFrame with region, group, type, unit and each year as its columns.
+        """
         listComodityData = []
         for numberItem, _ in enumerate(self.oldColumns):
             if (numberItem != len(self.oldColumns) - 1) & (
@@ -133,73 +387,168 @@ class BPSData:
         # Combine list of dataframe to one dataframe
         result = concat(listComodityData)
 
-        # Check the value of unit if placed at commodites type
-        if self.unit == "":
-            expandedColumns = result["type"].str.split("(", expand=True)
-            result["unit"] = expandedColumns[1].str.replace(")", "", regex=False)
-            result["type"] = expandedColumns[0]
-
-        # Change the title's case to Title Case
-        result[self.region] = result[self.region].str.title()
-
         # Rearrange data columns
         oldCols = result.columns.to_list()
         newCols = oldCols[-4:] + oldCols[: len(oldCols) - 4]
-        result = result[newCols].reset_index(drop=True)
+        return result[newCols].reset_index(drop=True)
 
-        if self.fullResult == True:
-            result = result.set_index([self.region, "group", "unit", "type"])
-            return {
-                "group": self.group,
-                "data": result,
-                "title": self.title,
-                "year": self.year,
-            }
+    def _valueBlock(self):
+        """
+        Cast the whole numeric block once and lay it out as (commodities x regions x years).
 
+        :return: Tuple of the C-contiguous float array and the list of each commodity's type.
+        """
+        numberYear = len(self.year)
+
+        # Same blocks as the loop engine, which skips a block starting at the last column.
+        listStart = [
+            numberItem
+            for numberItem in range(0, len(self.oldColumns), numberYear)
+            if numberItem != len(self.oldColumns) - 1
+        ]
+        numberBlock = len(listStart)
+        numberRegion = len(self.listRegion)
+
+        values = np.ascontiguousarray(
+            self.readData[self.oldColumns[: numberBlock * numberYear]]
+            .astype("float")
+            .to_numpy()
+            .reshape(numberRegion, numberBlock, numberYear)
+            .transpose(1, 0, 2)
+        )
+
+        listType = [
+            (
+                self.group
+                if len(self.comodity) == 1
+                else self.comodity[numberCommodites - 1]
+            )
+            for numberCommodites in range(numberBlock)
+        ]
+        return values, listType
+
+    def _reshapeVectorized(self):
+        """
+        Reshape engine that casts the whole numeric block once and reshapes it to (commodities x regions x years).
+
+        The rows are ordered exactly like the loop engine: every region of the first commodity block, then the next block.
+
+        :return: Long-table DataFrame with region, group, type, unit and each year as its columns.
+        """
+        values, listType = self._valueBlock()
+        numberBlock, numberRegion, numberYear = values.shape
+
+        # One row per (commodity, region), which is a view of the contiguous block.
+        result = DataFrame(
+            values.reshape(numberBlock * numberRegion, numberYear), columns=self.year
+        )
+        result.insert(0, "unit", self.unit)
+        result.insert(0, "type", np.repeat(listType, numberRegion))
+        result.insert(0, "group", self.group)
+        result.insert(0, self.region, np.tile(np.asarray(self.listRegion), numberBlock))
+        return result
+
+    def tensor(self):
+        """
+        Method for getting the data as a dense (types x regions x years) tensor instead of the long table.
+
+        The labels are cleaned like the pipeline: title-cased regions, and units split from the types when they aren't at the title.
+
+        :return: BPSTensor of the data.
+        """
+        if "long" in self._memo or self._cachedResult is not None:
+            return BPSTensor.fromFrame(self._longResult(), self.title)
+
+        values, listType = self._valueBlock()
+        listRegion = self._normalizer.title(np.asarray(self.listRegion)).tolist()
+        if self.unit == "":
+            listType, listUnit = self._normalizer.splitUnit(np.asarray(listType))
+            listUnit = listUnit.tolist()
         else:
-            return result
+            listUnit = [self.unit] * len(listType)
 
-    def groupedExport(self, pathOutPut="./", groupBy="region"):
+        return BPSTensor(
+            values,
+            region=listRegion,
+            type=list(listType),
+            year=self.year,
+            unit=listUnit,
+            group=self.group,
+            title=self.title,
+            regionName=self.region,
+        )
+
+    def groupedExport(
+        self,
+        pathOutPut="./",
+        groupBy="region",
+        workers=4,
+        compression=None,
+        layout="files",
+        format="csv",
+    ):
         """
         Method for exporting based on key group that is choosed.
 
+        The pipeline is computed once & partitioned in one pass, then each partition is written concurrently.
+
         :param pathOutPut: Output path location for result. Default value is the current directory. If the locatin didn't exist, it automaticly created.
         :param groupBy: Column name that grouped data. Default value is region name.
+        :param workers: Number of threads writing the partitions.
+        :param compression: Compression method, either None, 'gzip' or 'zstd' for csv, parquet & 'hive' layout, or None, 'lz4' or 'zstd' for feather & arrow.
+        :param layout: Output layout, 'files' for one file for each key or 'hive' for a Parquet dataset partitioned as 'type=.../region=...'.
+        :param format: Output format of each file for 'files' layout, either 'csv', 'parquet', 'feather' or 'arrow'.
+        :return: List of exported file names, or the dataset directory for 'hive' layout.
         """
-        df = self.pipeline()
-        if self.fullResult == True:
-            df = self.pipeline()["data"]
+        df = self.pipeline(fullResult=False)
 
         # Set column's key to grouped dataframe
         keyColumn = None
         if groupBy == "region":
-            keyColumn = df.columns[0]
+            keyColumn = self.region
         elif groupBy == "type":
-            keyColumn = df.columns[2]
+            keyColumn = "type"
         else:
             print(f"{groupBy} not recoqnaized!!!")
             return None
 
-        # Create Groupby object based on column's key
-        groupedDf = df.groupby(by=[keyColumn])
-
-        # Set function to get key value from grouby object
-        getKey = lambda Key: Key[0]
+        with self._profiler.stage("export", self.fileName, rows=len(df)) as record:
+            if layout == "hive":
+                return writeHive(
+                    df.rename(columns={self.region: "region"}),
+                    f"{pathOutPut}{self.title}-{self.year[0]}_{self.year[-1]}",
+                    ["type", "region"],
+                    compression,
+                )
 
-        # Set list value of column's keys
-        listKey = groupedDf[keyColumn].unique().apply(getKey).values
+            # Set file name for exported file.
+            getFileName = (
+                lambda keyName: f"{pathOutPut}{self.title}-{keyName}-{self.year[0]}_{self.year[-1]}"
+            )
+            listExported = writePartitions(
+                df, keyColumn, getFileName, workers, compression, format
+            )
+            record["bytes"] = sum(path.getsize(fileName) for fileName in listExported)
+            return listExported
 
-        # Iterates for each key value to export in each coresponding file
-        for keyName in listKey:
-            from pathlib import Path
+    def exportResult(self, fileName, format="parquet", compression=None):
+        """
+        Method for exporting the pipeline result as a single file.
 
-            # Set file name for exported file.
-            exportFileName = (
-                f"{pathOutPut}{self.title}-{keyName}-{self.year[0]}_{self.year[-1]}.csv"
+        :param fileName: File location without extension, the format's extension is appended.
+        :param format: Output format, either 'csv', 'parquet', 'feather' or 'arrow' (memory-mappable Arrow IPC).
+        :param compression: Compression method, either None, 'gzip' or 'zstd' for csv & parquet, or None, 'lz4' or 'zstd' for feather & arrow.
+        :return: Exported file name. Use readFrame to load it back with its index & integer year columns.
+        """
+        df = self.pipeline()
+        if self.fullResult == True:
+            df = df["data"]
+        with self._profiler.stage("export", self.fileName, rows=len(df)) as record:
+            fileName = writeFrame(
+                df, frameFileName(fileName, format, compression), format, compression
             )
-            filePath = Path(exportFileName)
-            filePath.parent.mkdir(parents=True, exist_ok=True)
-            groupedDf.get_group(keyName).to_csv(exportFileName, index=False)
+            record["bytes"] = path.getsize(fileName)
+        return fileName
 
 
 @dataclass
@@ -207,46 +556,673 @@ class BulkParse:
     """
     Class that contain a list of BPS data that will be aggregated based on commodity groups.
 
-    :param pathInput: Input path location for BPS data.
+    :param pathInput: Input path location for BPS data, or a list of them.
     :param pathOutput: Output path location for result. Default value is the current directory.
     :param separator: Character that which separates each word.
     :param export: Option for export dataframe to csv file.
+    :param workers: Number of workers used to parse the files. Default value is 1, parsing each file one after another.
+    :param executor: Pool used when workers is more than 1, either 'process' or 'thread'.
+    :param cache: ResultCache shared by every BPSData, so an unchanged file is never parsed twice.
+    :param outputFormat: Format of the exported combined result, either 'csv', 'parquet', 'feather' or 'arrow'.
+    :param compact: Option for keeping every result with categorical labels shared across files & the narrowest lossless value dtypes.
+    :param incremental: Option for parsing only new or changed files since the last combineResult, which merges them into the existing outputs recorded in the manifest.
+    :param profiler: Profiler recording the stages of every file & the combine of every group, the records of pool workers are merged into it. If None, profiling is disabled.
+    :param excelMode: Reader of xlsx file, either 'pandas' or 'fast'.
+    :param excelCache: Directory location for converting xlsx file to csv once. If None, xlsx file isn't converted.
+    :param csvMode: Parse of csv file, either 'pandas' or 'typed'.
+    :param csvEngine: Parser engine of the 'typed' parse, either 'c' or 'pyarrow'.
+    :param prefetch: Number of files whose raw bytes are read ahead by background threads while the current file is parsed, only used when parsing serially. If 0, each file is read when it's parsed.
+    :param lazy: Option for not parsing the files when instantiated. Use iterResults to stream the results, and combineResult then parses & joins one commodity group at a time.
+    :param memoryBudget: Approximate memory limit in bytes of an out-of-core combine. If given, combineResult spills each result to a sorted run file & merges each group's runs into its output without holding the group in memory. If None, each group is joined in memory.
+    :param pathSpill: Directory location of the temporary run files. Default value is the system's temporary directory.
+    :param aggregate: Option for materializing the aggregate cube of each exported output next to it, only the outputs that changed are aggregated again.
+    :cvar LIST_EXECUTOR: List contain allowable executor's type.
+    :ivar listFile: Sorted list of file names matched by pathInput.
+    :ivar listObj: List of BPSData objects, only kept when parsing serially. Their memoized results are released, so their pipeline reshapes again.
+    :ivar listData: List of pipeline results in the same order as listFile.
+    :ivar listError: Dictionary of file name and its error message for every file that failed to parse.
+    :ivar listChanged: List of file names that have been parsed, in incremental mode only the new or changed ones.
+    :ivar manifest: Manifest of the outputs in pathOutput, only used in incremental mode.
+    :ivar labels: LabelDictionary shared by every result in compact mode.
+    :ivar normalizer: LabelNormalizer shared by every file parsed serially or by a thread pool, so each distinct region & type label is normalized once. Each worker of a process pool has its own normalizer shared by the files it parses instead.
     """
 
     pathInput: str
     pathOutput: str = "./"
     separator: str = " "
     export: bool = False
+    workers: int = 1
+    executor: str = "process"
+    cache: ResultCache = None
+    outputFormat: str = "csv"
+    compact: bool = False
+    incremental: bool = False
+    profiler: Profiler = None
+    excelMode: str = "pandas"
+    excelCache: str = None
+    csvMode: str = "pandas"
+    csvEngine: str = "c"
+    prefetch: int = 0
+    lazy: bool = False
+    memoryBudget: int = None
+    pathSpill: str = None
+    aggregate: bool = False
+    LIST_EXECUTOR: ClassVar[list] = ["process", "thread"]
 
     def __post_init__(self):
-        self.listFile = glob(self.pathInput)
-        self.listObj = list(
-            BPSData(fileName, separator=self.separator, fullResult=True)
-            for fileName in self.listFile
-        )
+        # Check if the executor is in the allowable list.
+        assert (
+            self.executor in self.LIST_EXECUTOR
+        ), f"Something wrong: executor {self.executor} not in the allowable list {self.LIST_EXECUTOR}"
+
+        # Check if the lazy mode isn't combined with the incremental mode.
+        assert not (
+            self.lazy and self.incremental
+        ), "Something wrong: lazy mode can't be used with incremental mode"
+
+        self.listFile = globFiles(self.pathInput)
+        self.listError = {}
+        self._profiler = NULL_PROFILER if self.profiler is None else self.profiler
+
+        # Only parse the new or changed files when it's incremental.
+        self.manifest = None
+        self.listChanged = self.listFile
+        if self.incremental == True:
+            self.manifest = Manifest(path.join(self.pathOutput, "manifest.json"))
+            self.listChanged = [
+                fileName
+                for fileName in self.listFile
+                if self.manifest.isChanged(fileName)
+            ]
+        self._listSignature = {
+            fileName: fileSignature(fileName) for fileName in self.listChanged
+        }
+
+        self.labels = LabelDictionary()
+        self.normalizer = LabelNormalizer()
+        self._memoryBefore = {}
+        self.listUniqueGroup = set()
+        if self.lazy == True:
+            self.listObj = []
+            self.listData = []
+            return
+
+        if self.workers > 1:
+            self.listObj = []
+            self.listData = self._parallelParse(self.listChanged)
+        else:
+            self.listObj = []
+            self.listData = []
+            for _, obj, result in self._iterSerial(self.listChanged):
+                self.listObj.append(obj)
+                self.listData.append(result)
+
+        # Compact every result with the same label dictionary.
+        if self.compact == True:
+            for Df in self.listData:
+                self._memoryBefore[Df["fileName"]] = frameBytes(Df["data"])
+                Df["data"] = compactFrame(Df["data"], self.labels)
+            for Df in self.listData:
+                Df["data"] = shareCategories(Df["data"], self.labels)
 
-        self.listData = list(obj.pipeline() for obj in self.listObj)
         self.listUniqueGroup = set([Df["group"] for Df in self.listData])
 
-    def combineResult(self, exportByGroup=False, groupBy="region"):
+    def memoryReport(self):
+        """
+        Method for reporting the memory usage of every result before & after compaction.
+
+        If the results aren't compacted, the after value is estimated by compacting a copy.
+        The categories shared by every result are reported once as 'dictionary' instead of in each file.
+
+        :return: Dictionary contain 'file' & 'group' dataframe of bytesBefore & bytesAfter, and 'dictionary' bytes.
+        """
+        labels = self.labels if self.compact == True else LabelDictionary()
+        listRow = []
+        for Df in self.listData:
+            bytesBefore = self._memoryBefore.get(Df["fileName"])
+            if bytesBefore is None:
+                bytesBefore = frameBytes(Df["data"])
+                bytesAfter = frameBytes(compactFrame(Df["data"], labels), shared=True)
+            else:
+                bytesAfter = frameBytes(Df["data"], shared=True)
+            listRow.append(
+                {
+                    "fileName": Df["fileName"],
+                    "group": Df["group"],
+                    "bytesBefore": bytesBefore,
+                    "bytesAfter": bytesAfter,
+                }
+            )
+
+        fileReport = DataFrame(
+            listRow, columns=["fileName", "group", "bytesBefore", "bytesAfter"]
+        ).set_index("fileName")
+        groupReport = fileReport.groupby("group").sum()
+        return {"file": fileReport, "group": groupReport, "dictionary": labels.nbytes()}
+
+    def catalog(self, pathCatalog=None):
+        """
+        Method for scanning the metadata of every input file without loading its data.
+
+        :param pathCatalog: File location for persisting the catalog as json. If None, the catalog isn't persisted.
+        :return: Catalog of the input files, use its groupFiles method to plan work by commodity group.
+        """
+        return Catalog(self.pathInput, pathCatalog, separator=self.separator)
+
+    def _parseOptions(self):
+        """
+        Get the options of BPSData shared by every file, which are picklable for pool workers.
+
+        The normalizer isn't sent to a process pool, since it would be pickled into every task; each worker uses its own normalizer instead.
+
+        :return: Dictionary of BPSData's parameters.
+        """
+        isProcess = (self.workers > 1) & (self.executor == "process")
+        return {
+            "separator": self.separator,
+            "fullResult": True,
+            "cache": self.cache,
+            "excelMode": self.excelMode,
+            "excelCache": self.excelCache,
+            "csvMode": self.csvMode,
+            "csvEngine": self.csvEngine,
+            "normalizer": None if isProcess else self.normalizer,
+        }
+
+    def _parallelParse(self, listFile):
+        """
+        Read and run the pipeline of each file across a pool of workers.
+
+        A file that failed to parse is recorded in listError instead of stopping the whole batch.
+        Each worker profiles its files with its own Profiler & returns the records to be merged.
+
+        :param listFile: List of file names to parse.
+        :return: List of pipeline results in the same order as listFile.
+        """
+        return [result for _, result in self._iterParallel(listFile)]
+
+    def _newPool(self):
+        """
+        Start a pool of workers of the executor's type.
+
+        :return: ProcessPoolExecutor or ThreadPoolExecutor with workers as its number of workers.
+        """
+        if self.executor == "process":
+            return ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_initWorker
+            )
+        return ThreadPoolExecutor(max_workers=self.workers)
+
+    def _iterParallel(self, listFile, pool=None):
+        """
+        Parse the files across a pool of workers with at most twice as many files in flight as workers.
+
+        :param listFile: List of file names to parse.
+        :param pool: Pool of workers that is already started. If None, a pool is started & shut down for these files.
+        :return: Generator of tuple of file name & its pipeline result in the order of listFile, failed files are recorded in listError.
+        """
+        if pool is None:
+            with self._newPool() as pool:
+                yield from self._iterParallel(listFile, pool)
+            return
+
+        options = self._parseOptions()
+        profile = self.profiler is not None
+        listFile = iter(listFile)
+
+        window = deque()
+        for fileName in listFile:
+            window.append(
+                (fileName, pool.submit(_parseFile, fileName, options, profile))
+            )
+            if len(window) == self.workers * 2:
+                break
+        while window:
+            fileName, future = window.popleft()
+            nextFile = next(listFile, None)
+            if nextFile is not None:
+                window.append(
+                    (nextFile, pool.submit(_parseFile, nextFile, options, profile))
+                )
+
+            result, error, listRecord = future.result()
+            # Merge the records of the workers into the profiler.
+            for record in listRecord:
+                self.profiler.add(record)
+            if error is None:
+                yield fileName, result
+            else:
+                self.listError[fileName] = error
+
+    def _iterSerial(self, listFile):
+        """
+        Parse the files one after another, reading ahead when prefetch is set.
+
+        A file that failed to parse is recorded in listError like the parallel parse, instead of stopping the stream.
+
+        :param listFile: List of file names to parse.
+        :return: Generator of tuple of file name, its BPSData & its pipeline result in the order of listFile.
+        """
+        if self.prefetch > 0:
+            listSource = prefetchFiles(listFile, self.prefetch)
+        else:
+            listSource = ((fileName, None, None) for fileName in listFile)
+        for fileName, buffer, error in listSource:
+            try:
+                if error is not None:
+                    raise error
+                obj = BPSData(
+                    fileName,
+                    profiler=self.profiler,
+                    buffer=buffer,
+                    **self._parseOptions(),
+                )
+                result = obj.pipeline()
+            except Exception as error:
+                self.listError[fileName] = f"{type(error).__name__}: {error}"
+                continue
+
+            # The result is taken, so the memoized frames of the object are released.
+            obj._memo.clear()
+            yield fileName, obj, result
+
+    def iterResults(self, listFile=None, pool=None):
+        """
+        Method for streaming the pipeline result of each file without keeping the results or the read data.
+
+        Each BPSData is released once its result is yielded, so the memory only holds the files in flight.
+        In compact mode, each result is compacted with the shared label dictionary.
+
+        :param listFile: List of file names to parse. Default value is every file to parse.
+        :param pool: Pool of workers shared by several calls when workers is more than 1, such as one pool for every group. If None, a pool is started & shut down for this call.
+        :return: Generator of tuple of file name & its pipeline result as fullResult dictionary.
+        """
+        listFile = self.listChanged if listFile is None else listFile
+        if self.workers > 1:
+            listParsed = self._iterParallel(listFile, pool)
+        else:
+            listParsed = (
+                (fileName, result) for fileName, _, result in self._iterSerial(listFile)
+            )
+
+        for fileName, result in listParsed:
+            if self.compact == True:
+                result["data"] = compactFrame(result["data"], self.labels)
+            self.listUniqueGroup.add(result["group"])
+            yield fileName, result
+
+    def _iterGroupResult(self):
+        """
+        Plan the files by group from the header-only catalog, then parse one group's files at a time.
+
+        When workers is more than 1, one pool of workers is started for every group instead of one for each group.
+
+        :return: Generator of tuple of group & its list of pipeline results, sorted by group.
+        """
+        catalog = Catalog(self.pathInput, separator=self.separator)
+        self.listError.update(catalog.listError)
+        setFile = set(self.listChanged)
+        pool = self._newPool() if self.workers > 1 else None
+        try:
+            for uniqueGroup, listFile in catalog.groupFiles().items():
+                listFile = [fileName for fileName in listFile if fileName in setFile]
+                listResult = [result for _, result in self.iterResults(listFile, pool)]
+                if len(listResult) == 0:
+                    continue
+                if self.compact == True:
+                    for result in listResult:
+                        result["data"] = shareCategories(result["data"], self.labels)
+                yield uniqueGroup, listResult
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+    def iterCombined(self, overlap="newest"):
+        """
+        Method for streaming the combined result of each commodity group.
+
+        Each group's files are parsed & joined before the next group, so the memory is proportional to the largest group instead of the whole input.
+
+        :param overlap: Policy when two files of a group have the same year, either 'newest', 'error' or 'equal'.
+        :return: Generator of tuple of group & its combined dataframe, sorted by group.
+        """
+        for uniqueGroup, listResult in self._iterGroupResult():
+            yield uniqueGroup, joinGroup(listResult, overlap, self.compact)
+
+    def combineTensor(self, overlap="newest"):
+        """
+        Method for combining the results of each commodity group as a dense tensor instead of the long table.
+
+        :param overlap: Policy when two files of a group have the same year, either 'newest', 'error' or 'equal'.
+        :return: Dictionary of group & its BPSTensor, whose type axis is each (unit, type) pair of the group.
+        """
+        if self.lazy == True:
+            groupedCombined = self.iterCombined(overlap)
+        else:
+            groupedCombined = (
+                (uniqueGroup, joinGroup(listResult, overlap, self.compact))
+                for uniqueGroup, listResult in bucketByGroup(self.listData).items()
+            )
+        return {
+            uniqueGroup: BPSTensor.fromCombined(combineDf, uniqueGroup)
+            for uniqueGroup, combineDf in groupedCombined
+        }
+
+    def queryStore(self, pathStore="bps.sqlite", overlap="newest", cacheGroups=4):
+        """
+        Method for storing the combined result of each commodity group in a QueryStore for indexed lookups.
+
+        :param pathStore: File location of the SQLite store.
+        :param overlap: Policy when two files of a group have the same year, either 'newest', 'error' or 'equal'.
+        :param cacheGroups: Number of groups kept in memory by the store.
+        :return: QueryStore of the combined results.
+        """
+        if self.lazy == True:
+            groupedCombined = self.iterCombined(overlap)
+        else:
+            groupedCombined = (
+                (uniqueGroup, joinGroup(listResult, overlap, self.compact))
+                for uniqueGroup, listResult in bucketByGroup(self.listData).items()
+            )
+        store = QueryStore(pathStore, cacheGroups)
+        for _, combineDf in groupedCombined:
+            store.put(combineDf)
+        return store
+
+    def combineResult(self, exportByGroup=False, groupBy="region", overlap="newest"):
         """
         Methode for combine result of list dataframe
 
+        Results are bucketed by group in one pass & joined on a sorted [region, group, unit, type] index.
+        In lazy mode, each group's files are parsed, joined & exported before the next group.
+        With memoryBudget, the combine is out-of-core & always exported, returning the list of exported file names.
+        In incremental mode, the new or changed files are merged into the existing group outputs which are always exported.
+
+        :param overlap: Policy when two files of a group have the same year, either 'newest' (keep the most recently modified file), 'error' or 'equal' (check the values are equal).
         :return: List that containing dataframe that has beeen aggregated by commodity group, if export value is False.
         :return: Return none or empty list, instead export aggregated data as csv files.
         """
+        if self.incremental == True:
+            listCombinedDf = self._combineIncremental(overlap)
+            self._refreshCubes()
+            return listCombinedDf
+        if self.memoryBudget is not None:
+            listExported = self._combineOutOfCore(overlap)
+            self._refreshCubes()
+            return listExported
+
+        if self.lazy == True:
+            groupedResult = self._iterGroupResult()
+        else:
+            groupedResult = bucketByGroup(self.listData).items()
+
         listCombinedDf = []
-        for id, uniqueGroup in enumerate(self.listUniqueGroup):
-            sameDf = [Df["data"] for Df in self.listData if Df["group"] == uniqueGroup]
-            fileName = f"{self.pathOutput}/Combine_Result_{id}.csv"
-            combineDf = concat(sameDf, axis=1)
-            combineDf = combineDf[sorted(combineDf.columns)]
+        for id, (uniqueGroup, listResult) in enumerate(groupedResult):
+            fileName = frameFileName(
+                f"{self.pathOutput}/Combine_Result_{id}", self.outputFormat
+            )
+            with self._profiler.stage("combine", fileName) as record:
+                combineDf = joinGroup(listResult, overlap, self.compact)
+                record["rows"] = len(combineDf)
             if self.export == True:
                 if exportByGroup == True:
                     ...
                 else:
-                    combineDf.to_csv(fileName)
+                    writeFrame(combineDf, fileName, self.outputFormat)
 
             else:
                 listCombinedDf.append(combineDf)
+        if self.export == True:
+            self._refreshCubes()
         return listCombinedDf
+
+    def _refreshCubes(self):
+        """
+        Refresh the aggregate cube of the changed outputs when aggregate is set.
+        """
+        if self.aggregate == True:
+            with self._profiler.stage("aggregate", self.pathOutput) as record:
+                groupedCube = refreshCubes(self.pathOutput, format=self.outputFormat)
+                record["rows"] = sum(len(cube) for cube in groupedCube.values())
+
+    def _combineOutOfCore(self, overlap="newest"):
+        """
+        Spill each result to a run file sorted by its [region, group, unit, type] index, then k-way merge each group's runs into its output.
+
+        Results are streamed in lazy mode, so only one file & the merge buffers sized by memoryBudget are held in memory. The year columns are written as float.
+
+        :param overlap: Policy when two files of a group have the same year, either 'newest', 'error' or 'equal'.
+        :return: List of the exported file name of each commodity group.
+        """
+        if self.lazy == True:
+            listResult = self.iterResults()
+        else:
+            listResult = ((Df["fileName"], Df) for Df in self.listData)
+
+        groupedRun = {}
+        listExported = []
+        with TemporaryDirectory(dir=self.pathSpill) as pathRun:
+            for number, (fileName, result) in enumerate(listResult):
+                runName = path.join(pathRun, f"run_{number:06d}.csv")
+                with self._profiler.stage("spill", fileName) as record:
+                    record["rows"] = spillRun(result["data"], runName)
+                groupedRun.setdefault(result["group"], []).append((runName, fileName))
+
+            for id, uniqueGroup in enumerate(sorted(groupedRun)):
+                outputName = frameFileName(
+                    f"{self.pathOutput}/Combine_Result_{id}", self.outputFormat
+                )
+                with self._profiler.stage("combine", outputName) as record:
+                    record["rows"] = mergeRuns(
+                        groupedRun[uniqueGroup],
+                        outputName,
+                        overlap,
+                        self.memoryBudget,
+                        self.outputFormat,
+                    )
+                listExported.append(outputName)
+        return listExported
+
+    def _combineIncremental(self, overlap="newest"):
+        """
+        Merge the new or changed files into the existing output of their group.
+
+        :param overlap: Policy when two files of a group have the same year, the existing output counts as the oldest file.
+
+        :return: List of the updated dataframe of each affected commodity group.
+        """
+        groupedCombined = updateGroupOutputs(
+            self.manifest,
+            self.listData,
+            self._listSignature,
+            self.listFile,
+            self.pathOutput,
+            self.outputFormat,
+            overlap,
+            self.compact,
+            self._profiler,
+            self._parseResults,
+        )
+        return list(groupedCombined.values())
+
+    def _parseResults(self, listFile):
+        """
+        Parse the files to their list of pipeline results, such as the unchanged files of a group to rebuild.
+        """
+        return [result for _, result in self.iterResults(listFile)]
+
+
+def _rowKeys(index):
+    """
+    Key each [region, group, unit, type] row of a result as a json string, a missing label as ''.
+    """
+    return [
+        json.dumps(
+            ["" if label is None or label != label else str(label) for label in row]
+        )
+        for row in index
+    ]
+
+
+def _isOverlapped(entry, other):
+    """
+    Check if two manifest entries may share (row, year) cells, an entry recorded without its rows always may.
+    """
+    if not set(entry["year"]) & set(other["year"]):
+        return False
+    if "rows" not in entry or "rows" not in other:
+        return True
+    return not set(entry["rows"]).isdisjoint(other["rows"])
+
+
+def _keepCells(df, listEntry):
+    """
+    Keep only the (row, year) cells of an output that are provided by the files of listEntry.
+
+    :return: DataFrame without the rows & years that aren't provided by any of the files.
+    """
+    rowKeys = np.array(_rowKeys(df.index), dtype=object)
+    listYear = np.array(df.columns.tolist())
+    isKept = np.zeros(df.shape, dtype=bool)
+    for entry in listEntry:
+        isKept |= np.outer(
+            np.isin(rowKeys, entry["rows"]), np.isin(listYear, entry["year"])
+        )
+    return df.where(isKept).loc[isKept.any(axis=1), isKept.any(axis=0)]
+
+
+def updateGroupOutputs(
+    manifest,
+    listData,
+    listSignature,
+    listFile,
+    pathOutput="./",
+    outputFormat="csv",
+    overlap="newest",
+    compact=False,
+    profiler=NULL_PROFILER,
+    parseFiles=None,
+):
+    """
+    Merge the new or changed files into the existing output of their group, so only the affected groups are rewritten.
+
+    The row keys & years of each file are recorded in the manifest. When a file is changed or removed, only the (row, year) cells still provided by the unchanged files of its group are kept from the existing output.
+    If the outdated file shared cells with an unchanged file, the existing output holds whichever value won the overlap, so the group is rebuilt from its unchanged files parsed again instead.
+
+    :param manifest: Manifest of the files & groups already in the outputs, it's updated & saved.
+    :param listData: List of pipeline results as fullResult dictionary of the new or changed files.
+    :param listSignature: Dictionary of each new or changed file name & its signature.
+    :param listFile: List of every current input file, a recorded file that isn't in it is removed from the outputs.
+    :param pathOutput: Output path location of the group outputs & the manifest.
+    :param outputFormat: Format of a new group output, either 'csv', 'parquet', 'feather' or 'arrow'.
+    :param overlap: Policy when two files of a group have the same year, the existing output counts as the oldest file.
+    :param compact: Option for joining compact results.
+    :param profiler: Profiler recording the combine of each group.
+    :param parseFiles: Function parsing a list of file names to their list of pipeline results, used to rebuild a group. It's required when a group has to be rebuilt.
+    :return: Dictionary of each updated commodity group & its dataframe, sorted by group. A group whose files were all removed isn't included.
+    """
+    # Files whose previous contribution has to be dropped from the outputs.
+    setFile = set(listFile)
+    listOutdated = [
+        manifest.files.pop(fileName)
+        for fileName in list(manifest.files)
+        if fileName not in setFile or fileName in listSignature
+    ]
+
+    setGroup = set(Df["group"] for Df in listData)
+    setGroup.update(outdated["group"] for outdated in listOutdated)
+
+    groupedCombined = {}
+    for uniqueGroup in sorted(setGroup):
+        outputName = manifest.groups.get(
+            uniqueGroup,
+            groupFileName(uniqueGroup, extension=FORMAT_EXTENSION[outputFormat][1:]),
+        )
+        fileName = path.join(pathOutput, outputName)
+
+        listGroupOutdated = [
+            outdated for outdated in listOutdated if outdated["group"] == uniqueGroup
+        ]
+        listUnchanged = manifest.groupFiles(uniqueGroup)
+        listEntry = [manifest.files[unchanged] for unchanged in listUnchanged]
+        isRebuilt = any(
+            _isOverlapped(outdated, entry)
+            for outdated in listGroupOutdated
+            for entry in listEntry
+        )
+
+        sameResult = []
+        if isRebuilt:
+            # Check if the unchanged files can be parsed again.
+            assert (
+                parseFiles is not None
+            ), f"Something wrong: group {uniqueGroup} has to be rebuilt but parseFiles isn't given"
+            with profiler.stage("rebuild", fileName) as record:
+                sameResult += parseFiles(listUnchanged)
+                record["rows"] = sum(len(Df["data"]) for Df in sameResult)
+        elif path.exists(fileName):
+            existingDf = readFrame(fileName)
+            if listGroupOutdated:
+                existingDf = _keepCells(existingDf, listEntry)
+            if existingDf.size > 0:
+                sameResult.append({"data": existingDf, "fileName": None})
+        sameResult += [Df for Df in listData if Df["group"] == uniqueGroup]
+
+        if len(sameResult) == 0:
+            # Every file of the group has been removed.
+            if path.exists(fileName):
+                remove(fileName)
+            manifest.groups.pop(uniqueGroup, None)
+            continue
+
+        with profiler.stage("combine", fileName) as record:
+            combineDf = joinGroup(sameResult, overlap, compact)
+            record["rows"] = len(combineDf)
+        writeFrame(combineDf, fileName, fileFormat(fileName))
+        groupedCombined[uniqueGroup] = combineDf
+        manifest.groups[uniqueGroup] = outputName
+
+    for Df in listData:
+        manifest.files[Df["fileName"]] = {
+            **listSignature[Df["fileName"]],
+            "group": Df["group"],
+            "year": Df["year"],
+            "rows": _rowKeys(Df["data"].index),
+        }
+    manifest.save()
+    return groupedCombined
+
+
+# LabelNormalizer of a process pool's worker, shared by every file it parses.
+_workerNormalizer = None
+
+
+def _initWorker():
+    """
+    Start a process pool's worker with its own LabelNormalizer, used by _parseFile when no normalizer is given.
+    """
+    global _workerNormalizer
+    _workerNormalizer = LabelNormalizer()
+
+
+def _parseFile(fileName, options, profile=False):
+    """
+    Parse a single file for BulkParse workers.
+
+    :param fileName: BPS data file name.
+    :param options: Dictionary of BPSData's parameters such as separator, fullResult & cache. If its normalizer is None, the worker's normalizer is used.
+    :param profile: Option for profiling the file's stages.
+    :return: Tuple of the pipeline result, None & the profiler records, or None, the error message & the records if parsing failed.
+    """
+    if options.get("normalizer") is None:
+        options = {**options, "normalizer": _workerNormalizer}
+    profiler = Profiler() if profile == True else None
+    try:
+        df = BPSData(fileName, profiler=profiler, **options)
+        return df.pipeline(), None, [] if profiler is None else profiler.records
+    except Exception as error:
+        return (
+            None,
+            f"{type(error).__name__}: {error}",
+            [] if profiler is None else profiler.records,
+        )
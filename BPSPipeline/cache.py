@@ -0,0 +1,191 @@
+import os
+import pickle
+from glob import glob
+from hashlib import sha1, sha256
+from pathlib import Path
+from typing import ClassVar
+from dataclasses import dataclass
+
+CACHE_VERSION = 2
+
+
+@dataclass
+class ResultCache:
+    """
+    Persistent on-disk cache of parsed pipeline results.
+
+    Each entry is a pickle file named by the hash of its source path and its key, so entries of the same file can be invalidated together.
+    The entry's modification time is refreshed when it's read, and the least recently used entries are evicted when the cache exceeds maxBytes.
+
+    :param pathCache: Directory location of the cache. If the location didn't exist, it automaticly created.
+    :param maxBytes: Size limit of the cache in bytes.
+    :param keyBy: Option for the cache key, 'content' hashes the file's content while 'stat' uses the file's mtime & size.
+    :cvar LIST_KEY: List contain allowable key's type.
+    """
+
+    pathCache: str = ".bpscache"
+    maxBytes: int = 512 * 1024**2
+    keyBy: str = "content"
+    LIST_KEY: ClassVar[list] = ["content", "stat"]
+
+    def __post_init__(self):
+        # Check if the key's type is in the allowable list.
+        assert (
+            self.keyBy in self.LIST_KEY
+        ), f"Something wrong: key {self.keyBy} not in the allowable list {self.LIST_KEY}"
+
+        Path(self.pathCache).mkdir(parents=True, exist_ok=True)
+
+    def _prefix(self, fileName):
+        return sha1(os.path.abspath(fileName).encode()).hexdigest()[:16]
+
+    def key(
+        self,
+        fileName,
+        separator=" ",
+        delimiter=",",
+        csvMode="pandas",
+        excelMode="pandas",
+        buffer=None,
+    ):
+        """
+        Method for computing the cache key of a file and its parse options.
+
+        The parse modes are part of the key, since each csv parse & xlsx reader doesn't give the exact same result.
+
+        :param fileName: BPS data file name.
+        :param separator: Character which separates each word.
+        :param delimiter: Character which separates data for csv file.
+        :param csvMode: Parse of csv file, either 'pandas' or 'typed'.
+        :param excelMode: Reader of xlsx file, either 'pandas' or 'fast'.
+        :param buffer: Raw bytes of the file that have already been read. If given with the 'content' key, they're hashed instead of reading the file again.
+        :return: Hexadecimal key of the file.
+        """
+        keyHash = sha256(
+            f"{CACHE_VERSION}|{separator}|{delimiter}|{csvMode}|{excelMode}|".encode()
+        )
+        if (self.keyBy == "content") & (buffer is not None):
+            keyHash.update(buffer)
+        elif self.keyBy == "content":
+            with open(fileName, "rb") as file:
+                for chunk in iter(lambda: file.read(1024**2), b""):
+                    keyHash.update(chunk)
+        else:
+            fileStat = os.stat(fileName)
+            keyHash.update(f"{fileStat.st_mtime_ns}|{fileStat.st_size}".encode())
+        return keyHash.hexdigest()
+
+    def _entryName(self, fileName, key):
+        return os.path.join(self.pathCache, f"{self._prefix(fileName)}-{key}.pkl")
+
+    def get(
+        self,
+        fileName,
+        separator=" ",
+        delimiter=",",
+        csvMode="pandas",
+        excelMode="pandas",
+        key=None,
+    ):
+        """
+        Method for reading the cached result of a file.
+
+        :param fileName: BPS data file name.
+        :param separator: Character which separates each word.
+        :param delimiter: Character which separates data for csv file.
+        :param csvMode: Parse of csv file, either 'pandas' or 'typed'.
+        :param excelMode: Reader of xlsx file, either 'pandas' or 'fast'.
+        :param key: Key of the file computed by the key method, so a miss followed by put hashes the file once. If None, it's computed.
+        :return: Dictionary of cached result & its metadata, or None if the file isn't cached.
+        """
+        if key is None:
+            key = self.key(fileName, separator, delimiter, csvMode, excelMode)
+        entryName = self._entryName(fileName, key)
+        try:
+            with open(entryName, "rb") as file:
+                entry = pickle.load(file)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+
+        # Mark the entry as recently used.
+        os.utime(entryName)
+        return entry
+
+    def put(
+        self,
+        fileName,
+        entry,
+        separator=" ",
+        delimiter=",",
+        csvMode="pandas",
+        excelMode="pandas",
+        key=None,
+    ):
+        """
+        Method for storing the result of a file, then evict the least recently used entries.
+
+        :param fileName: BPS data file name.
+        :param entry: Dictionary of result & its metadata.
+        :param separator: Character which separates each word.
+        :param delimiter: Character which separates data for csv file.
+        :param csvMode: Parse of csv file, either 'pandas' or 'typed'.
+        :param excelMode: Reader of xlsx file, either 'pandas' or 'fast'.
+        :param key: Key of the file computed by the key method, such as the one given to get. If None, it's computed.
+        """
+        if key is None:
+            key = self.key(fileName, separator, delimiter, csvMode, excelMode)
+        entryName = self._entryName(fileName, key)
+
+        # Write to a temporary file first so a reader never sees a partial entry.
+        tempName = f"{entryName}.{os.getpid()}.tmp"
+        with open(tempName, "wb") as file:
+            pickle.dump(entry, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tempName, entryName)
+
+        self.evict()
+
+    def invalidate(self, fileName=None):
+        """
+        Method for removing cached entries.
+
+        :param fileName: BPS data file name whose entries are removed. If None, every entry is removed.
+        """
+        prefix = "*" if fileName is None else f"{self._prefix(fileName)}-*"
+        for entryName in glob(os.path.join(self.pathCache, f"{prefix}.pkl")):
+            try:
+                os.remove(entryName)
+            except FileNotFoundError:
+                pass
+
+    def size(self):
+        """
+        Method for computing the total size of the cache.
+
+        :return: Total size of every entry in bytes.
+        """
+        return sum(
+            os.path.getsize(entryName)
+            for entryName in glob(os.path.join(self.pathCache, "*.pkl"))
+        )
+
+    def evict(self):
+        """
+        Method for removing the least recently used entries until the cache fits in maxBytes.
+        """
+        listEntry = []
+        for entryName in glob(os.path.join(self.pathCache, "*.pkl")):
+            try:
+                entryStat = os.stat(entryName)
+            except FileNotFoundError:
+                continue
+            listEntry.append((entryStat.st_mtime, entryStat.st_size, entryName))
+
+        totalSize = sum(entrySize for _, entrySize, _ in listEntry)
+        for _, entrySize, entryName in sorted(listEntry):
+            if totalSize <= self.maxBytes:
+                break
+            try:
+                os.remove(entryName)
+            except FileNotFoundError:
+                pass
+            totalSize -= entrySize
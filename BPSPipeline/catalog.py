@@ -0,0 +1,294 @@
+import csv
+import json
+from glob import glob
+from io import StringIO
+from os import path, stat
+from pathlib import Path
+from dataclasses import dataclass, field
+from pandas import DataFrame
+from .excel import iterExcelRows
+
+FOOTER_ROWS = 5
+HEADER_ROWS = 10
+
+
+def parseTitle(columnTitle, separator=" "):
+    """
+    Extract title, group & unit from the title column of BPS data.
+
+    - Title usually placed at index 1 in columns name. There is 2 condition, either or not the unit include in this section.
+    - Group is the title without its first word, limited to 2 words.
+    - Unit placed either at title or comodity types.
+
+    :param columnTitle: Column name at index 1 of BPS data.
+    :param separator: Character which separates each word.
+    :return: Tuple of title, group & unit. Unit is empty if it isn't placed at the title, it's then extracted from the comodity types.
+    """
+    unit = ""
+    if "(" in columnTitle:
+        title = separator.join(columnTitle.split("(")[0].split(separator)[:-1])
+        unit = columnTitle.split("(")[-1][:-1]
+    else:
+        title = columnTitle
+    group = separator.join(title.split(separator)[1:])
+
+    # Check if the Group more than 2 letters.
+    groupMaxLetterLength = 2
+    if len(group.split(separator)) > groupMaxLetterLength:
+        group = separator.join(group.split(separator)[:groupMaxLetterLength])
+
+    # Check if the Title more than 3 letters.
+    titleMaxLetterLength = 3
+    if len(title.split(separator)) > titleMaxLetterLength:
+        title = separator.join(title.split(separator)[:titleMaxLetterLength])
+
+    return title, group, unit
+
+
+def globFiles(pathInput):
+    """
+    List the files matched by a glob or a list of globs.
+
+    :param pathInput: Input path location for BPS data such as 'data/input/csv/*csv', or a list of them.
+    :return: Sorted list of unique file names.
+    """
+    listPattern = [pathInput] if isinstance(pathInput, str) else pathInput
+    return sorted(
+        set(fileName for pattern in listPattern for fileName in glob(pattern))
+    )
+
+
+def _isEmpty(cell):
+    return cell is None or str(cell).strip() == ""
+
+
+def _readCsvHeaderRows(file, delimiter):
+    """
+    Read the column row & header rows of a csv file opened in binary mode.
+
+    :return: Tuple of list of header rows and the byte offset of the first data row. The file is positioned after the first data row.
+    """
+    listRow = []
+    while True:
+        lineStart = file.tell()
+        line = file.readline()
+        if not line:
+            return listRow, lineStart
+        if not line.strip():
+            continue
+        row = next(
+            csv.reader(StringIO(line.decode("utf-8", "replace")), delimiter=delimiter)
+        )
+        # Header rows are the column row & the following rows without region name.
+        if len(listRow) > 0 and not _isEmpty(row[0]):
+            return listRow, lineStart
+        listRow.append(row)
+
+
+def _readCsvHeader(fileName, delimiter):
+    """
+    Read the column row & header rows of a csv file, then count its remaining lines & read its footer.
+
+    The data lines are streamed to be counted, so the scan is linear in the file's size, but they aren't parsed as csv or loaded into a dataframe.
+
+    :return: Tuple of list of header rows, number of data rows and the footer's lines.
+    """
+    with open(fileName, "rb") as file:
+        listRow, _ = _readCsvHeaderRows(file, delimiter)
+
+        # The remaining non-blank lines are data rows followed by the footer, blank lines are skipped like read_csv does.
+        numberRow = 1 + sum(1 for line in file if line.strip())
+
+        # Only the footer's lines are parsed as csv, from the last block of the file.
+        file.seek(0, 2)
+        file.seek(max(0, file.tell() - 4096))
+        listFooter = [line for line in file.read().splitlines() if line.strip()]
+        listFooter = [
+            next(
+                csv.reader(
+                    StringIO(line.decode("utf-8", "replace")), delimiter=delimiter
+                )
+            )[0]
+            for line in listFooter[-FOOTER_ROWS:]
+        ]
+
+    return listRow, numberRow, listFooter
+
+
+def _readExcelHeader(fileName):
+    """
+    Stream the header rows of the first sheet of an excel file without loading the whole workbook.
+
+    Past the first HEADER_ROWS rows only the first cell of each row is read, which is enough to count the data rows & to get the footer's lines.
+
+    :return: Tuple of list of header rows, number of data rows and the footer's lines.
+    """
+    listRow = []
+    listLast = []
+    numberRow = 0
+    numberEmpty = 0
+    for row in iterExcelRows(fileName, headerRows=HEADER_ROWS):
+        # Empty rows are kept like read_excel does, except the trailing ones.
+        if all(_isEmpty(cell) for cell in row):
+            numberEmpty += numberRow > 0
+            continue
+        if numberRow == 0:
+            listRow.append(row)
+            if len(listRow) > 1 and not _isEmpty(row[0]):
+                numberRow = 1
+            continue
+        numberRow += numberEmpty + 1
+        listLast = (listLast + [None] * numberEmpty + [row])[-FOOTER_ROWS:]
+        numberEmpty = 0
+
+    # Extend the header rows to the widest one, since their trailing empty cells aren't read.
+    width = max((len(row) for row in listRow), default=0)
+    listRow = [row + [""] * (width - len(row)) for row in listRow[:-1]]
+    listFooter = [str(row[0]) for row in listLast if row is not None]
+    return listRow, numberRow, listFooter
+
+
+def scanHeader(fileName, separator=" ", delimiter=","):
+    """
+    Read only the header & footer of BPS data to get its metadata without loading the data.
+
+    The data rows are streamed to be counted without being parsed, so the scan still reads the whole file.
+
+    :param fileName: BPS data file name.
+    :param separator: Character which separates each word.
+    :param delimiter: Character which separates data for csv file.
+    :return: Dictionary of title, group, unit, region, year, comodity, rows & source of the data.
+    """
+    extension = fileName.split(".")[-1]
+    if extension == "xlsx":
+        listRow, numberRow, listFooter = _readExcelHeader(fileName)
+    else:
+        listRow, numberRow, listFooter = _readCsvHeader(fileName, delimiter)
+
+    header = parseHeader(listRow, separator)
+    del header["columns"]
+    listSource = [line for line in listFooter if "url" in line.lower()]
+    return {
+        **header,
+        "rows": numberRow - FOOTER_ROWS,
+        "source": listSource[0] if listSource else None,
+    }
+
+
+def parseHeader(listRow, separator=" "):
+    """
+    Extract the metadata of BPS data from its column row & header rows.
+
+    :param listRow: List of the column row followed by the header rows, such as the commodity & year rows.
+    :param separator: Character which separates each word.
+    :return: Dictionary of title, group, unit, region, year, comodity & columns (column names as named by pandas).
+    """
+    # Name the empty column like pandas does.
+    columnRow = [
+        f"Unnamed: {number}" if _isEmpty(cell) else str(cell)
+        for number, cell in enumerate(listRow[0])
+    ]
+    headerRows = listRow[1:]
+    title, group, unit = parseTitle(columnRow[1], separator)
+
+    # The last header row contain each year value.
+    listYear = []
+    for cell in headerRows[-1][1:]:
+        if not _isEmpty(cell) and int(float(cell)) not in listYear:
+            listYear.append(int(float(cell)))
+
+    # Extract each commodities.
+    if len(headerRows) == 1:
+        listComodity = [group]
+    else:
+        listComodity = [str(cell) for cell in headerRows[0][1:] if not _isEmpty(cell)]
+
+    return {
+        "title": title,
+        "group": group,
+        "unit": unit,
+        "region": columnRow[0],
+        "year": listYear,
+        "comodity": listComodity,
+        "columns": columnRow,
+    }
+
+
+@dataclass
+class Catalog:
+    """
+    Catalog of BPS data metadata for every file matched by a glob, built from the header only.
+
+    :param pathInput: Input path location for BPS data, or a list of them.
+    :param pathCatalog: File location for persisting the catalog as json. If None, the catalog isn't persisted.
+    :param separator: Character which separates each word.
+    :param delimiter: Character which separates data for csv file.
+    :ivar listEntry: List of dictionary contain path, group, title, unit, year, comodity, rows, mtime & size of each file.
+    :ivar listError: Dictionary of file name and its error message for every file that failed to scan.
+    """
+
+    pathInput: str
+    pathCatalog: str = None
+    separator: str = " "
+    delimiter: str = ","
+    listEntry: list = field(default_factory=list, init=False)
+
+    def __post_init__(self):
+        self.listError = {}
+
+        # Reuse the persisted entries of files that haven't changed.
+        previousEntry = {}
+        if self.pathCatalog is not None and path.exists(self.pathCatalog):
+            with open(self.pathCatalog, encoding="utf-8") as file:
+                previousEntry = {entry["path"]: entry for entry in json.load(file)}
+
+        for fileName in globFiles(self.pathInput):
+            fileStat = stat(fileName)
+            entry = previousEntry.get(fileName)
+            if (
+                entry is None
+                or entry["mtime"] != fileStat.st_mtime
+                or entry["size"] != fileStat.st_size
+            ):
+                try:
+                    entry = scanHeader(fileName, self.separator, self.delimiter)
+                except Exception as error:
+                    self.listError[fileName] = f"{type(error).__name__}: {error}"
+                    continue
+                entry.update(
+                    path=fileName, mtime=fileStat.st_mtime, size=fileStat.st_size
+                )
+            self.listEntry.append(entry)
+
+        if self.pathCatalog is not None:
+            self.save()
+
+    def save(self, pathCatalog=None):
+        """
+        Method for persisting the catalog as json file.
+
+        :param pathCatalog: File location of the catalog. Default value is the catalog's pathCatalog.
+        """
+        pathCatalog = pathCatalog or self.pathCatalog
+        Path(pathCatalog).parent.mkdir(parents=True, exist_ok=True)
+        with open(pathCatalog, "w", encoding="utf-8") as file:
+            json.dump(self.listEntry, file, indent=1)
+
+    def groupFiles(self):
+        """
+        Method for grouping files by their commodity group.
+
+        :return: Dictionary of group and its list of file names, both sorted.
+        """
+        groupedFile = {}
+        for entry in self.listEntry:
+            groupedFile.setdefault(entry["group"], []).append(entry["path"])
+        return dict(sorted(groupedFile.items()))
+
+    def toFrame(self):
+        """
+        Method for viewing the catalog as a dataframe.
+
+        :return: DataFrame with one row for each file.
+        """
+        return DataFrame(self.listEntry)
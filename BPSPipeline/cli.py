@@ -0,0 +1,303 @@
+"""
+Resumable batch job runner of the BPS pipeline.
+
+Usage:
+
+    python -m BPSPipeline job.json
+    bps-pipeline job.json --restart
+
+The job manifest is a json file such as:
+
+    {
+        "inputs": ["data/input/csv/*csv", "data/input/excel/*xlsx"],
+        "output": "data/output/job",
+        "separator": "_",
+        "format": "parquet",
+        "workers": 4,
+        "options": {"csvMode": "typed"}
+    }
+
+Each parsed file is written as a part & checkpointed in the state file in batches, so a rerun after a crash only parses the files since the last checkpoint.
+A file that fails to parse is recorded in the quarantine report & skipped until it changes, instead of stopping the job.
+"""
+
+import sys
+import json
+import argparse
+from os import getpid, path, remove, replace
+from time import monotonic
+from hashlib import sha1
+from pathlib import Path
+from dataclasses import dataclass, field
+from .bpsmodule import BulkParse
+from .catalog import globFiles
+from .export import FORMAT_EXTENSION, WRITER, frameFileName, readFrame, writeFrame
+from .join import LIST_OVERLAP, joinGroup
+from .manifest import fileSignature, groupFileName
+
+STATE_VERSION = 1
+LIST_OPTION = ["excelMode", "excelCache", "csvMode", "csvEngine", "prefetch", "compact"]
+
+
+def _readJson(fileName, default):
+    if fileName is None or not path.exists(fileName):
+        return default
+    with open(fileName, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def _writeJson(content, fileName):
+    # Write to a temporary file first so a crash never leaves a partial checkpoint.
+    tempName = f"{fileName}.{getpid()}.tmp"
+    with open(tempName, "w", encoding="utf-8") as file:
+        json.dump(content, file, indent=1)
+    replace(tempName, fileName)
+
+
+def _isSame(entry, signature):
+    return entry is not None and (entry["mtime"], entry["size"]) == (
+        signature["mtime"],
+        signature["size"],
+    )
+
+
+@dataclass
+class BatchJob:
+    """
+    Batch job parsing every input file into a part, then combining the parts of each commodity group.
+
+    :param inputs: List of globs of the input files.
+    :param output: Output path location of the parts, group outputs, state file & quarantine report.
+    :param separator: Character that which separates each word.
+    :param format: Format of the parts & group outputs, either 'csv', 'parquet', 'feather' or 'arrow'.
+    :param workers: Number of workers used to parse the files.
+    :param executor: Pool used when workers is more than 1, either 'process' or 'thread'.
+    :param overlap: Policy when two files of a group have the same year, either 'newest', 'error' or 'equal'.
+    :param options: Dictionary of BulkParse's parse parameters, which are listed in LIST_OPTION.
+    :param state: File location of the checkpoint state. Default value is 'job_state.json' at the output.
+    :param quarantine: File location of the quarantine report. Default value is 'quarantine.json' at the output.
+    :param checkpointFiles: Number of parsed files after which the state & the quarantine report are written.
+    :param checkpointSeconds: Seconds after which the state & the quarantine report are written, even if fewer files were parsed.
+    """
+
+    inputs: list
+    output: str = "./"
+    separator: str = " "
+    format: str = "csv"
+    workers: int = 1
+    executor: str = "process"
+    overlap: str = "newest"
+    options: dict = field(default_factory=dict)
+    state: str = None
+    quarantine: str = None
+    checkpointFiles: int = 50
+    checkpointSeconds: float = 30.0
+
+    def __post_init__(self):
+        if isinstance(self.inputs, str):
+            self.inputs = [self.inputs]
+
+        # Check if the format & overlap policy are in the allowable lists.
+        assert (
+            self.format in WRITER
+        ), f"Something wrong: format {self.format} not in the allowable list {list(WRITER)}"
+        assert (
+            self.overlap in LIST_OVERLAP
+        ), f"Something wrong: overlap {self.overlap} not in the allowable list {LIST_OVERLAP}"
+
+        # Check if the options are in the allowable list.
+        for option in self.options:
+            assert (
+                option in LIST_OPTION
+            ), f"Something wrong: option {option} not in the allowable list {LIST_OPTION}"
+
+        if self.state is None:
+            self.state = path.join(self.output, "job_state.json")
+        if self.quarantine is None:
+            self.quarantine = path.join(self.output, "quarantine.json")
+
+    @classmethod
+    def fromJson(cls, fileName):
+        """
+        Create a job from its json manifest.
+
+        :param fileName: File location of the job manifest.
+        :return: BatchJob.
+        """
+        return cls(**_readJson(fileName, None))
+
+    def _partName(self, fileName):
+        name = sha1(path.abspath(fileName).encode()).hexdigest()[:16]
+        return path.join("parts", frameFileName(name, self.format))
+
+    def run(self, restart=False, log=None):
+        """
+        Method for running the job, resuming from the last checkpoint unless restart is set.
+
+        The files that are checkpointed & unchanged aren't parsed again, neither are the quarantined ones until they change.
+        The checkpoint is written every checkpointFiles files or checkpointSeconds seconds, and once every file is parsed, so a crash only parses the files since the last checkpoint again.
+        Each group is only combined again when the parts of its files changed.
+
+        :param restart: Option for ignoring the state & the quarantine report, so every file is parsed again.
+        :param log: Function called with a message after each file. If None, nothing is logged.
+        :return: Dictionary of the number of parsed, skipped & quarantined files, and the list of combined groups.
+        """
+        log = (lambda message: None) if log is None else log
+        emptyState = {"version": STATE_VERSION, "files": {}, "groups": {}}
+        state = emptyState if restart else _readJson(self.state, emptyState)
+        quarantine = {} if restart else _readJson(self.quarantine, {})
+        Path(self.output, "parts").mkdir(parents=True, exist_ok=True)
+
+        listFile = globFiles(self.inputs)
+        listSignature = {fileName: fileSignature(fileName) for fileName in listFile}
+        listPending = [
+            fileName
+            for fileName in listFile
+            if not _isSame(state["files"].get(fileName), listSignature[fileName])
+            and not _isSame(quarantine.get(fileName), listSignature[fileName])
+        ]
+        for fileName in listPending:
+            quarantine.pop(fileName, None)
+
+        bulk = BulkParse(
+            self.inputs,
+            self.output,
+            self.separator,
+            workers=self.workers,
+            executor=self.executor,
+            lazy=True,
+            **self.options,
+        )
+
+        def checkQuarantine():
+            for fileName, error in bulk.listError.items():
+                if fileName not in quarantine:
+                    quarantine[fileName] = {**listSignature[fileName], "error": error}
+                    log(f"quarantined {fileName}: {error}")
+
+        numberParsed = 0
+        numberPending = 0
+        lastCheckpoint = monotonic()
+        for fileName, result in bulk.iterResults(listPending):
+            partName = self._partName(fileName)
+            writeFrame(result["data"], path.join(self.output, partName), self.format)
+            state["files"][fileName] = {
+                **listSignature[fileName],
+                "group": result["group"],
+                "year": result["year"],
+                "part": partName,
+            }
+            numberParsed += 1
+            numberPending += 1
+            log(f"parsed {fileName}")
+
+            # Rewriting the whole state after each file would grow quadratically with the files.
+            if (numberPending >= self.checkpointFiles) or (
+                monotonic() - lastCheckpoint >= self.checkpointSeconds
+            ):
+                checkQuarantine()
+                _writeJson(state, self.state)
+                _writeJson(quarantine, self.quarantine)
+                numberPending = 0
+                lastCheckpoint = monotonic()
+        checkQuarantine()
+
+        # Drop the files that no longer exist or are quarantined.
+        for fileName in list(state["files"]):
+            if fileName not in listSignature or fileName in quarantine:
+                entry = state["files"].pop(fileName)
+                partName = path.join(self.output, entry["part"])
+                if path.exists(partName):
+                    remove(partName)
+        _writeJson(state, self.state)
+        _writeJson(quarantine, self.quarantine)
+
+        listCombined = self._combine(state, log)
+        return {
+            "parsed": numberParsed,
+            "skipped": len(listFile) - len(listPending),
+            "quarantined": len(quarantine),
+            "combined": listCombined,
+        }
+
+    def _combine(self, state, log):
+        """
+        Combine the parts of each group whose files changed since its last combine.
+
+        :return: List of the combined groups.
+        """
+        groupedFile = {}
+        for fileName, entry in sorted(state["files"].items()):
+            groupedFile.setdefault(entry["group"], []).append(fileName)
+
+        listCombined = []
+        for uniqueGroup, listFile in sorted(groupedFile.items()):
+            signature = sha1(
+                json.dumps(
+                    [[fileName, state["files"][fileName]] for fileName in listFile]
+                ).encode()
+            ).hexdigest()
+            outputName = groupFileName(
+                uniqueGroup, extension=FORMAT_EXTENSION[self.format][1:]
+            )
+            previous = state["groups"].get(uniqueGroup)
+            if (
+                previous is not None
+                and previous["signature"] == signature
+                and path.exists(path.join(self.output, outputName))
+            ):
+                continue
+
+            listResult = [
+                {
+                    "data": readFrame(
+                        path.join(self.output, state["files"][fileName]["part"])
+                    ),
+                    "fileName": fileName,
+                }
+                for fileName in listFile
+            ]
+            combineDf = joinGroup(listResult, self.overlap)
+            writeFrame(combineDf, path.join(self.output, outputName), self.format)
+            state["groups"][uniqueGroup] = {
+                "signature": signature,
+                "output": outputName,
+            }
+            _writeJson(state, self.state)
+            listCombined.append(uniqueGroup)
+            log(f"combined {uniqueGroup} into {outputName}")
+
+        # Remove the outputs of the groups whose files were all removed.
+        for uniqueGroup in [
+            group for group in state["groups"] if group not in groupedFile
+        ]:
+            outputName = path.join(
+                self.output, state["groups"].pop(uniqueGroup)["output"]
+            )
+            if path.exists(outputName):
+                remove(outputName)
+        _writeJson(state, self.state)
+        return listCombined
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("job", help="File location of the job manifest as json.")
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="Ignore the checkpoints & the quarantine report, then parse every file.",
+    )
+    parser.add_argument("--quiet", action="store_true", help="Only print the summary.")
+    args = parser.parse_args(argv)
+
+    job = BatchJob.fromJson(args.job)
+    summary = job.run(args.restart, log=None if args.quiet else print)
+    print(json.dumps(summary))
+    if summary["quarantined"] > 0:
+        print(f"Quarantine report: {job.quarantine}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+import numpy as np
+from pandas import CategoricalDtype, MultiIndex
+from dataclasses import dataclass, field
+
+LABEL_COLUMNS = ["group", "unit", "type"]
+INT32_RANGE = (np.iinfo("int32").min, np.iinfo("int32").max)
+INT64_RANGE = (np.iinfo("int64").min, np.iinfo("int64").max)
+
+
+def narrowDtype(values):
+    """
+    Find the narrowest dtype that holds the values without losing any of them.
+
+    :param values: Array of float values, NaN is treated as missing value.
+    :return: 'Int32' or 'Int64' for whole numbers, 'float32' if it's lossless, otherwise 'float64'.
+    """
+    values = np.asarray(values, dtype="float64")
+    finite = values[~np.isnan(values)]
+    if (
+        len(finite) > 0
+        and np.all(np.isfinite(finite))
+        and np.all(finite == np.round(finite))
+    ):
+        if INT32_RANGE[0] <= finite.min() and finite.max() <= INT32_RANGE[1]:
+            return "Int32"
+        if INT64_RANGE[0] <= finite.min() and finite.max() <= INT64_RANGE[1]:
+            return "Int64"
+    if np.array_equal(
+        values.astype("float32").astype("float64"), values, equal_nan=True
+    ):
+        return "float32"
+    return "float64"
+
+
+def frameBytes(df, shared=False):
+    """
+    Compute the memory usage of a dataframe including its index & string labels.
+
+    :param df: DataFrame.
+    :param shared: Option for counting only the codes of categorical labels, since their categories are shared by every result & counted once by LabelDictionary.
+    :return: Total bytes.
+    """
+    if shared == False:
+        return int(df.memory_usage(index=True, deep=True).sum())
+
+    totalBytes = 0
+    for column in df.columns:
+        series = df[column]
+        if isinstance(series.dtype, CategoricalDtype):
+            totalBytes += series.cat.codes.nbytes
+        else:
+            totalBytes += series.memory_usage(index=False, deep=True)
+
+    if isinstance(df.index, MultiIndex):
+        totalBytes += sum(codes.nbytes for codes in df.index.codes)
+        totalBytes += sum(
+            level.memory_usage(deep=True)
+            for level in df.index.levels
+            if not isinstance(level.dtype, CategoricalDtype)
+        )
+    else:
+        totalBytes += df.index.memory_usage(deep=True)
+    return int(totalBytes)
+
+
+@dataclass
+class LabelDictionary:
+    """
+    Dictionary of label categories shared across the results of many files.
+
+    Categories are only appended, so the codes of an already compacted result stay valid when the dictionary grows.
+
+    :ivar categories: Dictionary of label name ('region', 'group', 'unit' & 'type') and its list of categories.
+    """
+
+    categories: dict = field(default_factory=dict)
+
+    def update(self, name, values):
+        """
+        Method for appending new labels to the categories.
+
+        :param name: Label name.
+        :param values: Array of labels.
+        """
+        listCategory = self.categories.setdefault(name, [])
+        known = set(listCategory)
+        for value in dict.fromkeys(values):
+            if value not in known and value == value:
+                listCategory.append(value)
+                known.add(value)
+
+    def dtype(self, name):
+        """
+        Method for getting the categorical dtype of a label.
+
+        :param name: Label name.
+        :return: CategoricalDtype with the current categories.
+        """
+        return CategoricalDtype(self.categories.get(name, []))
+
+    def nbytes(self):
+        """
+        Method for computing the memory usage of every category.
+
+        :return: Total bytes.
+        """
+        return int(
+            sum(
+                self.dtype(name).categories.memory_usage(deep=True)
+                for name in self.categories
+            )
+        )
+
+
+def _labelName(position, column):
+    # The region column's name differs between files, so it's shared as 'region'.
+    return "region" if position == 0 else column
+
+
+def compactFrame(df, labels=None):
+    """
+    Convert label columns to shared categoricals and year columns to the narrowest lossless dtype.
+
+    Works on the flat pipeline result (labels as columns) and the fullResult data (labels as index).
+
+    :param df: Pipeline result.
+    :param labels: LabelDictionary shared across files. If None, a new dictionary is used.
+    :return: Compacted DataFrame.
+    """
+    labels = LabelDictionary() if labels is None else labels
+    df = df.copy()
+
+    if df.index.nlevels > 1:
+        listLevel = []
+        for position, name in enumerate(df.index.names):
+            values = df.index.get_level_values(position)
+            labels.update(_labelName(position, name), values)
+            listLevel.append(values.astype(labels.dtype(_labelName(position, name))))
+        df.index = MultiIndex.from_arrays(listLevel, names=df.index.names)
+        listLabel = []
+    else:
+        listLabel = [df.columns[0]] + [
+            column for column in LABEL_COLUMNS if column in df.columns
+        ]
+
+    for position, column in enumerate(df.columns):
+        if column in listLabel:
+            name = _labelName(position, column)
+            labels.update(name, df[column])
+            df[column] = df[column].astype(labels.dtype(name))
+        else:
+            df[column] = df[column].astype(narrowDtype(df[column]))
+    return df
+
+
+def shareCategories(df, labels):
+    """
+    Set the categories of a compacted result to the latest categories of the shared dictionary.
+
+    :param df: Result compacted by compactFrame with the same dictionary.
+    :param labels: LabelDictionary shared across files.
+    :return: DataFrame whose label dtypes are equal to every other result's.
+    """
+    if df.index.nlevels > 1:
+        df.index = MultiIndex.from_arrays(
+            [
+                df.index.get_level_values(position).set_categories(
+                    labels.categories[_labelName(position, name)]
+                )
+                for position, name in enumerate(df.index.names)
+            ],
+            names=df.index.names,
+        )
+    else:
+        for position, column in enumerate(df.columns):
+            if isinstance(df[column].dtype, CategoricalDtype):
+                df[column] = df[column].cat.set_categories(
+                    labels.categories[_labelName(position, column)]
+                )
+    return df
@@ -0,0 +1,267 @@
+import zipfile
+from os import getpid, path, remove, replace, stat
+from glob import glob
+from hashlib import sha1
+from pathlib import Path
+from xml.etree import ElementTree
+from pandas.io.parsers import TextParser
+from .export import writeCsv
+
+CHUNK_SIZE = 1024**2
+RELATIONSHIP = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id"
+
+
+def _localName(tag):
+    # The parser resolves a prefix such as 'x:row' to '{namespace}row'.
+    return tag.rsplit("}", 1)[-1]
+
+
+def _columnNumber(letters):
+    number = 0
+    for letter in letters:
+        number = number * 26 + ord(letter) - 64
+    return number - 1
+
+
+def _stringText(element):
+    """
+    Join the text of a shared string, which is either one 't' element or the 't' of each rich text run.
+    """
+    listText = []
+    for child in element:
+        name = _localName(child.tag)
+        if name == "t":
+            listText.append(child.text or "")
+        elif name == "r":
+            listText.extend(
+                text.text or "" for text in child if _localName(text.tag) == "t"
+            )
+    return "".join(listText)
+
+
+def _sheetPath(workBook, sheet=0):
+    """
+    Find the xml file of a sheet from the workbook's relationships.
+
+    :param workBook: Opened ZipFile of the excel file.
+    :param sheet: Sheet position or name.
+    :return: Member name of the sheet such as 'xl/worksheets/sheet1.xml'.
+    """
+    listSheet = ElementTree.fromstring(workBook.read("xl/workbook.xml")).iter()
+    listSheet = [element for element in listSheet if element.tag.endswith("}sheet")]
+    if isinstance(sheet, str):
+        listSheet = [element for element in listSheet if element.get("name") == sheet]
+        sheet = 0
+
+    # Check if the sheet exists.
+    assert sheet < len(listSheet), f"Something wrong: sheet {sheet} not found"
+
+    relationship = ElementTree.fromstring(workBook.read("xl/_rels/workbook.xml.rels"))
+    target = {element.get("Id"): element.get("Target") for element in relationship}
+    target = target[listSheet[sheet].get(RELATIONSHIP)]
+    return target[1:] if target.startswith("/") else f"xl/{target}"
+
+
+def _sharedStrings(workBook):
+    if "xl/sharedStrings.xml" not in workBook.namelist():
+        return []
+    listString = []
+    with workBook.open("xl/sharedStrings.xml") as file:
+        for _, element in ElementTree.iterparse(file):
+            if _localName(element.tag) == "si":
+                listString.append(_stringText(element))
+                element.clear()
+    return listString
+
+
+def _cellValue(cellType, value, sharedStrings):
+    """
+    Convert a cell's value to the way pandas converts openpyxl cells: empty as '', whole numbers as int.
+    """
+    if not value:
+        return ""
+    if cellType == "s":
+        return sharedStrings[int(value)]
+    if cellType == "str":
+        return value
+    if cellType == "b":
+        return value == "1"
+    if cellType == "e":
+        return float("nan")
+    try:
+        return int(value)
+    except ValueError:
+        value = float(value)
+        return int(value) if value.is_integer() else value
+
+
+class _SheetTarget:
+    """
+    Parser target building the rows of a sheet from its element events, matched by their local names.
+
+    The completed rows are collected in listRow, skipped rows as empty lists, so they can be yielded after each fed chunk.
+    Past the first headerRows rows, only the first cell of each row is converted.
+    """
+
+    def __init__(self, sharedStrings, headerRows=None):
+        self.sharedStrings = sharedStrings
+        self.headerRows = headerRows
+        self.numberColumn = None
+        self.isSkipped = False
+        self.listName = {}
+        self.listRow = []
+        self.numberRow = 0
+        self.row = None
+        self.cellType = None
+        self.value = None
+        self.listText = None
+        self.isPhonetic = False
+
+    def _name(self, tag):
+        name = self.listName.get(tag)
+        if name is None:
+            name = self.listName[tag] = _localName(tag)
+        return name
+
+    def start(self, tag, attrib):
+        if self.isSkipped:
+            return
+        name = self._name(tag)
+        if name == "c":
+            reference = attrib.get("r")
+            if reference:
+                column = _columnNumber(reference.rstrip("0123456789"))
+            else:
+                column = len(self.row)
+            if (self.numberColumn is not None) and (column >= self.numberColumn):
+                self.isSkipped = True
+                return
+            self.row.extend([""] * (column - len(self.row)))
+            self.cellType = attrib.get("t", "n")
+            self.value = [] if self.cellType == "inlineStr" else None
+        elif name == "v":
+            self.listText = []
+        elif name == "t":
+            if (self.cellType == "inlineStr") & (self.isPhonetic == False):
+                self.listText = []
+        elif name == "rPh":
+            self.isPhonetic = True
+        elif name == "row":
+            reference = attrib.get("r")
+            if reference:
+                for _ in range(int(reference) - 1 - self.numberRow):
+                    self.numberRow += 1
+                    self.listRow.append([])
+            self.row = []
+
+    def data(self, text):
+        if self.listText is not None:
+            self.listText.append(text)
+
+    def end(self, tag):
+        name = self._name(tag)
+        if self.isSkipped:
+            self.isSkipped = name != "c"
+            return
+        if name == "c":
+            if self.cellType == "inlineStr":
+                self.row.append("".join(self.value))
+            else:
+                self.row.append(
+                    _cellValue(self.cellType, self.value, self.sharedStrings)
+                )
+            self.cellType = None
+        elif name == "v":
+            if self.cellType != "inlineStr":
+                self.value = "".join(self.listText)
+            self.listText = None
+        elif name == "t":
+            if self.listText is not None:
+                self.value.append("".join(self.listText))
+                self.listText = None
+        elif name == "rPh":
+            self.isPhonetic = False
+        elif name == "row":
+            row = self.row
+            while row and row[-1] == "":
+                row.pop()
+            self.numberRow += 1
+            self.listRow.append(row)
+            self.row = None
+            if (self.headerRows is not None) and (self.numberRow >= self.headerRows):
+                self.numberColumn = 1
+
+
+def iterExcelRows(fileName, sheet=0, headerRows=None):
+    """
+    Stream the rows of one sheet straight from the xlsx archive, without loading the workbook & its styles.
+
+    Only the sheet's xml & the shared strings are read. The sheet is fed to the xml parser chunk by chunk & its elements are matched by their local names, so a namespace prefix such as 'x:row' is read too.
+    Since the styles aren't loaded, date cells stay as their serial number.
+
+    :param fileName: Excel file name, or a file object opened in binary mode such as BytesIO.
+    :param sheet: Sheet position or name.
+    :param headerRows: Number of first rows whose every cell is read. If given, the next rows only have their first cell, so a sheet is scanned without converting its data. If None, every cell is read.
+    :return: Generator of rows, each row is a list of cells without its trailing empty cells. Skipped rows are yielded as empty lists.
+    """
+    with zipfile.ZipFile(fileName) as workBook:
+        target = _SheetTarget(_sharedStrings(workBook), headerRows)
+        parser = ElementTree.XMLParser(target=target)
+        with workBook.open(_sheetPath(workBook, sheet)) as file:
+            while True:
+                chunk = file.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                parser.feed(chunk)
+                yield from target.listRow
+                target.listRow = []
+        parser.close()
+        yield from target.listRow
+
+
+def readExcel(fileName, sheet=0):
+    """
+    Read one sheet of an xlsx file into the same dataframe as read_excel, by streaming its rows with iterExcelRows.
+
+    :param fileName: Excel file name, or a file object opened in binary mode such as BytesIO.
+    :param sheet: Sheet position or name.
+    :return: DataFrame with the first row as its columns.
+    """
+    listRow = list(iterExcelRows(fileName, sheet))
+
+    # Trim the trailing empty rows & extend every row to the widest one like read_excel does.
+    while listRow and not listRow[-1]:
+        listRow.pop()
+    width = max((len(row) for row in listRow), default=0)
+    listRow = [row + [""] * (width - len(row)) for row in listRow]
+    return TextParser(listRow, header=0, skip_blank_lines=False).read()
+
+
+def excelToCsv(fileName, pathCache=".bpscache/excel", sheet=0):
+    """
+    Convert an xlsx file to csv once, so the next runs read the csv instead of the xlsx.
+
+    The converted file is named by the hash of the source path & its mtime & size, so a changed xlsx is converted again and its outdated csv is removed.
+
+    :param fileName: Excel file name.
+    :param pathCache: Directory location of the converted files. If the location didn't exist, it automaticly created.
+    :param sheet: Sheet position or name.
+    :return: File name of the converted csv.
+    """
+    fileStat = stat(fileName)
+    prefix = sha1(path.abspath(fileName).encode()).hexdigest()[:16]
+    csvName = path.join(
+        pathCache, f"{prefix}-{fileStat.st_mtime_ns}-{fileStat.st_size}-{sheet}.csv"
+    )
+    if path.exists(csvName):
+        return csvName
+
+    Path(pathCache).mkdir(parents=True, exist_ok=True)
+    for outdated in glob(path.join(pathCache, f"{prefix}-*-{sheet}.csv")):
+        remove(outdated)
+
+    # Write to a temporary file first so a concurrent reader never sees a partial file.
+    tempName = f"{csvName}.{getpid()}.tmp"
+    writeCsv(readExcel(fileName, sheet), tempName)
+    replace(tempName, csvName)
+    return csvName
@@ -0,0 +1,307 @@
+import json
+from pathlib import Path
+from typing import Callable
+from concurrent.futures import ThreadPoolExecutor
+from pandas import read_csv
+
+LIST_COMPRESSION = [None, "gzip", "zstd"]
+FORMAT_COMPRESSION = {
+    "csv": LIST_COMPRESSION,
+    "parquet": LIST_COMPRESSION,
+    "feather": [None, "lz4", "zstd"],
+    "arrow": [None, "lz4", "zstd"],
+}
+COMPRESSION_EXTENSION = {None: "", "gzip": ".gz", "zstd": ".zst"}
+FORMAT_EXTENSION = {
+    "csv": ".csv",
+    "parquet": ".parquet",
+    "feather": ".feather",
+    "arrow": ".arrow",
+}
+INDEX_COLUMNS = ["group", "unit", "type"]
+METADATA_KEY = b"bps-pipeline"
+BUFFER_SIZE = 1024**2
+
+
+def writeCsv(df, fileName, compression=None, index=False):
+    """
+    Write a dataframe as csv file through a large write buffer.
+
+    :param df: DataFrame to write.
+    :param fileName: File location, its parent directory is automaticly created.
+    :param compression: Compression method, either None, 'gzip' or 'zstd'.
+    :param index: Option for writing the dataframe's index.
+    """
+    Path(fileName).parent.mkdir(parents=True, exist_ok=True)
+    with open(fileName, "wb", buffering=BUFFER_SIZE) as file:
+        df.to_csv(file, index=index, compression=compression)
+
+
+def _importArrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError("Columnar output formats require pyarrow to be installed.")
+    return pyarrow
+
+
+def _isIndexed(df):
+    return df.index.nlevels > 1 or df.index.name is not None
+
+
+def _toTable(df):
+    """
+    Convert a dataframe to an arrow table, keeping its index & integer year columns in the schema's metadata.
+    """
+    pa = _importArrow()
+    listIndex = list(df.index.names) if _isIndexed(df) else []
+    listYear = [column for column in df.columns if isinstance(column, int)]
+    if listIndex:
+        df = df.reset_index()
+    table = pa.Table.from_pandas(df.rename(columns=str), preserve_index=False)
+    metadata = {"index": listIndex, "year": [str(year) for year in listYear]}
+    return table.replace_schema_metadata(
+        {**(table.schema.metadata or {}), METADATA_KEY: json.dumps(metadata)}
+    )
+
+
+def _fromTable(table):
+    """
+    Convert an arrow table written by _toTable back to a dataframe with its index & integer year columns.
+    """
+    df = table.to_pandas()
+    metadata = json.loads((table.schema.metadata or {}).get(METADATA_KEY, b"{}"))
+    listYear = metadata.get("year", [])
+    df = df.rename(columns={year: int(year) for year in listYear})
+    if metadata.get("index"):
+        df = df.set_index(metadata["index"])
+    return df
+
+
+def _writeCsvFrame(df, fileName, compression=None):
+    writeCsv(df, fileName, compression, index=_isIndexed(df))
+
+
+def _readCsvFrame(fileName):
+    df = read_csv(fileName)
+    df = df.rename(
+        columns={column: int(column) for column in df.columns if column.isdigit()}
+    )
+
+    # An indexed result is written as region, group, unit & type while a flat result has type before unit.
+    if df.columns[1:4].tolist() == INDEX_COLUMNS:
+        df = df.set_index(df.columns[:4].tolist())
+    return df
+
+
+def _writeParquetFrame(df, fileName, compression=None):
+    from pyarrow import parquet
+
+    parquet.write_table(_toTable(df), fileName, compression=compression or "none")
+
+
+def _readParquetFrame(fileName):
+    from pyarrow import parquet
+
+    return _fromTable(parquet.read_table(fileName))
+
+
+def _writeFeatherFrame(df, fileName, compression=None):
+    from pyarrow import feather
+
+    feather.write_feather(
+        _toTable(df), fileName, compression=compression or "uncompressed"
+    )
+
+
+def _readFeatherFrame(fileName):
+    from pyarrow import feather
+
+    return _fromTable(feather.read_table(fileName))
+
+
+def _writeArrowFrame(df, fileName, compression=None):
+    pa = _importArrow()
+
+    # Uncompressed IPC file can be memory-mapped without copying its buffers.
+    table = _toTable(df)
+    options = pa.ipc.IpcWriteOptions(compression=compression)
+    with pa.OSFile(fileName, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema, options=options) as writer:
+            writer.write_table(table)
+
+
+def _readArrowFrame(fileName):
+    pa = _importArrow()
+
+    with pa.memory_map(fileName, "r") as source:
+        return _fromTable(pa.ipc.open_file(source).read_all())
+
+
+WRITER = {
+    "csv": _writeCsvFrame,
+    "parquet": _writeParquetFrame,
+    "feather": _writeFeatherFrame,
+    "arrow": _writeArrowFrame,
+}
+READER = {
+    "csv": _readCsvFrame,
+    "parquet": _readParquetFrame,
+    "feather": _readFeatherFrame,
+    "arrow": _readArrowFrame,
+}
+
+
+def frameFileName(fileName, format="csv", compression=None):
+    """
+    Get the file name of a result with the extension of its format.
+
+    :param fileName: File location without extension.
+    :param format: Output format, one of WRITER's keys.
+    :param compression: Compression method, only appended as extension for csv format.
+    :return: File name such as 'result.csv.gz' or 'result.parquet'.
+    """
+    extension = FORMAT_EXTENSION.get(format, f".{format}")
+    if format == "csv":
+        extension += COMPRESSION_EXTENSION.get(compression, "")
+    return fileName + extension
+
+
+def checkCompression(format, compression):
+    """
+    Check if the compression is supported by the format, since the arrow file formats only support 'lz4' & 'zstd'.
+
+    :param format: Output format, one of WRITER's keys.
+    :param compression: Compression method.
+    """
+    listCompression = FORMAT_COMPRESSION.get(format, LIST_COMPRESSION)
+    assert (
+        compression in listCompression
+    ), f"Something wrong: compression {compression} not in the allowable list {listCompression} of format {format}"
+
+
+def writeFrame(df, fileName, format="csv", compression=None):
+    """
+    Write a pipeline or combined result in one of the pluggable formats.
+
+    The [region, group, unit, type] index and the integer year columns are restored by readFrame.
+    A new format can be plugged in by adding its function to WRITER & READER.
+
+    :param df: DataFrame to write.
+    :param fileName: File location, its parent directory is automaticly created.
+    :param format: Output format, either 'csv', 'parquet', 'feather' or 'arrow' (memory-mappable Arrow IPC).
+    :param compression: Compression method, either None, 'gzip' or 'zstd' for csv & parquet, or None, 'lz4' or 'zstd' for feather & arrow.
+    :return: File location.
+    """
+    # Check if the format & its compression are in the allowable lists.
+    assert (
+        format in WRITER
+    ), f"Something wrong: format {format} not in the allowable list {list(WRITER)}"
+    checkCompression(format, compression)
+
+    Path(fileName).parent.mkdir(parents=True, exist_ok=True)
+    WRITER[format](df, fileName, compression)
+    return fileName
+
+
+def fileFormat(fileName):
+    """
+    Infer the format of a result from its file's extension.
+
+    :param fileName: File location.
+    :return: Format name such as 'csv' or 'parquet'.
+    """
+    extension = [
+        suffix for suffix in Path(fileName).suffixes if suffix not in [".gz", ".zst"]
+    ]
+    return extension[-1][1:] if extension else "csv"
+
+
+def readFrame(fileName, format=None):
+    """
+    Read a result written by writeFrame.
+
+    :param fileName: File location.
+    :param format: Input format. If None, the format is inferred from the file's extension.
+    :return: DataFrame with its index & integer year columns.
+    """
+    if format is None:
+        format = fileFormat(fileName)
+
+    # Check if the format is in the allowable list.
+    assert (
+        format in READER
+    ), f"Something wrong: format {format} not in the allowable list {list(READER)}"
+
+    return READER[format](fileName)
+
+
+def writePartitions(
+    df,
+    keyColumn,
+    getFileName: Callable,
+    workers=4,
+    compression=None,
+    format="csv",
+):
+    """
+    Partition a dataframe by a key column in one pass, then write each partition concurrently.
+
+    :param df: DataFrame to partition.
+    :param keyColumn: Column name of the partition's key.
+    :param getFileName: Function that get the file location of a key value, without extension.
+    :param workers: Number of threads writing the partitions.
+    :param compression: Compression method, either None, 'gzip' or 'zstd' for csv & parquet, or None, 'lz4' or 'zstd' for feather & arrow.
+    :param format: Output format, one of WRITER's keys.
+    :return: List of written file names in the order of the key's first appearance.
+    """
+    # Check if the format & its compression are in the allowable lists.
+    assert (
+        format in WRITER
+    ), f"Something wrong: format {format} not in the allowable list {list(WRITER)}"
+    checkCompression(format, compression)
+
+    listPartition = [
+        (frameFileName(getFileName(keyName), format, compression), partDf)
+        for keyName, partDf in df.groupby(keyColumn, sort=False)
+    ]
+
+    # Create every parent directory once before the concurrent writes.
+    for parentPath in set(Path(fileName).parent for fileName, _ in listPartition):
+        parentPath.mkdir(parents=True, exist_ok=True)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        listWrite = [
+            pool.submit(WRITER[format], partDf, fileName, compression)
+            for fileName, partDf in listPartition
+        ]
+        for write in listWrite:
+            write.result()
+    return [fileName for fileName, _ in listPartition]
+
+
+def writeHive(df, pathOutput, partitionColumns, compression=None):
+    """
+    Write a dataframe as Hive-style partitioned Parquet dataset such as 'type=.../region=.../'.
+
+    Year columns are written with string names since Parquet only allows string column names.
+
+    :param df: DataFrame to write.
+    :param pathOutput: Root directory of the dataset.
+    :param partitionColumns: List of column names used as partition directories.
+    :param compression: Compression method, either None, 'gzip' or 'zstd'.
+    :return: Root directory of the dataset.
+    """
+    checkCompression("parquet", compression)
+    _importArrow()
+
+    df = df.rename(columns=str)
+    Path(pathOutput).mkdir(parents=True, exist_ok=True)
+    df.to_parquet(
+        pathOutput,
+        engine="pyarrow",
+        partition_cols=partitionColumns,
+        compression=compression or "none",
+        index=False,
+    )
+    return pathOutput
@@ -0,0 +1,90 @@
+import numpy as np
+from os import path
+from pandas import DataFrame
+from .compact import narrowDtype
+
+LIST_OVERLAP = ["newest", "error", "equal"]
+
+
+def _fileTime(fileName):
+    # A result without source file, such as an existing output, is treated as the oldest.
+    if fileName is None or not path.exists(fileName):
+        return float("-inf")
+    return path.getmtime(fileName)
+
+
+def bucketByGroup(listResult):
+    """
+    Bucket pipeline results by their commodity group in one pass.
+
+    :param listResult: List of pipeline results as fullResult dictionary.
+    :return: Dictionary of group and its list of results, sorted by group.
+    """
+    groupedResult = {}
+    for result in listResult:
+        groupedResult.setdefault(result["group"], []).append(result)
+    return dict(sorted(groupedResult.items()))
+
+
+def joinGroup(listResult, overlap="newest", narrow=False):
+    """
+    Join the results of one commodity group into a single [region, group, unit, type] x year matrix.
+
+    The union of every index is sorted once and the year matrix is pre-allocated, then each result is placed by its row & column position.
+    Overlapping years between files are resolved by the overlap policy:
+    - 'newest' keeps the values of the most recently modified file.
+    - 'error' raises ValueError.
+    - 'equal' raises ValueError unless the overlapping values are equal.
+
+    :param listResult: List of pipeline results as fullResult dictionary, each contain 'data' & 'fileName'.
+    :param overlap: Policy for overlapping years, either 'newest', 'error' or 'equal'.
+    :param narrow: Option for converting each year column to the narrowest lossless dtype, used for compact results.
+    :return: Combined DataFrame sorted by its index & year columns.
+    """
+    # Check if the overlap policy is in the allowable list.
+    assert (
+        overlap in LIST_OVERLAP
+    ), f"Something wrong: overlap {overlap} not in the allowable list {LIST_OVERLAP}"
+
+    # Place the oldest result first so the newer one overwrites it.
+    listResult = sorted(
+        enumerate(listResult),
+        key=lambda item: (_fileTime(item[1].get("fileName")), item[0]),
+    )
+    listResult = [result for _, result in listResult]
+    listData = [result["data"] for result in listResult]
+
+    index = listData[0].index.append([df.index for df in listData[1:]])
+    index = index.unique().sort_values()
+    listYear = sorted(set(year for df in listData for year in df.columns))
+    yearPosition = {year: position for position, year in enumerate(listYear)}
+
+    matrix = np.full((len(index), len(listYear)), np.nan)
+    filled = np.zeros((len(index), len(listYear)), dtype=bool)
+    yearSource = {}
+    for result, df in zip(listResult, listData):
+        rowPosition = index.get_indexer(df.index)
+        columnPosition = np.array([yearPosition[year] for year in df.columns])
+        values = df.to_numpy(dtype="float64", na_value=np.nan)
+
+        listOverlap = [year for year in df.columns if year in yearSource]
+        if listOverlap and overlap != "newest":
+            block = np.ix_(rowPosition, columnPosition)
+            oldValues, isFilled = matrix[block], filled[block]
+            isEqual = (oldValues == values) | (np.isnan(oldValues) & np.isnan(values))
+            if overlap == "error" or not np.all(isEqual | ~isFilled):
+                raise ValueError(
+                    f"Overlapping years {listOverlap} between {yearSource[listOverlap[0]]} and {result.get('fileName')}"
+                )
+
+        matrix[np.ix_(rowPosition, columnPosition)] = values
+        filled[np.ix_(rowPosition, columnPosition)] = True
+        for year in df.columns:
+            yearSource[year] = result.get("fileName")
+
+    combineDf = DataFrame(matrix, index=index, columns=listYear)
+    if narrow == True:
+        combineDf = combineDf.astype(
+            {year: narrowDtype(combineDf[year]) for year in listYear}
+        )
+    return combineDf
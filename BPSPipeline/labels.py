@@ -0,0 +1,65 @@
+import numpy as np
+from dataclasses import dataclass, field
+from pandas import Index, factorize
+
+
+def _isMissing(label):
+    return label is None or label != label
+
+
+@dataclass
+class LabelNormalizer:
+    """
+    Memo of normalized labels shared across the results of many files.
+
+    Each column is factorized to its distinct labels, only the labels that aren't in the memo are normalized, then the results are mapped back through the codes.
+    So the cost depends on the number of distinct labels instead of the number of rows.
+
+    :ivar titled: Dictionary of region label & its title-cased label.
+    :ivar splitted: Dictionary of type label & its tuple of type & unit split at '('.
+    """
+
+    titled: dict = field(default_factory=dict)
+    splitted: dict = field(default_factory=dict)
+
+    def title(self, values):
+        """
+        Method for title-casing labels like str.title.
+
+        :param values: Series or array of labels.
+        :return: Index of the title-cased labels in the same order.
+        """
+        codes, uniques = factorize(values, use_na_sentinel=False)
+        listLabel = []
+        for label in uniques:
+            if label not in self.titled:
+                self.titled[label] = label if _isMissing(label) else label.title()
+            listLabel.append(self.titled[label])
+        return Index(np.array(listLabel, dtype=object)).take(codes)
+
+    def splitUnit(self, values):
+        """
+        Method for splitting the unit from labels such as 'Salak(Kuintal)', like str.split('(') & removing ')'.
+
+        :param values: Series or array of labels.
+        :return: Tuple of Index of the types & Index of the units in the same order, a label without unit has a missing unit.
+        """
+        codes, uniques = factorize(values, use_na_sentinel=False)
+        listType, listUnit = [], []
+        for label in uniques:
+            if label not in self.splitted:
+                if _isMissing(label):
+                    self.splitted[label] = (label, np.nan)
+                else:
+                    part = label.split("(")
+                    self.splitted[label] = (
+                        part[0],
+                        part[1].replace(")", "") if len(part) > 1 else np.nan,
+                    )
+            labelType, labelUnit = self.splitted[label]
+            listType.append(labelType)
+            listUnit.append(labelUnit)
+        return (
+            Index(np.array(listType, dtype=object)).take(codes),
+            Index(np.array(listUnit, dtype=object)).take(codes),
+        )
@@ -0,0 +1,90 @@
+import re
+import json
+from os import path, replace, stat
+from pathlib import Path
+from dataclasses import dataclass, field
+
+
+def fileSignature(fileName):
+    """
+    Get the signature of a file for detecting its changes.
+
+    :param fileName: File name.
+    :return: Dictionary of the file's mtime & size.
+    """
+    fileStat = stat(fileName)
+    return {"mtime": fileStat.st_mtime, "size": fileStat.st_size}
+
+
+def groupFileName(group, prefix="Combine_Result", extension="csv"):
+    """
+    Get a stable file name for a commodity group's output.
+
+    :param group: Commodity group.
+    :param prefix: Prefix of the file name.
+    :param extension: File's extension.
+    :return: File name such as 'Combine_Result_Buah-Buahan.csv'.
+    """
+    name = re.sub(r"[^\w\-]+", "_", group).strip("_")
+    return f"{prefix}_{name}.{extension}"
+
+
+@dataclass
+class Manifest:
+    """
+    Manifest of which input files went into which commodity group output.
+
+    :param pathManifest: File location of the manifest as json. If the file exists, it's loaded.
+    :ivar files: Dictionary of input file name and its mtime, size, group & year.
+    :ivar groups: Dictionary of commodity group and its output file name.
+    """
+
+    pathManifest: str
+    files: dict = field(default_factory=dict, init=False)
+    groups: dict = field(default_factory=dict, init=False)
+
+    def __post_init__(self):
+        if path.exists(self.pathManifest):
+            with open(self.pathManifest, encoding="utf-8") as file:
+                manifest = json.load(file)
+            self.files = manifest["files"]
+            self.groups = manifest["groups"]
+
+    def isChanged(self, fileName):
+        """
+        Method for checking if a file is new or changed since it's recorded.
+
+        :param fileName: Input file name.
+        :return: True if the file isn't recorded or its mtime or size is different.
+        """
+        entry = self.files.get(fileName)
+        if entry is None:
+            return True
+        signature = fileSignature(fileName)
+        return (entry["mtime"], entry["size"]) != (
+            signature["mtime"],
+            signature["size"],
+        )
+
+    def groupFiles(self, group):
+        """
+        Method for listing the recorded input files of a commodity group.
+
+        :param group: Commodity group.
+        :return: List of file names.
+        """
+        return [
+            fileName
+            for fileName, entry in self.files.items()
+            if entry["group"] == group
+        ]
+
+    def save(self):
+        """
+        Method for writing the manifest as json file.
+        """
+        Path(self.pathManifest).parent.mkdir(parents=True, exist_ok=True)
+        tempName = f"{self.pathManifest}.tmp"
+        with open(tempName, "w", encoding="utf-8") as file:
+            json.dump({"files": self.files, "groups": self.groups}, file, indent=1)
+        replace(tempName, self.pathManifest)
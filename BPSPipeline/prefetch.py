@@ -0,0 +1,44 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+
+def _readBytes(fileName):
+    with open(fileName, "rb") as file:
+        return file.read()
+
+
+def prefetchFiles(listFile, depth=4):
+    """
+    Read the raw bytes of the next files in background threads while the current file is being parsed.
+
+    At most depth files are read ahead, so the memory stays bounded by the size of depth files no matter how many files are given.
+    A file that failed to be read is yielded with its error instead of its bytes, so the next files are still read.
+
+    :param listFile: List of file names in the order they are parsed.
+    :param depth: Number of files read ahead.
+    :return: Generator of tuple of file name, its bytes & its read error, where either the bytes or the error is None.
+    """
+    # Check if the read-ahead depth is valid.
+    assert depth > 0, f"Something wrong: prefetch depth {depth} should be more than 0"
+
+    listFile = iter(listFile)
+    pool = ThreadPoolExecutor(max_workers=depth)
+    try:
+        window = deque()
+        for fileName in listFile:
+            window.append((fileName, pool.submit(_readBytes, fileName)))
+            if len(window) == depth:
+                break
+        while window:
+            fileName, future = window.popleft()
+
+            # Start the next read before handing over the current file.
+            nextFile = next(listFile, None)
+            if nextFile is not None:
+                window.append((nextFile, pool.submit(_readBytes, nextFile)))
+            try:
+                yield fileName, future.result(), None
+            except OSError as error:
+                yield fileName, None, error
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,136 @@
+import json
+from time import perf_counter
+from typing import Callable
+from dataclasses import dataclass, field
+
+
+class _Stage:
+    """
+    Context manager that times one stage of one file & records it in its profiler.
+    """
+
+    __slots__ = ("profiler", "record", "start")
+
+    def __init__(self, profiler, record):
+        self.profiler = profiler
+        self.record = record
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self.record
+
+    def __exit__(self, *_):
+        self.record["seconds"] = perf_counter() - self.start
+        self.profiler.add(self.record)
+        return False
+
+
+class _NullStage:
+    """
+    Context manager that does nothing, used when profiling is disabled.
+    """
+
+    __slots__ = ("record",)
+
+    def __init__(self):
+        self.record = {}
+
+    def __enter__(self):
+        return self.record
+
+    def __exit__(self, *_):
+        return False
+
+
+class _NullProfiler:
+    """
+    Profiler that does nothing, so disabled profiling only costs a method call for each stage.
+    """
+
+    _stage = _NullStage()
+
+    def stage(self, name, fileName=None, rows=None, bytes=None):
+        return self._stage
+
+
+NULL_PROFILER = _NullProfiler()
+
+
+@dataclass
+class Profiler:
+    """
+    Recorder of wall time, rows & bytes for each stage of each file.
+
+    BPSData records 'cache', 'read', 'header', 'reshape', 'labels', 'compact' & 'export' stages of its file, BulkParse records a 'combine' stage for each group's output.
+
+    :param callback: Function called with every record as soon as its stage is finished.
+    :ivar records: List of dictionary contain stage, fileName, seconds, rows & bytes.
+    """
+
+    callback: Callable = None
+    records: list = field(default_factory=list)
+
+    def stage(self, name, fileName=None, rows=None, bytes=None):
+        """
+        Method for timing a stage, the returned record can be updated with rows & bytes inside the block.
+
+        :param name: Stage name.
+        :param fileName: File name of the stage.
+        :param rows: Number of rows processed by the stage.
+        :param bytes: Number of bytes processed by the stage.
+        :return: Context manager yielding the stage's record.
+        """
+        record = {
+            "stage": name,
+            "fileName": fileName,
+            "seconds": None,
+            "rows": rows,
+            "bytes": bytes,
+        }
+        return _Stage(self, record)
+
+    def add(self, record):
+        """
+        Method for adding a finished record, such as the records returned by a worker process.
+
+        :param record: Dictionary of stage, fileName, seconds, rows & bytes.
+        """
+        self.records.append(record)
+        if self.callback is not None:
+            self.callback(record)
+
+    def report(self):
+        """
+        Method for summarizing the records.
+
+        :return: Dictionary contain 'stages' (count, seconds, rows & bytes for each stage), 'files' (seconds for each stage of each file) & 'records'.
+        """
+        stages = {}
+        files = {}
+        for record in self.records:
+            summary = stages.setdefault(
+                record["stage"], {"count": 0, "seconds": 0.0, "rows": 0, "bytes": 0}
+            )
+            summary["count"] += 1
+            summary["seconds"] += record["seconds"]
+            summary["rows"] += record["rows"] or 0
+            summary["bytes"] += record["bytes"] or 0
+            if record["fileName"] is not None:
+                fileStage = files.setdefault(record["fileName"], {})
+                fileStage[record["stage"]] = (
+                    fileStage.get(record["stage"], 0.0) + record["seconds"]
+                )
+        return {"stages": stages, "files": files, "records": self.records}
+
+    def toJson(self, fileName=None):
+        """
+        Method for writing the report as json.
+
+        :param fileName: File location. If None, the json is only returned.
+        :return: Json string of the report.
+        """
+        report = json.dumps(self.report(), indent=1, default=str)
+        if fileName is not None:
+            with open(fileName, "w", encoding="utf-8") as file:
+                file.write(report)
+        return report
@@ -0,0 +1,268 @@
+import json
+import sqlite3
+import numpy as np
+from collections import OrderedDict
+from dataclasses import dataclass
+from pandas import DataFrame, MultiIndex, concat
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS data (
+    "group" TEXT NOT NULL,
+    region TEXT NOT NULL,
+    unit TEXT,
+    type TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    value REAL
+);
+CREATE INDEX IF NOT EXISTS data_group ON data ("group", region, type, year);
+CREATE TABLE IF NOT EXISTS groups (
+    "group" TEXT PRIMARY KEY,
+    regionName TEXT,
+    year TEXT
+);
+CREATE TABLE IF NOT EXISTS labels (
+    "group" TEXT NOT NULL,
+    unit TEXT,
+    type TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS labels_group ON labels ("group");
+"""
+
+
+def _label(label):
+    return None if label is None or label != label else label
+
+
+def _asList(labels):
+    if labels is None:
+        return None
+    if isinstance(labels, (str, int, np.integer)):
+        return [labels]
+    return list(labels)
+
+
+def _levelKey(df, level, labels):
+    # Labels that aren't in the group would raise, so they're skipped.
+    if labels is None:
+        return slice(None)
+    return [label for label in labels if label in df.index.levels[level]]
+
+
+@dataclass
+class QueryStore:
+    """
+    Store of combined results answering region, type & year lookups without loading every output.
+
+    The data is persisted in a SQLite file indexed by group, region, type & year. Each group is loaded on its first lookup as a frame with a sorted [region, group, unit, type] index, so a lookup is a binary search instead of a scan.
+    The most recently used groups are kept in memory & the least recently used one is evicted beyond cacheGroups.
+
+    :param pathStore: File location of the SQLite store. If the file exists, its data is kept.
+    :param cacheGroups: Number of groups kept in memory.
+    :ivar hits: Number of group lookups answered from memory.
+    :ivar misses: Number of group lookups loaded from the store.
+    """
+
+    pathStore: str = "bps.sqlite"
+    cacheGroups: int = 4
+
+    def __post_init__(self):
+        # Check if the cache can hold a group.
+        assert (
+            self.cacheGroups > 0
+        ), f"Something wrong: cacheGroups {self.cacheGroups} should be more than 0"
+
+        self._connection = sqlite3.connect(self.pathStore)
+        self._connection.executescript(SCHEMA)
+        self._cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._loadLabels()
+
+    def _loadLabels(self):
+        # The labels are small, so the group of each type & unit is looked up in memory.
+        self._typeGroup = {}
+        self._unitGroup = {}
+        for group, unit, type in self._connection.execute(
+            'SELECT "group", unit, type FROM labels'
+        ):
+            self._typeGroup.setdefault(type, set()).add(group)
+            self._unitGroup.setdefault(unit, set()).add(group)
+
+    def close(self):
+        """
+        Method for closing the store's connection.
+        """
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    def put(self, df):
+        """
+        Method for storing combined results, replacing the stored data of their groups.
+
+        :param df: Combined DataFrame indexed by [region, group, unit, type] such as the result of combineResult, or a list of them.
+        :return: List of the stored groups.
+        """
+        listDf = df if isinstance(df, list) else [df]
+        listGroup = []
+        with self._connection:
+            for df in listDf:
+                df = df.astype("float64").sort_index()
+                listYear = [int(year) for year in df.columns]
+                for group in dict.fromkeys(df.index.get_level_values(1)):
+                    groupDf = df.xs(group, level=1, drop_level=False)
+                    self._putGroup(group, groupDf, listYear)
+                    listGroup.append(group)
+        self._loadLabels()
+        return listGroup
+
+    def _putGroup(self, group, df, listYear):
+        """
+        Replace the rows of one group, every (row, year) cell is written so the group is stored as a rectangle.
+        """
+        for table in ["data", "groups", "labels"]:
+            self._connection.execute(f'DELETE FROM {table} WHERE "group" = ?', (group,))
+        self._cache.pop(group, None)
+
+        listRegion = [_label(label) for label in df.index.get_level_values(0)]
+        listUnit = [_label(label) for label in df.index.get_level_values(2)]
+        listType = [_label(label) for label in df.index.get_level_values(3)]
+        values = df.to_numpy()
+        self._connection.executemany(
+            "INSERT INTO data VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                (group, region, unit, type, year, None if value != value else value)
+                for region, unit, type, rowValues in zip(
+                    listRegion, listUnit, listType, values.tolist()
+                )
+                for year, value in zip(listYear, rowValues)
+            ),
+        )
+        self._connection.execute(
+            "INSERT INTO groups VALUES (?, ?, ?)",
+            (group, df.index.names[0], json.dumps(listYear)),
+        )
+        self._connection.executemany(
+            "INSERT INTO labels VALUES (?, ?, ?)",
+            (
+                (group, unit, type)
+                for unit, type in dict.fromkeys(zip(listUnit, listType))
+            ),
+        )
+
+    def groups(self):
+        """
+        Method for listing the stored groups.
+
+        :return: Sorted list of commodity groups.
+        """
+        return [
+            group
+            for (group,) in self._connection.execute(
+                'SELECT "group" FROM groups ORDER BY "group"'
+            )
+        ]
+
+    def group(self, group):
+        """
+        Method for getting the whole data of one group, loading it from the store on its first use.
+
+        :param group: Commodity group.
+        :return: DataFrame with a sorted [region, group, unit, type] index & each year as its columns. It's shared by the cache, so it mustn't be modified.
+        """
+        if group in self._cache:
+            self.hits += 1
+            self._cache.move_to_end(group)
+            return self._cache[group]
+
+        self.misses += 1
+        row = self._connection.execute(
+            'SELECT regionName, year FROM groups WHERE "group" = ?', (group,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(f"Group {group} not found in the store")
+        regionName, listYear = row[0], json.loads(row[1])
+        numberYear = len(listYear)
+
+        # The cells of a row were inserted year by year, so the rowid order is a rectangle.
+        listRow = self._connection.execute(
+            'SELECT region, unit, type, value FROM data WHERE "group" = ? ORDER BY rowid',
+            (group,),
+        ).fetchall()
+        listRegion, listUnit, listType, listValue = (
+            zip(*listRow) if listRow else ([], [], [], [])
+        )
+        numberRow = len(listRow) // max(1, numberYear)
+        values = np.array(listValue, dtype="float64").reshape(numberRow, numberYear)
+        index = MultiIndex.from_arrays(
+            [
+                list(listRegion[::numberYear]),
+                [group] * numberRow,
+                [np.nan if unit is None else unit for unit in listUnit[::numberYear]],
+                list(listType[::numberYear]),
+            ],
+            names=[regionName, "group", "unit", "type"],
+        )
+        df = DataFrame(values, index=index, columns=listYear).sort_index()
+
+        self._cache[group] = df
+        while len(self._cache) > self.cacheGroups:
+            self._cache.popitem(last=False)
+        return df
+
+    def get(self, region=None, type=None, years=None, group=None, unit=None):
+        """
+        Method for looking up the values by their labels.
+
+        Only the groups that have the given types or units are loaded, and each group's rows are found through its sorted index.
+
+        :param region: Region label or list of labels. If None, every region is selected.
+        :param type: Type label or list of labels. If None, every type is selected.
+        :param years: Year or list of years. If None, every year is selected.
+        :param group: Commodity group or list of groups. If None, every group with the given types & units is searched.
+        :param unit: Unit label or list of labels. If None, every unit is selected.
+        :return: DataFrame indexed by [region, group, unit, type] with the selected years as its columns.
+        """
+        listRegion, listType, listUnit = _asList(region), _asList(type), _asList(unit)
+        listYear = _asList(years)
+
+        setGroup = set(self.groups()) if group is None else set(_asList(group))
+        for labels, labelGroup in [
+            (listType, self._typeGroup),
+            (listUnit, self._unitGroup),
+        ]:
+            if labels is not None:
+                setGroup &= set().union(
+                    *(labelGroup.get(label, set()) for label in labels)
+                )
+
+        listResult = []
+        for uniqueGroup in sorted(setGroup):
+            df = self.group(uniqueGroup)
+            key = (
+                _levelKey(df, 0, listRegion),
+                uniqueGroup,
+                _levelKey(df, 2, listUnit),
+                _levelKey(df, 3, listType),
+            )
+            if any(isinstance(labels, list) and not labels for labels in key):
+                continue
+
+            columns = (
+                df.columns
+                if listYear is None
+                else [year for year in df.columns if year in listYear]
+            )
+            listResult.append(df.loc[tuple(key), columns])
+
+        if not listResult:
+            return DataFrame(
+                index=MultiIndex.from_arrays(
+                    [[]] * 4, names=["region", "group", "unit", "type"]
+                )
+            )
+        return concat(listResult)
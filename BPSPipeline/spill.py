@@ -0,0 +1,225 @@
+import heapq
+import numpy as np
+from pathlib import Path
+from pandas import DataFrame, MultiIndex, read_csv
+from .join import LIST_OVERLAP, _fileTime
+from .export import WRITER, _importArrow, _toTable, writeCsv
+
+LABEL_COUNT = 4
+LABEL_BYTES = 256
+
+
+def _sortKey(labels):
+    # Missing labels are sorted last like pandas does.
+    return tuple((1, "") if label != label else (0, label) for label in labels)
+
+
+def spillRun(df, fileName):
+    """
+    Write the data of one result as a run file sorted by its [region, group, unit, type] index.
+
+    :param df: Result's data with the label index & year columns, compact results are written as float.
+    :param fileName: File location of the run.
+    :return: Number of written rows.
+    """
+    df = df.astype("float64")
+    df.index = MultiIndex.from_arrays(
+        [
+            df.index.get_level_values(position).astype(object)
+            for position in range(df.index.nlevels)
+        ],
+        names=df.index.names,
+    )
+    writeCsv(df.sort_index(), fileName, index=True)
+    return len(df)
+
+
+def _readRunHeader(fileName):
+    columns = read_csv(fileName, nrows=0).columns.tolist()
+    return columns[:LABEL_COUNT], [int(year) for year in columns[LABEL_COUNT:]]
+
+
+def _iterRun(fileName, rank, yearPosition, chunkRows):
+    """
+    Read a run in chunks of rows.
+
+    :return: Generator of tuple of sort key, rank, labels, year positions & values of each row.
+    """
+    listName, listYear = _readRunHeader(fileName)
+    positions = np.array([yearPosition[year] for year in listYear], dtype=int)
+    dtype = {name: object for name in range(LABEL_COUNT)}
+    for chunk in read_csv(
+        fileName,
+        header=0,
+        names=list(range(LABEL_COUNT + len(listYear))),
+        dtype=dtype,
+        chunksize=chunkRows,
+    ):
+        listLabel = chunk.iloc[:, :LABEL_COUNT].itertuples(index=False, name=None)
+        values = chunk.iloc[:, LABEL_COUNT:].to_numpy(dtype="float64")
+        for labels, rowValues in zip(listLabel, values):
+            yield _sortKey(labels), rank, labels, positions, rowValues
+
+
+class _BatchWriter:
+    """
+    Writer of a combined result in batches of rows, so the whole result is never held in memory.
+    """
+
+    def __init__(self, fileName, format="csv"):
+        # Check if the format is in the allowable list.
+        assert (
+            format in WRITER
+        ), f"Something wrong: format {format} not in the allowable list {list(WRITER)}"
+
+        Path(fileName).parent.mkdir(parents=True, exist_ok=True)
+        self.fileName = fileName
+        self.format = format
+        self.file = None
+        self.writer = None
+
+    def write(self, df):
+        if self.format == "csv":
+            if self.file is None:
+                self.file = open(self.fileName, "wb")
+                df.to_csv(self.file)
+            else:
+                df.to_csv(self.file, header=False)
+            return
+
+        pa = _importArrow()
+        table = _toTable(df)
+        if self.writer is None:
+            self.schema = table.schema
+            if self.format == "parquet":
+                from pyarrow import parquet
+
+                self.writer = parquet.ParquetWriter(
+                    self.fileName, self.schema, compression="none"
+                )
+            else:
+                # Feather version 2 is the Arrow IPC file format.
+                self.file = pa.OSFile(self.fileName, "wb")
+                self.writer = pa.ipc.new_file(self.file, self.schema)
+        self.writer.write_table(table.cast(self.schema))
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        if self.file is not None:
+            self.file.close()
+
+
+def mergeRuns(
+    listRun, fileName, overlap="newest", memoryBudget=64 * 1024**2, format="csv"
+):
+    """
+    Merge the sorted runs of one commodity group into its combined result with a k-way merge.
+
+    Rows of the same [region, group, unit, type] key are joined like joinGroup: the runs are ordered by the modification time of their source file, and overlapping years follow the overlap policy.
+    Each run is read in chunks & the output is written in batches sized by the memory budget, so the memory doesn't depend on the group's size.
+
+    :param listRun: List of tuple of run file name & its source file name.
+    :param fileName: File location of the combined result.
+    :param overlap: Policy for overlapping years, either 'newest', 'error' or 'equal'.
+    :param memoryBudget: Approximate memory limit in bytes, half for reading the runs & half for the output batch.
+    :param format: Output format, either 'csv', 'parquet', 'feather' or 'arrow'.
+    :return: Number of written rows.
+    """
+    # Check if the overlap policy is in the allowable list.
+    assert (
+        overlap in LIST_OVERLAP
+    ), f"Something wrong: overlap {overlap} not in the allowable list {LIST_OVERLAP}"
+
+    # Place the oldest run first so the newer one overwrites it.
+    listRun = [
+        run
+        for _, run in sorted(
+            enumerate(listRun), key=lambda item: (_fileTime(item[1][1]), item[0])
+        )
+    ]
+    listHeader = [_readRunHeader(runName) for runName, _ in listRun]
+    listYear = sorted(set(year for _, runYear in listHeader for year in runYear))
+    yearPosition = {year: position for position, year in enumerate(listYear)}
+
+    # Level names that differ between runs are dropped like MultiIndex.append does.
+    listName = [
+        name if all(header[0][position] == name for header in listHeader) else None
+        for position, name in enumerate(listHeader[0][0])
+    ]
+
+    yearSource = {}
+    for (_, sourceName), (_, runYear) in zip(listRun, listHeader):
+        listOverlap = [year for year in runYear if year in yearSource]
+        if listOverlap and overlap == "error":
+            raise ValueError(
+                f"Overlapping years {listOverlap} between {yearSource[listOverlap[0]]} and {sourceName}"
+            )
+        yearSource.update({year: sourceName for year in runYear})
+
+    rowBytes = 8 * len(listYear) + LABEL_BYTES
+    chunkRows = max(1, memoryBudget // (2 * len(listRun) * rowBytes))
+    batchRows = max(1, memoryBudget // (2 * rowBytes))
+
+    writer = _BatchWriter(fileName, format)
+    listLabel, listValue = [], []
+    numberRow = 0
+
+    def flush():
+        writer.write(
+            DataFrame(
+                np.array(listValue).reshape(len(listValue), len(listYear)),
+                index=MultiIndex.from_arrays(
+                    [list(level) for level in zip(*listLabel)] or [[]] * LABEL_COUNT,
+                    names=listName,
+                ),
+                columns=listYear,
+            )
+        )
+        listLabel.clear()
+        listValue.clear()
+
+    try:
+        currentKey = None
+        for sortKey, rank, labels, positions, values in heapq.merge(
+            *[
+                _iterRun(runName, rank, yearPosition, chunkRows)
+                for rank, (runName, _) in enumerate(listRun)
+            ]
+        ):
+            if sortKey != currentKey:
+                if currentKey is not None:
+                    listValue.append(row)
+                    numberRow += 1
+                    if len(listLabel) >= batchRows:
+                        flush()
+                currentKey = sortKey
+                listLabel.append(labels)
+                row = np.full(len(listYear), np.nan)
+                filled = np.zeros(len(listYear), dtype=bool)
+                rowSource = [None] * len(listYear)
+
+            if overlap == "equal":
+                oldValues = row[positions]
+                isEqual = (oldValues == values) | (
+                    np.isnan(oldValues) & np.isnan(values)
+                )
+                if not np.all(isEqual | ~filled[positions]):
+                    position = positions[~(isEqual | ~filled[positions])][0]
+                    raise ValueError(
+                        f"Overlapping years {[listYear[position]]} between {rowSource[position]} and {listRun[rank][1]}"
+                    )
+                for position in positions:
+                    rowSource[position] = listRun[rank][1]
+
+            row[positions] = values
+            filled[positions] = True
+
+        if currentKey is not None:
+            listValue.append(row)
+            numberRow += 1
+        if listLabel or numberRow == 0:
+            flush()
+    finally:
+        writer.close()
+    return numberRow
@@ -0,0 +1,148 @@
+import csv
+import random
+from pathlib import Path
+
+FOOTER = [
+    "Sumber:BPS,{s}Data{s}Sintetis",
+    "",
+    "Source{s}Url:{s}https://bps.go.id/indicator/synthetic.html",
+    "Access{s}Time:{s}January{s}1,{s}2024",
+]
+
+
+def generateRows(
+    regions=17,
+    commodities=5,
+    years=(2015, 2016, 2017),
+    title="Produksi Sayuran",
+    unit="Kuintal",
+    unitInTitle=True,
+    separator="_",
+    missingRate=0.1,
+    seed=None,
+):
+    """
+    Generate the rows of BPS-layout data.
+
+    The layout is the region column & title row, commodity & year header rows, one row for each region, a province total row and the footer, so the total row & footer are the 5 rows removed by BPSData.
+
+    :param regions: Number of regions.
+    :param commodities: Number of commodities, with 1 the commodity header row is left out.
+    :param years: List of years.
+    :param title: Data's title.
+    :param unit: Commodity unit.
+    :param unitInTitle: Option for placing the unit at the title, otherwise it's placed at each commodity. A single commodity always has its unit at the title.
+    :param separator: Character which separates each word.
+    :param missingRate: Rate of values written as '-' placeholder.
+    :param seed: Seed of the random values.
+    :return: List of rows, each row is a list of cells.
+    """
+    generator = random.Random(seed)
+    years = list(years)
+    width = commodities * len(years)
+    join = lambda text: separator.join(text.split(" "))
+    unitInTitle = unitInTitle or commodities == 1
+
+    titleCell = join(f"{title} ({unit})" if unitInTitle else title)
+    listRow = [["Kabupaten/Kota", titleCell] + [""] * (width - 1)]
+
+    if commodities > 1:
+        commodityRow = [""]
+        for number in range(commodities):
+            name = f"Komoditas {number + 1}"
+            name = join(name if unitInTitle else f"{name} ({unit})")
+            commodityRow += [name] + [""] * (len(years) - 1)
+        listRow.append(commodityRow)
+    listRow.append([""] + years * commodities)
+
+    total = [0] * width
+    for number in range(regions):
+        row = [join(f"Kabupaten {number + 1}")]
+        for position in range(width):
+            if generator.random() < missingRate:
+                row.append("-")
+            else:
+                value = generator.randint(0, 500000)
+                total[position] += value
+                row.append(value)
+        listRow.append(row)
+    listRow.append([join("Provinsi")] + total)
+
+    for footer in FOOTER:
+        listRow.append([footer.format(s=separator)] + [""] * width)
+    return listRow
+
+
+def generateData(fileName, format="csv", delimiter=",", **kwargs):
+    """
+    Write a synthetic BPS-layout file.
+
+    :param fileName: File location, its parent directory is automaticly created.
+    :param format: File format, either 'csv' or 'xlsx'.
+    :param delimiter: Character which separates data for csv file.
+    :param kwargs: Parameters of generateRows.
+    :return: File location.
+    """
+    listRow = generateRows(**kwargs)
+    Path(fileName).parent.mkdir(parents=True, exist_ok=True)
+    if format == "xlsx":
+        from openpyxl import Workbook
+
+        workBook = Workbook(write_only=True)
+        workSheet = workBook.create_sheet()
+        for row in listRow:
+            workSheet.append([None if cell == "" else cell for cell in row])
+        workBook.save(fileName)
+    else:
+        with open(fileName, "w", newline="", encoding="utf-8") as file:
+            csv.writer(file, delimiter=delimiter).writerows(listRow)
+    return fileName
+
+
+def generateDataset(
+    pathOutput,
+    files=10,
+    regions=17,
+    commodities=5,
+    yearsPerFile=3,
+    firstYear=2000,
+    groups=("Produksi Sayuran", "Produksi Buah-Buahan"),
+    format="csv",
+    separator="_",
+    seed=0,
+    **kwargs,
+):
+    """
+    Write a synthetic dataset of BPS-layout files, each group's files cover consecutive year ranges.
+
+    :param pathOutput: Output directory location.
+    :param files: Number of files.
+    :param regions: Number of regions in each file.
+    :param commodities: Number of commodities in each file.
+    :param yearsPerFile: Number of years in each file.
+    :param firstYear: First year of each group.
+    :param groups: List of titles, files are spread across them in turn.
+    :param format: File format, either 'csv' or 'xlsx'.
+    :param separator: Character which separates each word.
+    :param seed: Seed of the random values.
+    :param kwargs: Other parameters of generateRows.
+    :return: List of written file names.
+    """
+    listFile = []
+    for number in range(files):
+        title = groups[number % len(groups)]
+        startYear = firstYear + (number // len(groups)) * yearsPerFile
+        fileName = str(Path(pathOutput) / f"synthetic_{number:05d}.{format}")
+        generateData(
+            fileName,
+            format=format,
+            regions=regions,
+            commodities=commodities,
+            years=range(startYear, startYear + yearsPerFile),
+            title=title,
+            separator=separator,
+            seed=None if seed is None else seed + number,
+            **kwargs,
+        )
+        listFile.append(fileName)
+    return listFile
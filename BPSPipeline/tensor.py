@@ -0,0 +1,282 @@
+import json
+import numpy as np
+from dataclasses import dataclass
+from pandas import DataFrame, Index
+
+
+def _labelIndex(labels):
+    index = {}
+    for position, label in enumerate(labels):
+        index.setdefault(label, []).append(position)
+    return index
+
+
+def _labels(labels):
+    # Labels are inferred like the pipeline's label columns, keeping missing values.
+    return Index(np.array(labels, dtype=object))
+
+
+def _isMissing(label):
+    return label is None or label != label
+
+
+@dataclass
+class BPSTensor:
+    """
+    Dense tensor of BPS data values with the label index of each axis.
+
+    The values are stored type-major as (types x regions x years), so each type is a contiguous (regions x years) block and the long table of the pipeline is a view of the same memory.
+
+    :param array: Float array of shape (types, regions, years), missing values are NaN.
+    :param region: List of region labels.
+    :param type: List of commodity type labels.
+    :param year: List of years.
+    :param unit: List of unit of each type.
+    :param group: Commodity group.
+    :param title: Data's title.
+    :param regionName: Column name of the region in the long table.
+    """
+
+    array: np.ndarray
+    region: list
+    type: list
+    year: list
+    unit: list
+    group: str = None
+    title: str = None
+    regionName: str = "region"
+
+    def __post_init__(self):
+        self.region = list(self.region)
+        self.type = list(self.type)
+        self.year = [int(year) for year in self.year]
+        self.unit = [np.nan if _isMissing(unit) else unit for unit in self.unit]
+
+        # Check if the labels match the array's shape.
+        shape = (len(self.type), len(self.region), len(self.year))
+        assert (
+            self.array.shape == shape
+        ), f"Something wrong: array shape {self.array.shape} doesn't match the labels {shape}"
+        assert len(self.unit) == len(
+            self.type
+        ), f"Something wrong: {len(self.unit)} units for {len(self.type)} types"
+
+        self._regionIndex = _labelIndex(self.region)
+        self._typeIndex = _labelIndex(self.type)
+        self._yearIndex = _labelIndex(self.year)
+        self._unitIndex = _labelIndex(self.unit)
+
+    @property
+    def values(self):
+        """
+        View of the values as (regions x types x years).
+        """
+        return self.array.transpose(1, 0, 2)
+
+    def _positions(self, index, labels):
+        if labels is None:
+            return None
+        if isinstance(labels, (str, int, np.integer)):
+            labels = [labels]
+        return [position for label in labels for position in index[label]]
+
+    def sel(self, region=None, type=None, year=None, unit=None):
+        """
+        Method for selecting the values by their labels.
+
+        :param region: Region label or list of labels. If None, every region is selected.
+        :param type: Type label or list of labels. If None, every type is selected.
+        :param year: Year or list of years. If None, every year is selected.
+        :param unit: Unit label or list of labels, it selects the types with these units. If None, every unit is selected.
+        :return: BPSTensor of the selected values, each axis is kept even if a single label is selected.
+        """
+        positionType = self._positions(self._typeIndex, type)
+        positionUnit = self._positions(self._unitIndex, unit)
+        if positionUnit is not None:
+            setUnit = set(positionUnit)
+            positionType = [
+                position
+                for position in (
+                    range(len(self.type)) if positionType is None else positionType
+                )
+                if position in setUnit
+            ]
+        positionRegion = self._positions(self._regionIndex, region)
+        positionYear = self._positions(self._yearIndex, year)
+
+        # Slicing an unselected axis keeps a view of the array.
+        array = self.array
+        if positionType is not None:
+            array = array[positionType]
+        if positionRegion is not None:
+            array = array[:, positionRegion]
+        if positionYear is not None:
+            array = array[:, :, positionYear]
+
+        pick = lambda labels, positions: (
+            labels
+            if positions is None
+            else [labels[position] for position in positions]
+        )
+        return BPSTensor(
+            array,
+            region=pick(self.region, positionRegion),
+            type=pick(self.type, positionType),
+            year=pick(self.year, positionYear),
+            unit=pick(self.unit, positionType),
+            group=self.group,
+            title=self.title,
+            regionName=self.regionName,
+        )
+
+    def toFrame(self, fullResult=False):
+        """
+        Method for converting the tensor to the long table of the pipeline.
+
+        The year columns are a view of the tensor's array, which is only copied if it isn't contiguous such as after selecting regions or years.
+
+        :param fullResult: Option for indexing the table by [region, group, unit, type] like the pipeline's fullResult data.
+        :return: DataFrame with region, group, type, unit and each year as its columns.
+        """
+        numberType, numberRegion, numberYear = self.array.shape
+        result = DataFrame(
+            self.array.reshape(numberType * numberRegion, numberYear),
+            columns=self.year,
+            copy=False,
+        )
+        result.insert(0, "unit", _labels(self.unit).repeat(numberRegion))
+        result.insert(0, "type", _labels(self.type).repeat(numberRegion))
+        result.insert(0, "group", self.group)
+        result.insert(0, self.regionName, _labels(self.region * numberType))
+        if fullResult == True:
+            result = result.set_index([self.regionName, "group", "unit", "type"])
+        return result
+
+    @classmethod
+    def fromFrame(cls, df, title=None):
+        """
+        Create a tensor from the long table of the pipeline, whose rows are every region of the first type, then the next type.
+
+        :param df: Long-table DataFrame with region, group, type, unit and each year as its columns.
+        :param title: Data's title.
+        :return: BPSTensor of the table.
+        """
+        listYear = [column for column in df.columns if isinstance(column, int)]
+        listType = df["type"].tolist()
+
+        # The regions repeat for each type, so the first repeat gives the number of regions.
+        listRegion = df.iloc[:, 0].tolist()
+        numberRegion = next(
+            (
+                position
+                for position in range(1, len(listRegion))
+                if listRegion[position] == listRegion[0]
+            ),
+            len(listRegion),
+        )
+        numberType = len(df) // max(1, numberRegion)
+        array = df[listYear].to_numpy(dtype="float64", na_value=np.nan)
+        return cls(
+            np.ascontiguousarray(
+                array.reshape(numberType, numberRegion, len(listYear))
+            ),
+            region=listRegion[:numberRegion],
+            type=listType[::numberRegion] if numberRegion else [],
+            year=listYear,
+            unit=df["unit"].tolist()[::numberRegion] if numberRegion else [],
+            group=df["group"].iloc[0] if len(df) else None,
+            title=title,
+            regionName=df.columns[0],
+        )
+
+    @classmethod
+    def fromCombined(cls, df, group=None, title=None):
+        """
+        Create a tensor from a combined result indexed by [region, group, unit, type], missing (region, type) pairs are filled with NaN.
+
+        :param df: Combined DataFrame such as the result of joinGroup.
+        :param group: Commodity group.
+        :param title: Data's title.
+        :return: BPSTensor whose type axis is each (unit, type) pair.
+        """
+        listRegion = df.index.get_level_values(0).astype(object)
+        listPair = list(
+            zip(
+                df.index.get_level_values(2).astype(object),
+                df.index.get_level_values(3).astype(object),
+            )
+        )
+        uniqueRegion = list(dict.fromkeys(listRegion))
+        uniquePair = list(dict.fromkeys(listPair))
+        regionPosition = {
+            region: position for position, region in enumerate(uniqueRegion)
+        }
+        pairPosition = {pair: position for position, pair in enumerate(uniquePair)}
+
+        array = np.full((len(uniquePair), len(uniqueRegion), df.shape[1]), np.nan)
+        array[
+            [pairPosition[pair] for pair in listPair],
+            [regionPosition[region] for region in listRegion],
+        ] = df.to_numpy(dtype="float64", na_value=np.nan)
+        return cls(
+            array,
+            region=uniqueRegion,
+            type=[pairType for _, pairType in uniquePair],
+            year=df.columns.tolist(),
+            unit=[pairUnit for pairUnit, _ in uniquePair],
+            group=group,
+            title=title,
+            regionName=df.index.names[0] or "region",
+        )
+
+    def save(self, fileName):
+        """
+        Method for saving the tensor as '.npy' array & '.npz' labels, so the array can be memory-mapped by load.
+
+        :param fileName: File location without extension.
+        :return: Tuple of the array & labels file names.
+        """
+        arrayName, labelName = f"{fileName}.npy", f"{fileName}.npz"
+        np.save(arrayName, np.ascontiguousarray(self.array))
+        np.savez(
+            labelName,
+            region=np.array(self.region, dtype=str),
+            type=np.array(self.type, dtype=str),
+            year=np.array(self.year, dtype="int64"),
+            unit=np.array(
+                ["" if _isMissing(unit) else unit for unit in self.unit], dtype=str
+            ),
+            metadata=np.array(
+                json.dumps(
+                    {
+                        "group": self.group,
+                        "title": self.title,
+                        "regionName": self.regionName,
+                    }
+                )
+            ),
+        )
+        return arrayName, labelName
+
+    @classmethod
+    def load(cls, fileName, mmap=True):
+        """
+        Load a tensor saved by save.
+
+        :param fileName: File location without extension.
+        :param mmap: Option for memory-mapping the array read-only instead of reading it.
+        :return: BPSTensor.
+        """
+        array = np.load(f"{fileName}.npy", mmap_mode="r" if mmap == True else None)
+        with np.load(f"{fileName}.npz") as labels:
+            metadata = json.loads(str(labels["metadata"]))
+            return cls(
+                array,
+                region=labels["region"].tolist(),
+                type=labels["type"].tolist(),
+                year=labels["year"].tolist(),
+                unit=[
+                    np.nan if unit == "" else unit for unit in labels["unit"].tolist()
+                ],
+                **metadata,
+            )
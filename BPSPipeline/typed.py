@@ -0,0 +1,86 @@
+from io import BytesIO
+from os import PathLike
+from contextlib import nullcontext
+from pandas import read_csv
+from .catalog import FOOTER_ROWS, _readCsvHeaderRows, parseHeader
+
+PLACEHOLDER = ["-", "–", "—", "…", "..."]
+LIST_CSV_ENGINE = ["c", "pyarrow"]
+BLOCK_SIZE = 4096
+
+
+def _footerStart(file, footerRows=FOOTER_ROWS):
+    """
+    Find the byte offset of the footer by reading the file backward, so the data rows are never scanned.
+
+    :param file: File opened in binary mode.
+    :param footerRows: Number of non-blank lines at the end of the file that aren't data rows.
+    :return: Byte offset of the first footer line.
+    """
+    file.seek(0, 2)
+    fileSize = file.tell()
+    blockSize = BLOCK_SIZE
+    while True:
+        blockStart = max(0, fileSize - blockSize)
+        file.seek(blockStart)
+        listLine = file.read().splitlines(keepends=True)
+
+        # The first line of a block may be partial, so it's only counted at the start of file.
+        offset = fileSize
+        numberFooter = 0
+        for line in reversed(listLine if blockStart == 0 else listLine[1:]):
+            offset -= len(line)
+            numberFooter += bool(line.strip())
+            if numberFooter == footerRows:
+                return offset
+        if blockStart == 0:
+            return 0
+        blockSize *= 2
+
+
+def readTypedCsv(fileName, separator=" ", delimiter=",", engine="c"):
+    """
+    Read BPS data csv in one typed pass.
+
+    The header rows are parsed first to name the columns & type every value column as float.
+    Only the bytes between the header & the footer are parsed, with BPS placeholders such as '-' read as missing values.
+    Unlike the default parse, a data row with an empty value cell is kept with NaN instead of being dropped.
+
+    :param fileName: BPS data file name, or a file object opened in binary mode such as BytesIO.
+    :param separator: Character which separates each word.
+    :param delimiter: Character which separates data for csv file.
+    :param engine: Parser engine, either 'c' or 'pyarrow'.
+    :return: Tuple of the header's metadata (see parseHeader) and the DataFrame of region & float value columns.
+    """
+    # Check if the engine is in the allowable list.
+    assert (
+        engine in LIST_CSV_ENGINE
+    ), f"Something wrong: engine {engine} not in the allowable list {LIST_CSV_ENGINE}"
+
+    if isinstance(fileName, (str, PathLike)):
+        file = open(fileName, "rb")
+    else:
+        file = nullcontext(fileName)
+    with file as file:
+        listRow, dataStart = _readCsvHeaderRows(file, delimiter)
+        dataEnd = _footerStart(file)
+        file.seek(dataStart)
+        data = file.read(max(0, dataEnd - dataStart))
+
+    header = parseHeader(listRow, separator)
+    columns = header["columns"]
+    df = read_csv(
+        BytesIO(data),
+        sep=delimiter,
+        header=None,
+        names=columns,
+        dtype={column: "float64" for column in columns[1:]},
+        na_values=PLACEHOLDER,
+        engine=engine,
+    )
+
+    # Rows without region name, such as an empty line of delimiters, aren't data rows.
+    isRegion = df[columns[0]].notna()
+    if not isRegion.all():
+        df = df[isRegion]
+    return header, df
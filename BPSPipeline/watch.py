@@ -0,0 +1,287 @@
+import time
+import numpy as np
+from os import path
+from glob import glob
+from collections import deque
+from typing import ClassVar
+from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from .cache import ResultCache
+from .manifest import Manifest, fileSignature
+from .profiling import NULL_PROFILER, Profiler
+from .labels import LabelNormalizer
+from .bpsmodule import _initWorker, _parseFile, updateGroupOutputs
+
+LATENCY_WINDOW = 1000
+
+
+def _warmWorker():
+    # Load the parsers in the worker before the first file arrives.
+    from io import StringIO
+    from pandas import read_csv
+
+    read_csv(StringIO("a,b\n1,2\n"))
+    return True
+
+
+@dataclass
+class WatchService:
+    """
+    Long-running service that watches an input directory by polling & publishes each new or changed file into its group's output.
+
+    The worker pool is started & warmed once, so a file that lands is parsed without paying the pool start-up & imports.
+    Only the groups of the arrived, changed or removed files are rewritten, with the same manifest as the incremental BulkParse.
+
+    :param pathInput: Input path location for BPS data, such as 'data/input/csv/*csv'.
+    :param pathOutput: Output path location for each group's output & the manifest.
+    :param separator: Character that which separates each word.
+    :param workers: Number of workers of the pool.
+    :param executor: Pool of the workers, either 'process' or 'thread'.
+    :param interval: Seconds between each poll.
+    :param settle: Seconds since a file's last modification before it's parsed, so a file that is still being written isn't read.
+    :param outputFormat: Format of a new group output, either 'csv', 'parquet', 'feather' or 'arrow'.
+    :param overlap: Policy when two files of a group have the same year, either 'newest', 'error' or 'equal'.
+    :param cache: ResultCache shared by every parse.
+    :param profiler: Profiler recording the stages of every file & the combine of every group. If None, profiling is disabled.
+    :param callback: Function called with the record of each published file, which has its fileName, group & latency in seconds.
+    :param excelMode: Reader of xlsx file, either 'pandas' or 'fast'.
+    :param excelCache: Directory location for converting xlsx file to csv once. If None, xlsx file isn't converted.
+    :param csvMode: Parse of csv file, either 'pandas' or 'typed'.
+    :param csvEngine: Parser engine of the 'typed' parse, either 'c' or 'pyarrow'.
+    :cvar LIST_EXECUTOR: List contain allowable pool.
+    :ivar manifest: Manifest of the published files & groups.
+    :ivar normalizer: LabelNormalizer shared by every parse of a thread pool. Each worker of a process pool has its own normalizer shared by the files it parses instead.
+    :ivar queue: Dictionary of each detected file that isn't published yet & the time it was detected.
+    :ivar listError: Dictionary of each file that failed to parse & its error message, it's retried once the file changes.
+    """
+
+    pathInput: str
+    pathOutput: str = "./"
+    separator: str = " "
+    workers: int = 2
+    executor: str = "process"
+    interval: float = 1.0
+    settle: float = 1.0
+    outputFormat: str = "csv"
+    overlap: str = "newest"
+    cache: ResultCache = None
+    profiler: Profiler = None
+    callback: object = None
+    excelMode: str = "pandas"
+    excelCache: str = None
+    csvMode: str = "pandas"
+    csvEngine: str = "c"
+    LIST_EXECUTOR: ClassVar[list] = ["process", "thread"]
+
+    def __post_init__(self):
+        # Check if the executor is in the allowable list.
+        assert (
+            self.executor in self.LIST_EXECUTOR
+        ), f"Something wrong: executor {self.executor} not in the allowable list {self.LIST_EXECUTOR}"
+
+        self._profiler = NULL_PROFILER if self.profiler is None else self.profiler
+        self.manifest = Manifest(path.join(self.pathOutput, "manifest.json"))
+        self.normalizer = LabelNormalizer()
+        self.queue = {}
+        self.listError = {}
+        self._errorSignature = {}
+        self._latency = deque(maxlen=LATENCY_WINDOW)
+        self._published = 0
+        self._pool = None
+
+    def start(self):
+        """
+        Method for starting the worker pool & warming every worker.
+
+        :return: The service itself.
+        """
+        if self._pool is None:
+            if self.executor == "process":
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers, initializer=_initWorker
+                )
+            else:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers)
+            for future in [self._pool.submit(_warmWorker) for _ in range(self.workers)]:
+                future.result()
+        return self
+
+    def close(self):
+        """
+        Method for shutting down the worker pool.
+        """
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exception):
+        self.close()
+
+    def _parseOptions(self):
+        return {
+            "separator": self.separator,
+            "fullResult": True,
+            "cache": self.cache,
+            "excelMode": self.excelMode,
+            "excelCache": self.excelCache,
+            "csvMode": self.csvMode,
+            "csvEngine": self.csvEngine,
+            "normalizer": None if self.executor == "process" else self.normalizer,
+        }
+
+    def _parseResults(self, listFile):
+        """
+        Parse the files on the warm pool to their list of pipeline results, such as the unchanged files of a group to rebuild.
+        """
+        options = self._parseOptions()
+        profile = self.profiler is not None
+        listFuture = [
+            (fileName, self._pool.submit(_parseFile, fileName, options, profile))
+            for fileName in listFile
+        ]
+        listResult = []
+        for fileName, future in listFuture:
+            result, error, listRecord = future.result()
+            for record in listRecord:
+                self.profiler.add(record)
+            if error is None:
+                listResult.append(result)
+            else:
+                self.listError[fileName] = error
+        return listResult
+
+    def poll(self):
+        """
+        Method for scanning the input directory once & queueing the new or changed files.
+
+        :return: Tuple of the list of current input files & the dictionary of each settled file in the queue & its signature.
+        """
+        now = time.time()
+        listFile = sorted(glob(self.pathInput))
+        setFile = set(listFile)
+        for fileName in [
+            fileName for fileName in self.queue if fileName not in setFile
+        ]:
+            del self.queue[fileName]
+
+        listReady = {}
+        for fileName in listFile:
+            if not self.manifest.isChanged(fileName):
+                continue
+            signature = fileSignature(fileName)
+
+            # A file that failed is only retried once it's changed.
+            if self._errorSignature.get(fileName) == signature:
+                continue
+            self.queue.setdefault(fileName, now)
+            if now - signature["mtime"] >= self.settle:
+                listReady[fileName] = signature
+        return listFile, listReady
+
+    def runOnce(self):
+        """
+        Method for polling once, then parsing the settled files on the warm pool & publishing their groups.
+
+        :return: Dictionary of each published commodity group & its dataframe.
+        """
+        self.start()
+        listFile, listReady = self.poll()
+        setFile = set(listFile)
+        listRemoved = [
+            fileName for fileName in self.manifest.files if fileName not in setFile
+        ]
+        if not listReady and not listRemoved:
+            return {}
+
+        options = self._parseOptions()
+        profile = self.profiler is not None
+        listFuture = [
+            (fileName, self._pool.submit(_parseFile, fileName, options, profile))
+            for fileName in listReady
+        ]
+        listData = []
+        for fileName, future in listFuture:
+            result, error, listRecord = future.result()
+            for record in listRecord:
+                self.profiler.add(record)
+            if error is None:
+                listData.append(result)
+                self.listError.pop(fileName, None)
+                self._errorSignature.pop(fileName, None)
+            else:
+                self.listError[fileName] = error
+                self._errorSignature[fileName] = listReady[fileName]
+                self.queue.pop(fileName, None)
+
+        listSignature = {Df["fileName"]: listReady[Df["fileName"]] for Df in listData}
+        groupedCombined = updateGroupOutputs(
+            self.manifest,
+            listData,
+            listSignature,
+            listFile,
+            self.pathOutput,
+            self.outputFormat,
+            self.overlap,
+            profiler=self._profiler,
+            parseFiles=self._parseResults,
+        )
+
+        # The latency is measured from the file's detection to its group's output.
+        published = time.time()
+        for Df in listData:
+            latency = published - self.queue.pop(Df["fileName"])
+            self._latency.append(latency)
+            self._published += 1
+            if self.callback is not None:
+                self.callback(
+                    {
+                        "fileName": Df["fileName"],
+                        "group": Df["group"],
+                        "latency": latency,
+                    }
+                )
+        return groupedCombined
+
+    def serve(self, cycles=None):
+        """
+        Method for running the service, polling every interval until it's interrupted.
+
+        :param cycles: Number of polls before returning. If None, it runs until KeyboardInterrupt.
+        """
+        self.start()
+        try:
+            cycle = 0
+            while cycles is None or cycle < cycles:
+                began = time.time()
+                self.runOnce()
+                cycle += 1
+                time.sleep(max(0, self.interval - (time.time() - began)))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.close()
+
+    def metrics(self):
+        """
+        Method for reporting the service's latency & queue depth.
+
+        The latency statistics are over the last published files.
+
+        :return: Dictionary of queueDepth, published, errors & latency with its count, mean, p50, p95 & max in seconds.
+        """
+        latency = np.array(self._latency, dtype="float64")
+        return {
+            "queueDepth": len(self.queue),
+            "published": self._published,
+            "errors": len(self.listError),
+            "latency": {
+                "count": len(latency),
+                "mean": float(latency.mean()) if len(latency) else None,
+                "p50": float(np.percentile(latency, 50)) if len(latency) else None,
+                "p95": float(np.percentile(latency, 95)) if len(latency) else None,
+                "max": float(latency.max()) if len(latency) else None,
+            },
+        }
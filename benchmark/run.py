@@ -0,0 +1,177 @@
+"""
+Scaling benchmark of the BPS pipeline on synthetic data.
+
+Usage from the repository root:
+
+    python -m benchmark.run --scale small medium
+    python -m benchmark.run --scale small --save-baseline benchmark/baseline.json
+    python -m benchmark.run --scale small --baseline benchmark/baseline.json --tolerance 0.25
+
+With --baseline the run exits with status 1 when any stage is slower or uses more peak memory than its baseline by more than the tolerance.
+"""
+
+import sys
+import json
+import tempfile
+import argparse
+import tracemalloc
+from time import perf_counter
+from BPSPipeline.bpsmodule import BPSData, BulkParse
+from BPSPipeline.synthetic import generateDataset
+
+SCALES = {
+    "small": {"files": 20, "regions": 17, "commodities": 5, "yearsPerFile": 3},
+    "medium": {"files": 100, "regions": 50, "commodities": 20, "yearsPerFile": 5},
+    "large": {"files": 500, "regions": 100, "commodities": 50, "yearsPerFile": 5},
+}
+
+
+def measure(function, repeat=1):
+    """
+    Run a function & measure its best wall time and its peak traced memory.
+
+    Memory is traced in a separate run, since tracing slows down the timed runs.
+
+    :param function: Function without parameter.
+    :param repeat: Number of timed runs, the fastest is reported.
+    :return: Tuple of the function's last result, seconds and peak bytes.
+    """
+    listSecond = []
+    for _ in range(repeat):
+        start = perf_counter()
+        result = function()
+        listSecond.append(perf_counter() - start)
+
+    tracemalloc.start()
+    function()
+    peakBytes = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, min(listSecond), peakBytes
+
+
+def reshape(obj):
+    """
+    Clear the memoized results of an object, so the measured stage reshapes its data again instead of reusing the previous run.
+
+    :param obj: BPSData object.
+    :return: The same object.
+    """
+    obj.invalidate()
+    return obj
+
+
+def runScale(name, format="csv", repeat=1):
+    """
+    Benchmark every stage on one synthetic scale.
+
+    :param name: Scale name, one of SCALES.
+    :param format: Synthetic file format, either 'csv' or 'xlsx'.
+    :param repeat: Number of runs for each stage.
+    :return: Dictionary of stage and its seconds, peak bytes & throughput.
+    """
+    report = {}
+    with tempfile.TemporaryDirectory() as tempDir:
+        listFile = generateDataset(f"{tempDir}/input", format=format, **SCALES[name])
+        numberFile = len(listFile)
+
+        listObj, second, peak = measure(
+            lambda: [BPSData(fileName, separator="_") for fileName in listFile], repeat
+        )
+        numberRow = sum(len(obj.listRegion) for obj in listObj)
+        report["init"] = (second, peak, numberFile, numberRow)
+
+        listResult, second, peak = measure(
+            lambda: [reshape(obj).pipeline() for obj in listObj], repeat
+        )
+        numberLong = sum(len(result) for result in listResult)
+        report["pipeline"] = (second, peak, numberFile, numberLong)
+
+        _, second, peak = measure(
+            lambda: reshape(listObj[0]).groupedExport(f"{tempDir}/export/"), repeat
+        )
+        report["groupedExport"] = (second, peak, 1, len(listResult[0]))
+
+        bulk, second, peak = measure(
+            lambda: BulkParse(f"{tempDir}/input/*.{format}", separator="_"), repeat
+        )
+        report["bulkParse"] = (second, peak, numberFile, numberLong)
+
+        _, second, peak = measure(bulk.combineResult, repeat)
+        report["combineResult"] = (second, peak, numberFile, numberLong)
+
+    return {
+        stage: {
+            "seconds": second,
+            "peakBytes": peak,
+            "filesPerSecond": files / second if second > 0 else None,
+            "rowsPerSecond": rows / second if second > 0 else None,
+        }
+        for stage, (second, peak, files, rows) in report.items()
+    }
+
+
+def compareBaseline(results, baseline, tolerance):
+    """
+    Compare the results with a stored baseline.
+
+    :param results: Dictionary of scale & its stage report.
+    :param baseline: Dictionary of scale & its stage report from a previous run.
+    :param tolerance: Allowed relative slowdown & peak memory growth such as 0.25 for 25%.
+    :return: List of regression messages.
+    """
+    listRegression = []
+    for scale, report in results.items():
+        for stage, metric in report.items():
+            previous = baseline.get(scale, {}).get(stage)
+            if previous is None:
+                continue
+            if metric["seconds"] > previous["seconds"] * (1 + tolerance):
+                listRegression.append(
+                    f"{scale}/{stage}: {metric['seconds']:.4f}s > baseline {previous['seconds']:.4f}s"
+                )
+            if metric["peakBytes"] > previous["peakBytes"] * (1 + tolerance):
+                listRegression.append(
+                    f"{scale}/{stage}: {metric['peakBytes'] / 1024**2:.2f} MiB peak > baseline {previous['peakBytes'] / 1024**2:.2f} MiB"
+                )
+    return listRegression
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scale", nargs="+", default=["small"], choices=SCALES)
+    parser.add_argument("--format", default="csv", choices=["csv", "xlsx"])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="Write the report as json file.")
+    parser.add_argument("--baseline", help="Fail when slower than this json report.")
+    parser.add_argument("--save-baseline", help="Write the report as new baseline.")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    results = {}
+    for scale in args.scale:
+        results[scale] = runScale(scale, args.format, args.repeat)
+        print(f"{scale} ({args.format})")
+        for stage, metric in results[scale].items():
+            print(
+                f"  {stage:<14} {metric['seconds']:>9.4f}s"
+                f" {metric['filesPerSecond'] or 0:>10.1f} files/s"
+                f" {metric['rowsPerSecond'] or 0:>12.0f} rows/s"
+                f" {metric['peakBytes'] / 1024**2:>9.2f} MiB peak"
+            )
+
+    for fileName in [args.output, args.save_baseline]:
+        if fileName:
+            with open(fileName, "w", encoding="utf-8") as file:
+                json.dump(results, file, indent=1)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            listRegression = compareBaseline(results, json.load(file), args.tolerance)
+        for message in listRegression:
+            print(f"REGRESSION {message}")
+        return 1 if listRegression else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
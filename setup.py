@@ -36,5 +36,7 @@ setup(
     ],
     packages=["BPSPipeline"],
     include_package_data=True,
-    install_requires=["pandas", "glob", "typing", "dataclass"],
+    install_requires=["pandas", "numpy", "glob", "typing", "dataclass"],
+    extras_require={"parquet": ["pyarrow"], "zstd": ["zstandard"]},
+    entry_points={"console_scripts": ["bps-pipeline=BPSPipeline.cli:main"]},
 )
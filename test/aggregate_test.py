@@ -0,0 +1,78 @@
+import os
+import shutil
+import unittest
+import tempfile
+import numpy as np
+from BPSPipeline.bpsmodule import *
+from BPSPipeline.aggregate import *
+
+
+class AggregateTestCase(unittest.TestCase):
+    def test_cube(self):
+        """Test the cube's totals, growth & share are the same as the pandas rollups."""
+        combineDf = BulkParse("data/input/csv/*csv", separator="_").combineResult()[0]
+        cube = aggregateCube(combineDf)
+        value = cube.xs("value", level="measure")
+        self.assertEqual(len(value), len(combineDf) + 7 + 1)
+        self.assertTrue(value.iloc[: len(combineDf)].equals(combineDf))
+
+        typeTotal = combineDf.groupby(level=[1, 2, 3]).sum(min_count=1)
+        self.assertTrue(value.xs(TOTAL_LABEL, level=0).iloc[:-1].equals(typeTotal))
+        self.assertTrue(
+            value.loc[(TOTAL_LABEL, "Buah-Buahan", "Kuintal", TOTAL_LABEL)].equals(
+                typeTotal.sum(min_count=1)
+            )
+        )
+
+        growth = cube.xs("growth", level="measure")
+        self.assertTrue(
+            np.allclose(
+                growth.iloc[: len(combineDf)].to_numpy(),
+                combineDf.pct_change(axis=1).replace(np.inf, np.nan).to_numpy(),
+                equal_nan=True,
+            )
+        )
+        share = cube.xs("share", level="measure").iloc[: len(combineDf)]
+        expected = combineDf / typeTotal.reindex(combineDf.index.droplevel(0)).values
+        self.assertTrue(
+            np.allclose(share.to_numpy(), expected.to_numpy(), equal_nan=True)
+        )
+
+    def test_refresh(self):
+        """Test only the cubes of changed outputs are refreshed."""
+        with tempfile.TemporaryDirectory() as tempDir:
+            inputDir, outputDir = f"{tempDir}/input", f"{tempDir}/output"
+            os.mkdir(inputDir)
+            for fileName in ["dataset1.csv", "dataset3.csv"]:
+                shutil.copy(f"data/input/csv/{fileName}", f"{inputDir}/{fileName}")
+
+            BulkParse(
+                f"{inputDir}/*csv", outputDir, "_", incremental=True, aggregate=True
+            ).combineResult()
+            cubeName = f"{outputDir}/Aggregate_Cube_Buah-Buahan.csv"
+            cube = readCube(cubeName)
+            self.assertListEqual(
+                cube.index.names,
+                ["Kabupaten/Kota", "group", "unit", "type", "measure"],
+            )
+            self.assertDictEqual(refreshCubes(outputDir), {})
+            cubeTime = os.path.getmtime(f"{outputDir}/Aggregate_Cube_Sayuran.csv")
+
+            shutil.copy("data/input/csv/dataset2.csv", f"{inputDir}/dataset2.csv")
+            BulkParse(
+                f"{inputDir}/*csv", outputDir, "_", incremental=True, aggregate=True
+            ).combineResult()
+            self.assertListEqual(
+                readCube(cubeName).columns.tolist(), list(range(2015, 2021))
+            )
+            self.assertEqual(
+                os.path.getmtime(f"{outputDir}/Aggregate_Cube_Sayuran.csv"), cubeTime
+            )
+
+            os.remove(f"{outputDir}/Combine_Result_Sayuran.csv")
+            refreshCubes(outputDir)
+            self.assertFalse(os.path.exists(f"{outputDir}/Aggregate_Cube_Sayuran.csv"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,20 @@
+import os
 import unittest
+import shutil
+import tempfile
+from glob import glob
 from BPSPipeline.bpsmodule import *
+from BPSPipeline.export import readFrame
+from BPSPipeline.synthetic import generateData
+
+
+def _isSame(merged, pathInput):
+    """Check an incremental output has the same rows & values as the full combine of the inputs."""
+    expected = BulkParse(pathInput, separator="_").combineResult()[0]
+    if len(merged) != len(expected):
+        return False
+    expected = expected.loc[merged.index, merged.columns]
+    return bool((merged.fillna(-1).values == expected.fillna(-1).values).all())
 
 
 class BPSPipelineTestCase(unittest.TestCase):
@@ -19,6 +34,18 @@ class BPSPipelineTestCase(unittest.TestCase):
             [2018, 2019, 2020],
         )
 
+    def test_vectorized_engine(self):
+        """Test the vectorized reshape engine gives the same result as the loop engine."""
+        for fileName, separator in [
+            ("data/input/csv/dataset1.csv", "_"),
+            ("data/input/csv/dataset3.csv", "_"),
+            ("data/input/excel/dataset1.xlsx", " "),
+        ]:
+            vectorized = BPSData(fileName, separator=separator).pipeline()
+            loop = BPSData(fileName, separator=separator, engine="loop").pipeline()
+            self.assertTrue(vectorized.equals(loop))
+            self.assertListEqual(vectorized.dtypes.tolist(), loop.dtypes.tolist())
+
     def test_bulk_parse(self):
         """Test for bulking parse."""
         bulk = BulkParse("data/input/csv/*csv", "data/output/csv/", separator="_")
@@ -27,6 +54,144 @@ class BPSPipelineTestCase(unittest.TestCase):
             listCombined[0].columns.to_list(), [2015, 2016, 2017, 2018, 2019, 2020]
         )
 
+    def test_bulk_parse_parallel(self):
+        """Test for bulking parse serially & across a process pool, including a broken file."""
+        with tempfile.TemporaryDirectory() as tempDir:
+            for fileName in glob("data/input/csv/*csv"):
+                shutil.copy(fileName, tempDir)
+            with open(f"{tempDir}/broken.csv", "w") as file:
+                file.write("Kabupaten/Kota\n")
+
+            serial = BulkParse(f"{tempDir}/dataset*csv", separator="_")
+            parallel = BulkParse(f"{tempDir}/*csv", separator="_", workers=2)
+            serialBroken = BulkParse(f"{tempDir}/*csv", separator="_")
+
+        for bulk in [parallel, serialBroken]:
+            self.assertListEqual(list(bulk.listError), [f"{tempDir}/broken.csv"])
+            self.assertEqual(len(bulk.listData), len(serial.listData))
+            for resultSerial, result in zip(serial.listData, bulk.listData):
+                self.assertEqual(resultSerial["fileName"], result["fileName"])
+                self.assertTrue(resultSerial["data"].equals(result["data"]))
+        self.assertEqual(len(serialBroken.listObj), len(serial.listObj))
+
+    def test_incremental_combine(self):
+        """Test the incremental combine only parses new files and merges their years."""
+        with tempfile.TemporaryDirectory() as tempDir:
+            inputDir, outputDir = f"{tempDir}/input", f"{tempDir}/output"
+            os.mkdir(inputDir)
+            for fileName in ["dataset1.csv", "dataset3.csv", "dataset4.csv"]:
+                shutil.copy(f"data/input/csv/{fileName}", f"{inputDir}/{fileName}")
+
+            first = BulkParse(f"{inputDir}/*csv", outputDir, "_", incremental=True)
+            first.combineResult()
+            self.assertEqual(len(first.listChanged), 3)
+
+            shutil.copy("data/input/csv/dataset2.csv", f"{inputDir}/dataset2.csv")
+            second = BulkParse(f"{inputDir}/*csv", outputDir, "_", incremental=True)
+            listCombined = second.combineResult()
+            self.assertListEqual(second.listChanged, [f"{inputDir}/dataset2.csv"])
+            self.assertEqual(len(listCombined), 1)
+
+            full = BulkParse(f"{inputDir}/*csv", separator="_")
+            fullCombined = dict(zip(sorted(full.listUniqueGroup), full.combineResult()))
+            merged = read_csv(
+                f"{outputDir}/Combine_Result_Buah-Buahan.csv", index_col=[0, 1, 2, 3]
+            )
+            merged.columns = merged.columns.astype("int")
+            expected = fullCombined["Buah-Buahan"].loc[merged.index]
+            self.assertListEqual(merged.columns.tolist(), expected.columns.tolist())
+            self.assertTrue(
+                (merged.fillna(-1).values == expected.fillna(-1).values).all()
+            )
+
+    def test_incremental_removal(self):
+        """Test a removed or corrected file of a group drops its rows, even when another file has the same years."""
+        years = (2018, 2019, 2020)
+        for name, renamed in [("rebuilt", "Komoditas"), ("kept", "Jenis")]:
+            with tempfile.TemporaryDirectory() as tempDir:
+                inputDir, outputDir = f"{tempDir}/input", f"{tempDir}/output"
+                generateData(
+                    f"{inputDir}/a.csv", regions=3, commodities=2, years=years, seed=0
+                )
+                generateData(
+                    f"{inputDir}/b.csv", regions=5, commodities=4, years=years, seed=1
+                )
+                # Renamed commodities make b's rows disjoint from a's rows.
+                with open(f"{inputDir}/b.csv") as file:
+                    content = file.read().replace("Komoditas", renamed)
+                with open(f"{inputDir}/b.csv", "w") as file:
+                    file.write(content)
+
+                outputName = f"{outputDir}/Combine_Result_Sayuran.csv"
+                BulkParse(
+                    f"{inputDir}/*csv", outputDir, "_", incremental=True
+                ).combineResult()
+                self.assertIn(f"{renamed}_4", readFrame(outputName).index.levels[3])
+
+                os.remove(f"{inputDir}/b.csv")
+                BulkParse(
+                    f"{inputDir}/*csv", outputDir, "_", incremental=True
+                ).combineResult()
+                self.assertTrue(
+                    _isSame(readFrame(outputName), f"{inputDir}/*csv"), name
+                )
+
+                # A corrected file with fewer regions drops its removed rows.
+                generateData(
+                    f"{inputDir}/a.csv", regions=2, commodities=2, years=years, seed=2
+                )
+                BulkParse(
+                    f"{inputDir}/*csv", outputDir, "_", incremental=True
+                ).combineResult()
+                self.assertTrue(
+                    _isSame(readFrame(outputName), f"{inputDir}/*csv"), name
+                )
+
+    def test_memoized_pipeline(self):
+        """Test both output shapes come from one reshape until the data is reassigned."""
+        df = BPSData("data/input/csv/dataset1.csv", "_")
+        result = df.pipeline()
+        fullResult = df.pipeline(fullResult=True)
+        self.assertEqual(len(df._memo), 3)
+        self.assertTrue(
+            fullResult["data"].equals(
+                BPSData("data/input/csv/dataset1.csv", "_", fullResult=True).pipeline()[
+                    "data"
+                ]
+            )
+        )
+
+        # A modified result doesn't change the memoized one.
+        value = result.iloc[0, 4]
+        result.iloc[0, 4] = -1
+        self.assertEqual(df.pipeline().iloc[0, 4], value)
+
+        df.readData = df.readData.astype("float") * 2
+        self.assertDictEqual(df._memo, {})
+        self.assertEqual(df.pipeline().iloc[0, 4], 2 * value)
+
+    def test_memoized_pipeline_with_cache(self):
+        """Test a reassigned data on a cached object is reshaped again without overwriting its cache entry."""
+        with tempfile.TemporaryDirectory() as tempDir:
+            cache = ResultCache(tempDir)
+            df = BPSData("data/input/csv/dataset1.csv", "_", cache=cache)
+            numberRow = len(df.pipeline())
+
+            df.readData = concat([df.readData, df.readData])
+            df.listRegion = np.concatenate([df.listRegion, df.listRegion])
+            self.assertEqual(len(df.pipeline()), 2 * numberRow)
+
+            warm = BPSData("data/input/csv/dataset1.csv", "_", cache=cache)
+            self.assertIsNone(warm.readData)
+            self.assertEqual(len(warm.pipeline()), numberRow)
+
+    def test_bulk_parse_releases_memo(self):
+        """Test the objects kept by BulkParse don't hold their memoized results on top of listData."""
+        bulk = BulkParse("data/input/csv/*csv", separator="_")
+        for obj, result in zip(bulk.listObj, bulk.listData):
+            self.assertDictEqual(obj._memo, {})
+            self.assertTrue(obj.pipeline()["data"].equals(result["data"]))
+
     def test_excel_file(self):
         """Test for excel file."""
         df = BPSData("data/input/excel/dataset1.xlsx")
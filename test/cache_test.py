@@ -0,0 +1,79 @@
+import os
+import unittest
+import tempfile
+from unittest import mock
+from BPSPipeline.bpsmodule import *
+from BPSPipeline.cache import *
+
+
+class ResultCacheTestCase(unittest.TestCase):
+    def test_warm_run(self):
+        """Test a warm run restores every result from the cache without reading the files."""
+        with tempfile.TemporaryDirectory() as tempDir:
+            cache = ResultCache(tempDir)
+            cold = BulkParse("data/input/csv/*csv", separator="_", cache=cache)
+            warm = BulkParse("data/input/csv/*csv", separator="_", cache=cache)
+
+        for obj in warm.listObj:
+            self.assertIsNone(obj.readData)
+        for resultCold, resultWarm in zip(cold.listData, warm.listData):
+            self.assertEqual(resultCold["group"], resultWarm["group"])
+            self.assertEqual(resultCold["title"], resultWarm["title"])
+            self.assertTrue(resultCold["data"].equals(resultWarm["data"]))
+
+    def test_parse_mode_key(self):
+        """Test a result cached with one parse mode isn't served to another mode."""
+        with tempfile.TemporaryDirectory() as tempDir:
+            cache = ResultCache(tempDir)
+            for fileName, option, listMode in [
+                ("data/input/csv/dataset1.csv", "csvMode", ["pandas", "typed"]),
+                ("data/input/excel/dataset1.xlsx", "excelMode", ["pandas", "fast"]),
+            ]:
+                for mode in listMode:
+                    cold = BPSData(fileName, "_", cache=cache, **{option: mode})
+                    self.assertIsNotNone(cold.readData)
+                    self.assertTrue(
+                        cold.pipeline().equals(
+                            BPSData(fileName, "_", **{option: mode}).pipeline()
+                        )
+                    )
+                for mode in listMode:
+                    warm = BPSData(fileName, "_", cache=cache, **{option: mode})
+                    self.assertIsNone(warm.readData)
+            self.assertEqual(len(os.listdir(tempDir)), 4)
+
+    def test_key_once(self):
+        """Test a cold miss computes the file's key once for both reading & storing its result."""
+        with tempfile.TemporaryDirectory() as tempDir:
+            cache = ResultCache(tempDir)
+            with mock.patch.object(
+                ResultCache, "key", autospec=True, side_effect=ResultCache.key
+            ) as key:
+                BPSData("data/input/csv/dataset1.csv", "_", cache=cache).pipeline()
+            self.assertEqual(key.call_count, 1)
+            self.assertIsNotNone(cache.get("data/input/csv/dataset1.csv", "_"))
+
+    def test_invalidate_and_evict(self):
+        """Test the invalidate API and the least recently used eviction."""
+        with tempfile.TemporaryDirectory() as tempDir:
+            cache = ResultCache(tempDir, keyBy="stat")
+            for fileName in [
+                "data/input/csv/dataset1.csv",
+                "data/input/csv/dataset3.csv",
+            ]:
+                BPSData(fileName, separator="_", cache=cache).pipeline()
+            self.assertIsNotNone(cache.get("data/input/csv/dataset1.csv", "_"))
+            self.assertIsNone(cache.get("data/input/csv/dataset1.csv", " "))
+
+            cache.invalidate("data/input/csv/dataset1.csv")
+            self.assertIsNone(cache.get("data/input/csv/dataset1.csv", "_"))
+            self.assertIsNotNone(cache.get("data/input/csv/dataset3.csv", "_"))
+
+            cache.maxBytes = cache.size() - 1
+            cache.evict()
+            self.assertEqual(cache.size(), 0)
+            self.assertListEqual(os.listdir(tempDir), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
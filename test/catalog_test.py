@@ -0,0 +1,119 @@
+import csv
+import unittest
+import tempfile
+from BPSPipeline.bpsmodule import *
+from BPSPipeline.catalog import *
+
+
+def writeUnitInTypes(fileName):
+    """Write BPS data whose title has no unit, so each comodity type carries its unit."""
+    listRow = [
+        ["Kabupaten/Kota", "Produksi_Sayuran", "", "", ""],
+        ["", "Cabai(Kuintal)", "", "Kubis(Ton)", ""],
+        ["", "2015", "2016", "2015", "2016"],
+        ["Lahat", "1", "2", "3", "-"],
+        ["Muara_Enim", "4", "5", "6", "7"],
+        ["Sumatera_Selatan", "5", "7", "9", "7"],
+        ["Sumber:Dinas_pertanian", "", "", "", ""],
+        ["Source_Url:_https://sumsel.bps.go.id", "", "", "", ""],
+        ["Access_Time:_November_1,_2021", "", "", "", ""],
+    ]
+    with open(fileName, "w", newline="") as file:
+        csv.writer(file).writerows(listRow)
+    return fileName
+
+
+def writeExcelWithEmptyRows(csvName, fileName):
+    """Write csv BPS data as xlsx, keeping its blank footer line as an empty row."""
+    from openpyxl import Workbook
+
+    workBook = Workbook()
+    workSheet = workBook.active
+    with open(csvName, newline="") as file:
+        for row in csv.reader(file):
+            listCell = []
+            for cell in row:
+                try:
+                    listCell.append(float(cell))
+                except ValueError:
+                    listCell.append(cell if cell != "" else None)
+            workSheet.append(listCell)
+    workBook.save(fileName)
+    return fileName
+
+
+class CatalogTestCase(unittest.TestCase):
+    def test_header_only(self):
+        """Test the header-only scan gives the same metadata as reading the whole file."""
+        for fileName, separator in [
+            ("data/input/csv/dataset4.csv", "_"),
+            ("data/input/excel/dataset1.xlsx", " "),
+        ]:
+            df = BPSData(fileName, separator=separator)
+            header = BPSData(fileName, separator=separator, headerOnly=True)
+            self.assertIsNone(header.readData)
+            self.assertEqual(header.title, df.title)
+            self.assertEqual(header.group, df.group)
+            self.assertEqual(header.unit, df.unit)
+            self.assertEqual(header.region, df.region)
+            self.assertListEqual(header.year, df.year)
+            self.assertListEqual(header.comodity, df.comodity)
+            self.assertEqual(header.rows, len(df.listRegion))
+
+    def test_title_without_unit(self):
+        """Test a title without unit gives an empty unit, so each type's unit is split from it."""
+        self.assertTupleEqual(
+            parseTitle("Produksi_Sayuran", "_"), ("Produksi_Sayuran", "Sayuran", "")
+        )
+        self.assertTupleEqual(
+            parseTitle("Produksi_Sayuran_(Kuintal)", "_"),
+            ("Produksi_Sayuran", "Sayuran", "Kuintal"),
+        )
+        with tempfile.TemporaryDirectory() as tempDir:
+            fileName = writeUnitInTypes(f"{tempDir}/unit.csv")
+            df = BPSData(fileName, separator="_")
+            header = BPSData(fileName, separator="_", headerOnly=True)
+            result = df.pipeline()
+
+        self.assertEqual(df.unit, "")
+        self.assertEqual(header.unit, "")
+        self.assertListEqual(sorted(result["type"].unique()), ["Cabai", "Kubis"])
+        self.assertListEqual(sorted(result["unit"].unique()), ["Kuintal", "Ton"])
+
+    def test_excel_empty_rows(self):
+        """Test the header-only scan counts the empty rows of xlsx file like read_excel does."""
+        with tempfile.TemporaryDirectory() as tempDir:
+            fileName = writeExcelWithEmptyRows(
+                "data/input/csv/dataset4.csv", f"{tempDir}/dataset4.xlsx"
+            )
+            df = BPSData(fileName, separator="_")
+            metadata = scanHeader(fileName, "_")
+
+        self.assertEqual(metadata["rows"], len(df.listRegion))
+        self.assertListEqual(metadata["year"], df.year)
+        self.assertTrue(metadata["source"].startswith("Source_Url"))
+
+    def test_catalog(self):
+        """Test the catalog is persisted and groups files by commodity group."""
+        with tempfile.TemporaryDirectory() as tempDir:
+            catalog = Catalog("data/input/csv/*csv", f"{tempDir}/catalog.json", "_")
+            reloaded = Catalog("data/input/csv/*csv", f"{tempDir}/catalog.json", "_")
+
+        self.assertListEqual(catalog.listEntry, reloaded.listEntry)
+        self.assertDictEqual(
+            catalog.groupFiles(),
+            {
+                "Buah-Buahan": [
+                    "data/input/csv/dataset1.csv",
+                    "data/input/csv/dataset2.csv",
+                ],
+                "Sayuran": [
+                    "data/input/csv/dataset3.csv",
+                    "data/input/csv/dataset4.csv",
+                ],
+            },
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import os
+import json
+import shutil
+import unittest
+import tempfile
+from unittest import mock
+from BPSPipeline.bpsmodule import *
+from BPSPipeline.export import *
+from BPSPipeline.cli import *
+from BPSPipeline.cli import _writeJson
+
+
+class BatchJobTestCase(unittest.TestCase):
+    def _writeJob(self, tempDir, **options):
+        job = {
+            "inputs": [f"{tempDir}/input/*csv", f"{tempDir}/input/*json"],
+            "output": f"{tempDir}/output",
+            "separator": "_",
+            **options,
+        }
+        with open(f"{tempDir}/job.json", "w") as file:
+            json.dump(job, file)
+        return f"{tempDir}/job.json"
+
+    def test_run_resume(self):
+        """Test the job quarantines broken files, resumes from its checkpoints & combines like BulkParse."""
+        with tempfile.TemporaryDirectory() as tempDir:
+            os.mkdir(f"{tempDir}/input")
+            for fileName in ["dataset1.csv", "dataset2.csv", "dataset3.csv"]:
+                shutil.copy(f"data/input/csv/{fileName}", f"{tempDir}/input/{fileName}")
+            with open(f"{tempDir}/input/broken.csv", "w") as file:
+                file.write("Kabupaten/Kota\n")
+            with open(f"{tempDir}/input/job.json", "w") as file:
+                file.write("{}")
+            jobName = self._writeJob(tempDir, workers=2, executor="thread")
+
+            self.assertEqual(main([jobName, "--quiet"]), 0)
+            job = BatchJob.fromJson(jobName)
+            with open(job.quarantine) as file:
+                self.assertSetEqual(
+                    set(json.load(file)),
+                    {f"{tempDir}/input/broken.csv", f"{tempDir}/input/job.json"},
+                )
+
+            expected = BulkParse(f"{tempDir}/input/dataset*csv", separator="_")
+            for uniqueGroup, combineDf in zip(
+                sorted(expected.listUniqueGroup), expected.combineResult()
+            ):
+                outputDf = readFrame(
+                    f"{tempDir}/output/Combine_Result_{uniqueGroup}.csv"
+                )
+                self.assertTrue(
+                    (outputDf.fillna(-1).values == combineDf.fillna(-1).values).all()
+                )
+
+            # A crash before the last file's checkpoint only parses that file again.
+            with open(job.state) as file:
+                state = json.load(file)
+            del state["files"][f"{tempDir}/input/dataset3.csv"]
+            state["groups"] = {}
+            with open(job.state, "w") as file:
+                json.dump(state, file)
+            summary = job.run()
+            self.assertEqual(summary["parsed"], 1)
+            self.assertEqual(summary["skipped"], 4)
+            self.assertListEqual(summary["combined"], ["Buah-Buahan", "Sayuran"])
+
+            self.assertDictEqual(
+                job.run(),
+                {"parsed": 0, "skipped": 5, "quarantined": 2, "combined": []},
+            )
+            self.assertEqual(job.run(restart=True)["parsed"], 3)
+
+    def test_checkpoint_batch(self):
+        """Test the checkpoint is written per batch of files & once at the end, instead of after every file."""
+        with tempfile.TemporaryDirectory() as tempDir:
+            os.mkdir(f"{tempDir}/input")
+            for fileName in ["dataset1.csv", "dataset2.csv", "dataset3.csv"]:
+                shutil.copy(f"data/input/csv/{fileName}", f"{tempDir}/input/{fileName}")
+            job = BatchJob(
+                [f"{tempDir}/input/*csv"],
+                f"{tempDir}/output",
+                "_",
+                checkpointFiles=2,
+                checkpointSeconds=3600,
+            )
+            with mock.patch(
+                "BPSPipeline.cli._writeJson", wraps=_writeJson
+            ) as writeJson:
+                self.assertEqual(job.run()["parsed"], 3)
+            listWritten = [call.args[1] for call in writeJson.call_args_list]
+            self.assertEqual(listWritten.count(job.quarantine), 2)
+            with open(job.state) as file:
+                self.assertEqual(len(json.load(file)["files"]), 3)
+
+    def test_invalid_option(self):
+        """Test an option that isn't a parse parameter is rejected."""
+        with self.assertRaises(AssertionError):
+            BatchJob(["data/input/csv/*csv"], options={"incremental": True})
+
+
+if __name__ == "__main__":
+    unittest.main()
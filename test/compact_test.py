@@ -0,0 +1,43 @@
+import unittest
+import numpy as np
+from BPSPipeline.bpsmodule import *
+from BPSPipeline.compact import *
+
+
+class CompactTestCase(unittest.TestCase):
+    def test_narrow_dtype(self):
+        """Test the narrowest lossless dtype of the values."""
+        self.assertEqual(narrowDtype([1.0, np.nan, 3.0]), "Int32")
+        self.assertEqual(narrowDtype([1.0, 2.0**40]), "Int64")
+        self.assertEqual(narrowDtype([0.5, np.nan]), "float32")
+        self.assertEqual(narrowDtype([0.1]), "float64")
+
+    def test_compact_bulk_parse(self):
+        """Test the compact results share their categories and keep every value."""
+        bulk = BulkParse("data/input/csv/*csv", separator="_")
+        compact = BulkParse("data/input/csv/*csv", separator="_", compact=True)
+
+        listDtype = set(Df["data"].index.levels[0].dtype for Df in compact.listData)
+        self.assertEqual(len(listDtype), 1)
+        for combined, compactCombined in zip(
+            bulk.combineResult(), compact.combineResult()
+        ):
+            self.assertTrue(
+                np.array_equal(
+                    combined.to_numpy(),
+                    compactCombined.astype("float64")
+                    .loc[combined.index]
+                    .to_numpy(na_value=np.nan),
+                    equal_nan=True,
+                )
+            )
+
+        report = compact.memoryReport()
+        self.assertListEqual(report["group"].index.tolist(), ["Buah-Buahan", "Sayuran"])
+        self.assertTrue(
+            (report["file"]["bytesAfter"] < report["file"]["bytesBefore"]).all()
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import os
+import re
+import zipfile
+import unittest
+import tempfile
+from glob import glob
+from pandas import read_excel
+from BPSPipeline.bpsmodule import *
+from BPSPipeline.excel import *
+from BPSPipeline.synthetic import *
+
+
+def prefixNamespace(fileName, prefixedName):
+    """Rewrite the sheets & shared strings of an xlsx file with the 'x' namespace prefix, such as '<x:row>'."""
+    with zipfile.ZipFile(fileName) as source, zipfile.ZipFile(
+        prefixedName, "w"
+    ) as target:
+        for member in source.namelist():
+            content = source.read(member)
+            if member.startswith("xl/worksheets/") or member == "xl/sharedStrings.xml":
+                content = re.sub(rb"<(/?)(\w+)(?=[\s/>])", rb"<\1x:\2", content)
+                content = content.replace(b' xmlns="', b' xmlns:x="')
+            target.writestr(member, content)
+    return prefixedName
+
+
+class ExcelTestCase(unittest.TestCase):
+    def test_read_excel(self):
+        """Test the fast reader returns the same dataframe as read_excel."""
+        with tempfile.TemporaryDirectory() as tempDir:
+            listFile = sorted(glob("data/input/excel/*xlsx"))
+            listFile.append(
+                generateData(
+                    f"{tempDir}/synthetic.xlsx",
+                    format="xlsx",
+                    unitInTitle=False,
+                    seed=0,
+                )
+            )
+            for fileName in listFile:
+                self.assertTrue(readExcel(fileName).equals(read_excel(fileName)))
+
+    def test_excel_mode(self):
+        """Test the pipeline result is the same for each xlsx reader, and the converted csv is reused."""
+        with tempfile.TemporaryDirectory() as tempDir:
+            for fileName in sorted(glob("data/input/excel/*xlsx")):
+                expected = BPSData(fileName).pipeline()
+                fast = BPSData(fileName, excelMode="fast").pipeline()
+                converted = BPSData(fileName, excelCache=tempDir).pipeline()
+                self.assertTrue(expected.equals(fast))
+                self.assertTrue(expected.equals(converted))
+
+            listConverted = sorted(os.listdir(tempDir))
+            self.assertEqual(len(listConverted), 2)
+            csvName = excelToCsv("data/input/excel/dataset1.xlsx", tempDir)
+            self.assertIn(os.path.basename(csvName), listConverted)
+            self.assertListEqual(sorted(os.listdir(tempDir)), listConverted)
+
+    def test_namespace_prefix(self):
+        """Test the fast reader reads a sheet whose elements have a namespace prefix."""
+        with tempfile.TemporaryDirectory() as tempDir:
+            listFile = sorted(glob("data/input/excel/*xlsx"))
+            listFile.append(
+                generateData(f"{tempDir}/synthetic.xlsx", format="xlsx", seed=0)
+            )
+            for numberFile, fileName in enumerate(listFile):
+                prefixedName = prefixNamespace(
+                    fileName, f"{tempDir}/prefixed{numberFile}.xlsx"
+                )
+                self.assertIn(
+                    b"<x:row",
+                    zipfile.ZipFile(prefixedName).read("xl/worksheets/sheet1.xml"),
+                )
+                df = readExcel(prefixedName)
+                self.assertGreater(len(df), 0)
+                self.assertTrue(df.equals(readExcel(fileName)))
+
+    def test_header_rows(self):
+        """Test only the first cell of the rows past headerRows is read, without changing the row count."""
+        fileName = "data/input/excel/dataset1.xlsx"
+        listRow = list(iterExcelRows(fileName))
+        listScanned = list(iterExcelRows(fileName, headerRows=3))
+        self.assertEqual(len(listScanned), len(listRow))
+        self.assertListEqual(listScanned[:3], listRow[:3])
+        self.assertListEqual(listScanned[3:], [row[:1] for row in listRow[3:]])
+
+
+if __name__ == "__main__":
+    unittest.main()
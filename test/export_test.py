@@ -0,0 +1,98 @@
+import os
+import filecmp
+import unittest
+import tempfile
+from importlib.util import find_spec
+from pandas import read_csv, read_parquet
+from BPSPipeline.bpsmodule import *
+from BPSPipeline.export import FORMAT_COMPRESSION, readFrame
+
+
+class ExportTestCase(unittest.TestCase):
+    def test_grouped_export(self):
+        """Test the partitioned writer gives the same files as the reference output."""
+        df = BPSData("data/input/csv/dataset4.csv", separator="_")
+        with tempfile.TemporaryDirectory() as tempDir:
+            listFile = df.groupedExport(f"{tempDir}/", groupBy="region")
+            self.assertEqual(len(listFile), len(df.listRegion))
+            for fileName in listFile:
+                reference = f"data/output/csv/test_group/{os.path.basename(fileName)}"
+                self.assertTrue(filecmp.cmp(fileName, reference, shallow=False))
+
+    def test_compressed_export(self):
+        """Test the gzip compressed export by type."""
+        df = BPSData("data/input/csv/dataset4.csv", separator="_", fullResult=True)
+        with tempfile.TemporaryDirectory() as tempDir:
+            listFile = df.groupedExport(
+                f"{tempDir}/", groupBy="type", compression="gzip"
+            )
+            self.assertTrue(all(fileName.endswith(".csv.gz") for fileName in listFile))
+            self.assertListEqual(
+                read_csv(listFile[0])["type"].unique().tolist(), ["Petsai"]
+            )
+
+    @unittest.skipUnless(find_spec("pyarrow"), "pyarrow isn't installed")
+    def test_hive_export(self):
+        """Test the Hive-style partitioned Parquet layout."""
+        df = BPSData("data/input/csv/dataset4.csv", separator="_")
+        with tempfile.TemporaryDirectory() as tempDir:
+            pathDataset = df.groupedExport(f"{tempDir}/", layout="hive")
+            self.assertTrue(os.path.isdir(f"{pathDataset}/type=Cabai/region=Lahat"))
+            self.assertEqual(len(read_parquet(pathDataset)), len(df.pipeline()))
+
+    @unittest.skipUnless(find_spec("pyarrow"), "pyarrow isn't installed")
+    def test_columnar_formats(self):
+        """Test every output format keeps the index and the integer year columns."""
+        bulk = BulkParse("data/input/csv/*csv", separator="_")
+        combined = bulk.combineResult()[0]
+        flat = BPSData("data/input/csv/dataset1.csv", separator="_")
+        with tempfile.TemporaryDirectory() as tempDir:
+            for format in ["csv", "parquet", "feather", "arrow"]:
+                bulk = BulkParse(
+                    "data/input/csv/*csv",
+                    tempDir,
+                    "_",
+                    export=True,
+                    outputFormat=format,
+                )
+                bulk.combineResult()
+                result = readFrame(f"{tempDir}/Combine_Result_0.{format}")
+                self.assertListEqual(result.index.names, combined.index.names)
+                self.assertListEqual(result.columns.tolist(), combined.columns.tolist())
+                self.assertTrue(result.equals(combined))
+
+                fileName = flat.exportResult(f"{tempDir}/flat", format)
+                self.assertTrue(readFrame(fileName).equals(flat.pipeline()))
+
+    @unittest.skipUnless(find_spec("pyarrow"), "pyarrow isn't installed")
+    def test_format_compression(self):
+        """Test each format writes & reads its supported codecs and rejects the others up front."""
+        flat = BPSData("data/input/csv/dataset1.csv", separator="_")
+        with tempfile.TemporaryDirectory() as tempDir:
+            for format in ["csv", "parquet", "feather", "arrow"]:
+                for compression in [None, "gzip", "lz4", "zstd"]:
+                    fileName = f"{tempDir}/{format}-{compression}"
+
+                    # Pandas needs zstandard for zstd csv.
+                    if (format, compression) == ("csv", "zstd") and not find_spec(
+                        "zstandard"
+                    ):
+                        continue
+                    if compression in FORMAT_COMPRESSION[format]:
+                        fileName = flat.exportResult(fileName, format, compression)
+                        self.assertTrue(readFrame(fileName).equals(flat.pipeline()))
+                    else:
+                        with self.assertRaises(AssertionError):
+                            flat.exportResult(fileName, format, compression)
+                        self.assertListEqual(
+                            [
+                                name
+                                for name in os.listdir(tempDir)
+                                if name.startswith(f"{format}-{compression}")
+                            ],
+                            [],
+                        )
+
+
+if __name__ == "__main__":
+    unittest.main()
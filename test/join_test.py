@@ -0,0 +1,46 @@
+import os
+import shutil
+import unittest
+import tempfile
+from BPSPipeline.bpsmodule import *
+from BPSPipeline.join import *
+
+
+class JoinTestCase(unittest.TestCase):
+    def test_join_group(self):
+        """Test the joined group has a sorted index and every year of its files."""
+        bulk = BulkParse("data/input/csv/*csv", separator="_")
+        groupedResult = bucketByGroup(bulk.listData)
+        self.assertListEqual(list(groupedResult), ["Buah-Buahan", "Sayuran"])
+
+        combineDf = joinGroup(groupedResult["Sayuran"])
+        self.assertTrue(combineDf.index.is_monotonic_increasing)
+        self.assertListEqual(combineDf.columns.tolist(), list(range(2015, 2021)))
+        for result in groupedResult["Sayuran"]:
+            expected = result["data"]
+            self.assertTrue(
+                combineDf.loc[expected.index, expected.columns].equals(expected)
+            )
+
+    def test_overlap_policy(self):
+        """Test each policy for two files with the same years."""
+        with tempfile.TemporaryDirectory() as tempDir:
+            shutil.copy("data/input/csv/dataset1.csv", f"{tempDir}/old.csv")
+            shutil.copy("data/input/csv/dataset1.csv", f"{tempDir}/new.csv")
+            os.utime(f"{tempDir}/old.csv", (0, 0))
+
+            old = BPSData(f"{tempDir}/old.csv", "_", fullResult=True).pipeline()
+            new = BPSData(f"{tempDir}/new.csv", "_", fullResult=True).pipeline()
+            self.assertTrue(joinGroup([new, old], "equal").equals(joinGroup([old])))
+            with self.assertRaises(ValueError):
+                joinGroup([old, new], "error")
+
+            new["data"] = new["data"] * 2
+            with self.assertRaises(ValueError):
+                joinGroup([old, new], "equal")
+            newest = joinGroup([new, old], "newest")
+            self.assertTrue(newest.equals(joinGroup([new])))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+import numpy as np
+from glob import glob
+from pandas import Series
+from BPSPipeline.bpsmodule import *
+from BPSPipeline.labels import *
+from BPSPipeline import bpsmodule
+from BPSPipeline.bpsmodule import _initWorker, _parseFile
+
+
+class LabelNormalizerTestCase(unittest.TestCase):
+    def test_same_as_string_methods(self):
+        """Test the normalized labels are the same as the row-wise string methods."""
+        values = Series(
+            ["muara_enim", "Salak(Kuintal)", "a(b(c)", "pisang", np.nan] * 3
+        )
+        normalizer = LabelNormalizer()
+        self.assertListEqual(
+            normalizer.title(values).tolist()[:4], values.str.title().tolist()[:4]
+        )
+        listType, listUnit = normalizer.splitUnit(values)
+        expandedColumns = values.str.split("(", expand=True)
+        self.assertListEqual(listType.tolist()[:4], expandedColumns[0].tolist()[:4])
+        self.assertListEqual(
+            listUnit.tolist()[1:3],
+            expandedColumns[1].str.replace(")", "", regex=False).tolist()[1:3],
+        )
+        self.assertTrue(np.isnan(listUnit[0]) and np.isnan(listType[4]))
+        self.assertEqual(len(normalizer.titled), 5)
+
+    def test_shared_normalizer(self):
+        """Test the results with a shared normalizer are the same & each label is normalized once."""
+        normalizer = LabelNormalizer()
+        for fileName in sorted(glob("data/input/csv/*csv")):
+            result = BPSData(fileName, "_", normalizer=normalizer).pipeline()
+            expected = BPSData(fileName, "_").pipeline()
+            self.assertTrue(result.equals(expected))
+            self.assertListEqual(result.dtypes.tolist(), expected.dtypes.tolist())
+
+        bulk = BulkParse("data/input/csv/*csv", separator="_")
+        self.assertEqual(
+            len(bulk.normalizer.titled),
+            len(set(bulk.listData[0]["data"].index.get_level_values(0))),
+        )
+
+    def test_worker_normalizer(self):
+        """Test a process pool's tasks don't carry the normalizer, each worker parses with its own one."""
+        bulk = BulkParse("data/input/csv/*csv", separator="_", workers=2, lazy=True)
+        options = bulk._parseOptions()
+        self.assertIsNone(options["normalizer"])
+
+        fileName = "data/input/csv/dataset1.csv"
+        try:
+            _initWorker()
+            result, error, _ = _parseFile(fileName, options)
+            self.assertIsNone(error)
+            self.assertGreater(len(bpsmodule._workerNormalizer.titled), 0)
+        finally:
+            bpsmodule._workerNormalizer = None
+        self.assertTrue(
+            result["data"].equals(
+                BPSData(fileName, "_", fullResult=True).pipeline()["data"]
+            )
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import os
+import shutil
+import tempfile
+import unittest
+from glob import glob
+from unittest import mock
+from BPSPipeline.bpsmodule import *
+from BPSPipeline.prefetch import *
+
+
+class PrefetchTestCase(unittest.TestCase):
+    def test_prefetch_parse(self):
+        """Test parsing prefetched bytes returns the same results as reading each file."""
+        expected = BulkParse("data/input/csv/*csv", separator="_")
+        prefetched = BulkParse("data/input/csv/*csv", separator="_", prefetch=2)
+        for obj in prefetched.listObj:
+            self.assertIsNone(obj.buffer)
+        for resultExpected, result in zip(expected.listData, prefetched.listData):
+            self.assertTrue(resultExpected["data"].equals(result["data"]))
+
+        for fileName in sorted(glob("data/input/excel/*xlsx")):
+            with open(fileName, "rb") as file:
+                buffer = file.read()
+            for excelMode in BPSData.LIST_EXCEL_MODE:
+                self.assertTrue(
+                    BPSData(fileName, excelMode=excelMode, buffer=buffer)
+                    .pipeline()
+                    .equals(BPSData(fileName).pipeline())
+                )
+
+    def test_prefetch_order(self):
+        """Test the files are yielded in order and a read error is yielded without stopping the next files."""
+        listFile = sorted(glob("data/input/csv/*csv"))
+        listPrefetched = list(prefetchFiles(listFile, depth=3))
+        self.assertListEqual([fileName for fileName, _, _ in listPrefetched], listFile)
+        with open(listFile[0], "rb") as file:
+            self.assertEqual(listPrefetched[0][1], file.read())
+
+        self.assertIsNone(listPrefetched[0][2])
+
+        missing = "data/input/csv/missing.csv"
+        listPrefetched = list(prefetchFiles([listFile[0], missing, listFile[1]], 1))
+        self.assertListEqual(
+            [fileName for fileName, _, _ in listPrefetched],
+            [listFile[0], missing, listFile[1]],
+        )
+        self.assertIsNone(listPrefetched[1][1])
+        self.assertIsInstance(listPrefetched[1][2], FileNotFoundError)
+        self.assertIsNotNone(listPrefetched[2][1])
+
+    def test_prefetch_unreadable_file(self):
+        """Test an unreadable file is recorded in listError instead of stopping the prefetched parse."""
+        with tempfile.TemporaryDirectory() as tempDir:
+            for fileName in glob("data/input/csv/*csv"):
+                shutil.copy(fileName, tempDir)
+            os.mkdir(f"{tempDir}/dataset15.csv")
+
+            expected = BulkParse(f"{tempDir}/*csv", separator="_")
+            prefetched = BulkParse(f"{tempDir}/*csv", separator="_", prefetch=2)
+        self.assertListEqual(list(prefetched.listError), [f"{tempDir}/dataset15.csv"])
+        self.assertListEqual(list(expected.listError), list(prefetched.listError))
+        self.assertEqual(len(prefetched.listData), len(expected.listData))
+
+    def test_prefetch_cache_key(self):
+        """Test the cache key of a prefetched file hashes its buffer instead of reading the file again."""
+        fileName = "data/input/csv/dataset1.csv"
+        with open(fileName, "rb") as file:
+            buffer = file.read()
+        with tempfile.TemporaryDirectory() as tempDir:
+            cache = ResultCache(tempDir)
+            key = cache.key(fileName, "_")
+            with mock.patch("builtins.open", side_effect=AssertionError):
+                self.assertEqual(cache.key(fileName, "_", buffer=buffer), key)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import json
+import unittest
+import tempfile
+from BPSPipeline.bpsmodule import *
+from BPSPipeline.profiling import *
+
+
+class ProfilerTestCase(unittest.TestCase):
+    def test_stage_report(self):
+        """Test every stage of a file is recorded with its rows & bytes, and reported through the callback & json."""
+        listCallback = []
+        profiler = Profiler(callback=listCallback.append)
+        df = BPSData("data/input/csv/dataset1.csv", separator="_", profiler=profiler)
+        result = df.pipeline()
+        with tempfile.TemporaryDirectory() as tempDir:
+            df.exportResult(f"{tempDir}/result", format="csv")
+            report = json.loads(profiler.toJson(f"{tempDir}/report.json"))
+
+        self.assertListEqual(
+            [record["stage"] for record in profiler.records],
+            ["read", "header", "reshape", "labels", "export"],
+        )
+        self.assertListEqual(listCallback, profiler.records)
+        self.assertGreater(report["stages"]["read"]["bytes"], 0)
+        self.assertEqual(report["stages"]["reshape"]["rows"], len(result))
+        self.assertGreater(report["stages"]["export"]["bytes"], 0)
+        self.assertSetEqual(
+            set(report["files"]["data/input/csv/dataset1.csv"]),
+            {"read", "header", "reshape", "labels", "export"},
+        )
+
+    def test_parallel_records(self):
+        """Test the records of pool workers are merged into the profiler, as in a serial run."""
+        serial = Profiler()
+        parallel = Profiler()
+        BulkParse("data/input/csv/*csv", separator="_", profiler=serial)
+        BulkParse(
+            "data/input/csv/*csv",
+            separator="_",
+            workers=2,
+            executor="process",
+            profiler=parallel,
+        ).combineResult()
+
+        self.assertListEqual(
+            sorted((record["stage"], record["fileName"]) for record in serial.records),
+            sorted(
+                (record["stage"], record["fileName"])
+                for record in parallel.records
+                if record["stage"] != "combine"
+            ),
+        )
+        self.assertIn("combine", parallel.report()["stages"])
+
+    def test_disabled(self):
+        """Test a disabled profiler records nothing."""
+        df = BPSData("data/input/csv/dataset1.csv", separator="_")
+        df.pipeline()
+        self.assertIs(df._profiler, NULL_PROFILER)
+        with NULL_PROFILER.stage("read") as record:
+            record["rows"] = 1
+        self.assertFalse(hasattr(NULL_PROFILER, "records"))
+
+
+if __name__ == "__main__":
+    unittest.main()
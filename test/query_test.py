@@ -0,0 +1,59 @@
+import unittest
+import tempfile
+from BPSPipeline.bpsmodule import *
+from BPSPipeline.query import *
+
+
+class QueryStoreTestCase(unittest.TestCase):
+    def test_group_round_trip(self):
+        """Test each stored group is loaded back as the sorted combined result."""
+        bulk = BulkParse("data/input/csv/*csv", separator="_")
+        listCombined = bulk.combineResult()
+        with tempfile.TemporaryDirectory() as tempDir:
+            with QueryStore(f"{tempDir}/store.sqlite") as store:
+                self.assertListEqual(
+                    store.put(listCombined), ["Buah-Buahan", "Sayuran"]
+                )
+
+            # The store is persisted & reopened without loading any group.
+            with QueryStore(f"{tempDir}/store.sqlite") as store:
+                self.assertListEqual(store.groups(), ["Buah-Buahan", "Sayuran"])
+                self.assertEqual(store.misses, 0)
+                for combineDf in listCombined:
+                    group = combineDf.index.get_level_values(1)[0]
+                    self.assertTrue(
+                        store.group(group).equals(
+                            combineDf.astype("float64").sort_index()
+                        )
+                    )
+
+    def test_get(self):
+        """Test the lookups by region, type, year, group & unit."""
+        bulk = BulkParse("data/input/csv/*csv", separator="_", lazy=True)
+        with tempfile.TemporaryDirectory() as tempDir:
+            store = bulk.queryStore(f"{tempDir}/store.sqlite", cacheGroups=1)
+            result = store.get(region="Muara_Enim", type="Salak", years=[2019, 2020])
+            self.assertListEqual(result.columns.tolist(), [2019, 2020])
+            self.assertListEqual(
+                result.values.tolist(),
+                [[13017.0, 4183.0]],
+            )
+
+            result = store.get(type=["Salak", "Bawang_Merah", "Unknown"])
+            self.assertSetEqual(
+                set(result.index.get_level_values("type")), {"Salak", "Bawang_Merah"}
+            )
+            self.assertEqual(len(result), 34)
+            self.assertEqual(len(store.get(group="Sayuran", unit="Kuintal")), 85)
+            self.assertEqual(len(store.get(type="Unknown")), 0)
+
+            # Only the least recently used group is evicted.
+            self.assertListEqual(list(store._cache), ["Sayuran"])
+            hits, misses = store.hits, store.misses
+            store.get(group="Sayuran")
+            self.assertTupleEqual((store.hits, store.misses), (hits + 1, misses))
+            store.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
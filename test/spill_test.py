@@ -0,0 +1,60 @@
+import os
+import shutil
+import unittest
+import tempfile
+from BPSPipeline.bpsmodule import *
+from BPSPipeline.export import *
+from BPSPipeline.join import *
+from BPSPipeline.spill import *
+
+
+class SpillTestCase(unittest.TestCase):
+    def test_out_of_core_combine(self):
+        """Test the out-of-core combine exports the same results as the in-memory combine with a tiny memory budget."""
+        expected = BulkParse("data/input/csv/*csv", separator="_").combineResult()
+        with tempfile.TemporaryDirectory() as tempDir:
+            for outputFormat in ["csv", "parquet"]:
+                listExported = BulkParse(
+                    "data/input/csv/*csv",
+                    pathOutput=tempDir,
+                    separator="_",
+                    outputFormat=outputFormat,
+                    lazy=True,
+                    memoryBudget=4096,
+                    pathSpill=tempDir,
+                ).combineResult()
+                self.assertEqual(len(listExported), len(expected))
+                for combineExpected, fileName in zip(expected, listExported):
+                    self.assertTrue(readFrame(fileName).equals(combineExpected))
+            # The temporary run files are removed once merged.
+            for fileName in os.listdir(tempDir):
+                self.assertTrue(fileName.startswith("Combine_Result"))
+
+    def test_merge_overlap(self):
+        """Test each overlap policy gives the same result as joinGroup."""
+        with tempfile.TemporaryDirectory() as tempDir:
+            shutil.copy("data/input/csv/dataset1.csv", f"{tempDir}/old.csv")
+            shutil.copy("data/input/csv/dataset1.csv", f"{tempDir}/new.csv")
+            os.utime(f"{tempDir}/old.csv", (0, 0))
+
+            old = BPSData(f"{tempDir}/old.csv", "_", fullResult=True).pipeline()
+            new = BPSData(f"{tempDir}/new.csv", "_", fullResult=True).pipeline()
+            new["data"] = new["data"] * 2
+            spillRun(old["data"], f"{tempDir}/old.run")
+            spillRun(new["data"], f"{tempDir}/new.run")
+            listRun = [
+                (f"{tempDir}/new.run", f"{tempDir}/new.csv"),
+                (f"{tempDir}/old.run", f"{tempDir}/old.csv"),
+            ]
+
+            mergeRuns(listRun, f"{tempDir}/newest.csv", "newest", memoryBudget=2048)
+            self.assertTrue(
+                readFrame(f"{tempDir}/newest.csv").equals(joinGroup([new, old]))
+            )
+            for overlap in ["error", "equal"]:
+                with self.assertRaises(ValueError):
+                    mergeRuns(listRun, f"{tempDir}/{overlap}.csv", overlap)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+import tempfile
+from unittest import mock
+from glob import glob
+from BPSPipeline.bpsmodule import *
+from BPSPipeline.export import *
+
+
+def _plain(df):
+    """Convert a combined result to float values on a sorted plain index, so compact results can be compared."""
+    df = df.astype("float64")
+    df.index = df.index.to_flat_index()
+    return df.sort_index()
+
+
+class StreamingTestCase(unittest.TestCase):
+    def test_iter_results(self):
+        """Test the results are streamed in order without being kept."""
+        expected = BulkParse("data/input/csv/*csv", separator="_")
+        for workers in [1, 2]:
+            lazy = BulkParse(
+                "data/input/csv/*csv",
+                separator="_",
+                workers=workers,
+                executor="thread",
+                lazy=True,
+            )
+            listResult = list(lazy.iterResults())
+            self.assertListEqual(
+                [fileName for fileName, _ in listResult],
+                sorted(glob("data/input/csv/*csv")),
+            )
+            for resultExpected, (_, result) in zip(expected.listData, listResult):
+                self.assertTrue(resultExpected["data"].equals(result["data"]))
+            self.assertListEqual(lazy.listData, [])
+            self.assertListEqual(lazy.listObj, [])
+            self.assertSetEqual(lazy.listUniqueGroup, expected.listUniqueGroup)
+
+    def test_shared_pool(self):
+        """Test the streaming combine starts one pool of workers for every group."""
+        expected = BulkParse("data/input/csv/*csv", separator="_").combineResult()
+        lazy = BulkParse(
+            "data/input/csv/*csv",
+            separator="_",
+            workers=2,
+            executor="thread",
+            lazy=True,
+        )
+        with mock.patch.object(
+            BulkParse, "_newPool", autospec=True, side_effect=BulkParse._newPool
+        ) as newPool:
+            listCombined = lazy.combineResult()
+        self.assertGreater(len(listCombined), 1)
+        self.assertEqual(newPool.call_count, 1)
+        for combineExpected, combineDf in zip(expected, listCombined):
+            self.assertTrue(_plain(combineExpected).equals(_plain(combineDf)))
+
+    def test_streaming_combine(self):
+        """Test the streaming combine returns & exports the same results as the eager combine."""
+        for compact in [False, True]:
+            expected = BulkParse(
+                "data/input/csv/*csv", separator="_", compact=compact
+            ).combineResult()
+            lazy = BulkParse(
+                "data/input/csv/*csv", separator="_", compact=compact, lazy=True
+            )
+            for combineExpected, combineDf in zip(expected, lazy.combineResult()):
+                self.assertTrue(_plain(combineExpected).equals(_plain(combineDf)))
+
+        expected = BulkParse("data/input/csv/*csv", separator="_").combineResult()
+        with tempfile.TemporaryDirectory() as tempDir:
+            BulkParse(
+                "data/input/csv/*csv",
+                pathOutput=tempDir,
+                separator="_",
+                export=True,
+                lazy=True,
+            ).combineResult()
+            for id, combineExpected in enumerate(expected):
+                combineDf = readFrame(f"{tempDir}/Combine_Result_{id}.csv")
+                self.assertListEqual(
+                    combineDf.index.tolist(), combineExpected.index.tolist()
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+import tempfile
+from BPSPipeline.bpsmodule import *
+from BPSPipeline.synthetic import *
+
+
+class SyntheticTestCase(unittest.TestCase):
+    def test_generate_data(self):
+        """Test the synthetic files are parsed like BPS data."""
+        with tempfile.TemporaryDirectory() as tempDir:
+            for format in ["csv", "xlsx"]:
+                for unitInTitle in [True, False]:
+                    fileName = generateData(
+                        f"{tempDir}/synthetic.{format}",
+                        format=format,
+                        regions=9,
+                        commodities=4,
+                        years=[2019, 2020],
+                        unitInTitle=unitInTitle,
+                        seed=0,
+                    )
+                    df = BPSData(fileName, separator="_")
+                    result = df.pipeline()
+                    self.assertEqual(df.group, "Sayuran")
+                    self.assertListEqual(df.year, [2019, 2020])
+                    self.assertEqual(len(df.listRegion), 9)
+                    self.assertEqual(result.shape, (36, 6))
+                    self.assertListEqual(result["unit"].unique().tolist(), ["Kuintal"])
+
+    def test_generate_dataset(self):
+        """Test the synthetic dataset is combined by group across consecutive years."""
+        with tempfile.TemporaryDirectory() as tempDir:
+            listFile = generateDataset(tempDir, files=6, regions=5, commodities=3)
+            self.assertEqual(len(listFile), 6)
+            bulk = BulkParse(f"{tempDir}/*.csv", separator="_")
+            listCombined = bulk.combineResult()
+
+        self.assertListEqual(sorted(bulk.listUniqueGroup), ["Buah-Buahan", "Sayuran"])
+        self.assertListEqual(listCombined[0].columns.tolist(), list(range(2000, 2009)))
+
+
+if __name__ == "__main__":
+    unittest.main()
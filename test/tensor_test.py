@@ -0,0 +1,88 @@
+import unittest
+import tempfile
+import numpy as np
+from glob import glob
+from BPSPipeline.bpsmodule import *
+from BPSPipeline.tensor import *
+from BPSPipeline.cache import *
+
+
+class TensorTestCase(unittest.TestCase):
+    def test_tensor_frame(self):
+        """Test the tensor's long table is the pipeline's result & a view of its array."""
+        for fileName in sorted(glob("data/input/csv/*csv")):
+            data = BPSData(fileName, "_")
+            tensor = data.tensor()
+            frame = tensor.toFrame()
+            self.assertTrue(frame.equals(data.pipeline()))
+            self.assertTrue(
+                np.shares_memory(frame[tensor.year].to_numpy(), tensor.array)
+            )
+            self.assertTrue(
+                tensor.toFrame(fullResult=True).equals(
+                    BPSData(fileName, "_", fullResult=True).pipeline()["data"]
+                )
+            )
+
+    def test_cached_tensor(self):
+        """Test the tensor of a cached result is the same as the parsed one."""
+        fileName = "data/input/csv/dataset1.csv"
+        with tempfile.TemporaryDirectory() as tempDir:
+            cache = ResultCache(tempDir)
+            BPSData(fileName, "_", cache=cache).pipeline()
+            cached = BPSData(fileName, "_", cache=cache).tensor()
+        tensor = BPSData(fileName, "_").tensor()
+        self.assertTrue(np.array_equal(cached.array, tensor.array, equal_nan=True))
+        self.assertListEqual(cached.type, tensor.type)
+        self.assertListEqual(cached.region, tensor.region)
+
+    def test_sel(self):
+        """Test selecting by labels keeps every axis."""
+        tensor = BPSData("data/input/csv/dataset1.csv", "_").tensor()
+        region, year = tensor.region[2], tensor.year[-1]
+        selected = tensor.sel(region=region, type=tensor.type[:2], year=year)
+        self.assertTupleEqual(selected.array.shape, (2, 1, 1))
+        self.assertTrue(
+            np.array_equal(
+                selected.array[:, 0, 0], tensor.array[:2, 2, -1], equal_nan=True
+            )
+        )
+        selected = tensor.sel(unit=tensor.unit[0])
+        self.assertEqual(
+            len(selected.type), sum(unit == tensor.unit[0] for unit in tensor.unit)
+        )
+        self.assertTrue(
+            np.array_equal(tensor.values[3, 1], tensor.array[1, 3], equal_nan=True)
+        )
+
+    def test_save_load(self):
+        """Test the tensor is saved & memory-mapped back with its labels."""
+        tensor = BPSData("data/input/csv/dataset3.csv", "_").tensor()
+        with tempfile.TemporaryDirectory() as pathOutput:
+            tensor.save(f"{pathOutput}/tensor")
+            loaded = BPSTensor.load(f"{pathOutput}/tensor")
+            self.assertIsInstance(loaded.array, np.memmap)
+            self.assertTrue(loaded.toFrame().equals(tensor.toFrame()))
+            del loaded
+
+    def test_combine_tensor(self):
+        """Test the combined tensor has every row of the combined result."""
+        for lazy in [False, True]:
+            bulk = BulkParse("data/input/csv/*csv", separator="_", lazy=lazy)
+            expected = BulkParse("data/input/csv/*csv", separator="_").combineResult()
+            for (_, tensor), combineDf in zip(bulk.combineTensor().items(), expected):
+                for region, _, unit, type in combineDf.index:
+                    values = tensor.sel(region=region, type=type, unit=unit).array
+                    self.assertTrue(
+                        np.array_equal(
+                            values.ravel(),
+                            combineDf.loc[(region, slice(None), unit, type)]
+                            .to_numpy(dtype="float64")
+                            .ravel(),
+                            equal_nan=True,
+                        )
+                    )
+
+
+if __name__ == "__main__":
+    unittest.main()
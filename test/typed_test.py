@@ -0,0 +1,39 @@
+import unittest
+import tempfile
+from glob import glob
+from BPSPipeline.bpsmodule import *
+from BPSPipeline.synthetic import *
+from BPSPipeline.typed import *
+
+
+class TypedCsvTestCase(unittest.TestCase):
+    def test_typed_pipeline(self):
+        """Test the typed parse returns the same pipeline result for each engine without object value columns."""
+        for fileName in sorted(glob("data/input/csv/*csv")):
+            expected = BPSData(fileName, separator="_").pipeline()
+            for engine in LIST_CSV_ENGINE:
+                df = BPSData(fileName, separator="_", csvMode="typed", csvEngine=engine)
+                self.assertTrue(all(dtype == "float64" for dtype in df.readData.dtypes))
+                self.assertTrue(expected.equals(df.pipeline()))
+
+    def test_placeholder(self):
+        """Test BPS placeholders are read as missing values and the footer is skipped."""
+        with tempfile.TemporaryDirectory() as tempDir:
+            fileName = generateData(
+                f"{tempDir}/synthetic.csv", regions=3, missingRate=0.5, seed=0
+            )
+            with open(fileName, encoding="utf-8") as file:
+                content = file.read().replace(",-,", ",…,", 1)
+            with open(fileName, "w", encoding="utf-8") as file:
+                file.write(content)
+            header, df = readTypedCsv(fileName, "_")
+
+        self.assertListEqual(
+            df[header["region"]].tolist(), [f"Kabupaten_{n}" for n in [1, 2, 3]]
+        )
+        self.assertEqual(df.isna().sum().sum(), content.count(",-") + 1)
+        self.assertListEqual(header["year"], [2015, 2016, 2017])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import os
+import shutil
+import unittest
+import tempfile
+from glob import glob
+from BPSPipeline.bpsmodule import *
+from BPSPipeline.watch import *
+
+
+class WatchServiceTestCase(unittest.TestCase):
+    def test_publish(self):
+        """Test the arrived files are published into their group's output & only the affected group is updated."""
+        with tempfile.TemporaryDirectory() as tempDir:
+            inputDir, outputDir = f"{tempDir}/input", f"{tempDir}/output"
+            os.mkdir(inputDir)
+            for fileName in ["dataset1.csv", "dataset3.csv", "dataset4.csv"]:
+                shutil.copy(f"data/input/csv/{fileName}", f"{inputDir}/{fileName}")
+
+            listPublished = []
+            with WatchService(
+                f"{inputDir}/*csv",
+                outputDir,
+                "_",
+                executor="thread",
+                settle=0,
+                callback=listPublished.append,
+            ) as service:
+                self.assertListEqual(
+                    list(service.runOnce()), ["Buah-Buahan", "Sayuran"]
+                )
+                self.assertDictEqual(service.runOnce(), {})
+
+                shutil.copy("data/input/csv/dataset2.csv", f"{inputDir}/dataset2.csv")
+                with open(f"{inputDir}/broken.csv", "w") as file:
+                    file.write("Kabupaten/Kota\n")
+                groupedCombined = service.runOnce()
+                self.assertListEqual(list(groupedCombined), ["Buah-Buahan"])
+                self.assertListEqual(
+                    list(service.listError), [f"{inputDir}/broken.csv"]
+                )
+                self.assertDictEqual(service.runOnce(), {})
+
+                metrics = service.metrics()
+                self.assertEqual(metrics["queueDepth"], 0)
+                self.assertEqual(metrics["published"], 4)
+                self.assertEqual(metrics["latency"]["count"], 4)
+                self.assertGreaterEqual(metrics["latency"]["max"], 0)
+                self.assertSetEqual(
+                    set(record["fileName"] for record in listPublished),
+                    set(glob(f"{inputDir}/dataset*csv")),
+                )
+
+            expected = BulkParse(f"{inputDir}/dataset*csv", separator="_")
+            fullCombined = dict(
+                zip(sorted(expected.listUniqueGroup), expected.combineResult())
+            )
+            published = readFrame(f"{outputDir}/Combine_Result_Buah-Buahan.csv")
+            expectedDf = fullCombined["Buah-Buahan"].loc[published.index]
+            self.assertTrue(
+                (published.fillna(-1).values == expectedDf.fillna(-1).values).all()
+            )
+
+    def test_settle(self):
+        """Test a file isn't parsed before it's settled but is counted in the queue."""
+        with tempfile.TemporaryDirectory() as tempDir:
+            shutil.copy("data/input/csv/dataset1.csv", f"{tempDir}/dataset1.csv")
+            service = WatchService(
+                f"{tempDir}/*csv",
+                f"{tempDir}/output",
+                "_",
+                executor="thread",
+                settle=3600,
+            )
+            self.assertDictEqual(service.runOnce(), {})
+            self.assertEqual(service.metrics()["queueDepth"], 1)
+            service.close()
+
+
+if __name__ == "__main__":
+    unittest.main()